@@ -5,7 +5,6 @@ from flask import request
 from typing import Callable
 
 from nsj_audit_lib.util.audit_config import AuditConfig
-from nsj_gcf_utils.json_util import json_dumps
 from nsj_gcf_utils.rest_error_util import format_json_error, format_error_body
 
 from nsj_rest_lib.controller.controller_util import DEFAULT_RESP_HEADERS
@@ -18,6 +17,7 @@ from nsj_rest_lib.exception import (
 )
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.settings import get_logger
+from nsj_rest_lib.util.json_backend import json_dumps
 
 
 class DeleteRoute(RouteBase):
@@ -5,7 +5,6 @@ from flask import request
 from typing import Callable, Optional
 
 from nsj_audit_lib.util.audit_config import AuditConfig
-from nsj_gcf_utils.json_util import json_dumps
 from nsj_gcf_utils.pagination_util import PaginationException
 from nsj_gcf_utils.rest_error_util import format_json_error
 
@@ -21,7 +20,9 @@ from nsj_rest_lib.exception import (
 )
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.settings import get_logger
+from nsj_rest_lib.util.cache_util import LRUTTLCache, register_entity_cache
 from nsj_rest_lib.util.fields_util import merge_fields_tree
+from nsj_rest_lib.util.json_backend import json_dumps
 
 
 class GetRoute(RouteBase):
@@ -39,6 +40,10 @@ class GetRoute(RouteBase):
         get_function_response_dto_class: type | None = None,
         custom_json_response: bool = False,
         audit_config: AuditConfig | None = None,
+        db_json_response: bool = False,
+        cache_ttl: float | None = None,
+        cache_maxsize: int = 1024,
+        etag_shallow_check: bool = False,
     ):
         """
         Rota de GET por ID.
@@ -53,6 +58,25 @@ class GetRoute(RouteBase):
           função (ex.: ``teste.api_classificacaofinanceiraget``).
         - ``get_function_response_dto_class``: DTO usado para mapear o
           retorno da função (fallback para ``dto_class``).
+        - ``db_json_response``: quando ``True``, e o DTO é um mapeamento direto das
+          colunas (sem conversões na leitura, relacionamentos, expands, partial_of
+          ou data_override, nos fields solicitados), o json da resposta é montado
+          pelo próprio banco (``json_build_object``), sem instanciar a entity ou o
+          dict da resposta (o DTO é montado apenas com os campos do ETag). Nos
+          demais casos, o GET segue o fluxo padrão (inclusive para campos cujo tipo
+          é formatado de outra forma pelo PostgreSQL, como Decimal e datas).
+        - ``cache_ttl``: quando informado, os DTOs recuperados são mantidos num cache
+          em memória (por processo), por até ``cache_ttl`` segundos, e reutilizados
+          nas requisições com os mesmos ID, partição, fields e expands. O cache é
+          invalidado pelas gravações (insert, update e delete) feitas pelos services
+          sobre a mesma entidade e partição, no mesmo processo.
+        - ``cache_maxsize``: quantidade máxima de DTOs no cache (descartando os
+          menos usados recentemente).
+        - ``etag_shallow_check``: quando ``True``, o header ``If-None-Match`` é
+          avaliado por uma busca rasa (PK + campos do ETag) antes do GET completo
+          (útil quando o GET completo é muito custoso). Por padrão, o registro é
+          recuperado uma única vez, e a resposta (304 ou 200) é decidida a partir
+          do ETag calculado sobre o DTO completo.
         """
         super().__init__(
             url=url,
@@ -71,6 +95,14 @@ class GetRoute(RouteBase):
             get_function_response_dto_class or dto_class
         )
         self.custom_json_response = custom_json_response
+        self.db_json_response = db_json_response
+        self.etag_shallow_check = etag_shallow_check
+
+        # Cache dos DTOs recuperados (invalidado pelas gravações na mesma tabela)
+        self._get_cache = None
+        if cache_ttl is not None:
+            self._get_cache = LRUTTLCache(cache_maxsize, cache_ttl)
+            register_entity_cache(entity_class.table_name, self._get_cache)
 
     def _get_service(self, factory: NsjInjectorFactoryBase):
         """
@@ -152,23 +184,58 @@ class GetRoute(RouteBase):
             function_params = None if function_object is not None else args
 
             _res: ty.Any = None
+            if_none_match = request.headers.get("If-None-Match")
             fields, _res = RouteBase.handle_if_none_match(
                 id_=id,
                 service=service,
                 dto_class=self._dto_class,
-                header_val=request.headers.get("If-None-Match"),
+                header_val=if_none_match,
                 fields=fields,
                 # Data for service.get
                 partition_fields=partition_fields,
                 function_params=function_params,
                 function_object=function_object,
                 function_name=self._get_function_name,
+                entity_class=self._entity_class,
+                shallow_fetch=self.etag_shallow_check,
             )
             if _res is not None:
                 return _res
 
+            # Montando o json do registro diretamente no banco (quando possível)
+            if self.db_json_response and self._get_function_name is None:
+                json_result = service.get_json(
+                    id, partition_fields, fields, expands=expands
+                )
+                if json_result is not None:
+                    json_data, etag_dto = json_result
+
+                    json_headers = {**DEFAULT_RESP_HEADERS}
+                    if etag_dto is not None:
+                        RouteBase.cache_etags(
+                            self._entity_class, [etag_dto], partition_fields
+                        )
+                        not_modified = RouteBase.not_modified_response(
+                            if_none_match, etag_dto
+                        )
+                        if not_modified is not None:
+                            return not_modified
+
+                        RouteBase.add_etag_header_if_needed(json_headers, etag_dto)
+
+                    return (json_data, 200, json_headers)
+
             # Chamando o service (método get)
             # TODO Rever parametro order_fields abaixo
+            # (o cache só é repassado aos services cujo get o aceite)
+            cache_kwargs = {}
+            if (
+                self._get_cache is not None
+                and self._get_function_name is None
+                and RouteBase.accepts_kwarg(service.get, "cache")
+            ):
+                cache_kwargs["cache"] = self._get_cache
+
             data = service.get(
                 id,
                 partition_fields,
@@ -178,11 +245,22 @@ class GetRoute(RouteBase):
                 function_object=function_object,
                 function_name=self._get_function_name,
                 custom_json_response=self.custom_json_response,
+                **cache_kwargs,
             )
 
             headers: ty.Dict[str, str] = {**DEFAULT_RESP_HEADERS}
             if isinstance(data, DTOBase):
                 # NOTE: data will not be a DTO if custom_json_response is set
+                if self._get_function_name is None:
+                    RouteBase.cache_etags(
+                        self._entity_class, [data], partition_fields, fields
+                    )
+
+                # Decidindo o If-None-Match pelo DTO completo (sem busca rasa)
+                not_modified = RouteBase.not_modified_response(if_none_match, data)
+                if not_modified is not None:
+                    return not_modified
+
                 RouteBase.add_etag_header_if_needed(headers, data)
                 pass
 
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import typing as ty
 
@@ -5,7 +6,6 @@ from flask import request
 from typing import Callable
 
 from nsj_audit_lib.util.audit_config import AuditConfig
-from nsj_gcf_utils.json_util import json_dumps
 from nsj_gcf_utils.log_time import log_time
 from nsj_gcf_utils.pagination_util import page_body, PaginationException
 from nsj_gcf_utils.rest_error_util import format_json_error
@@ -21,7 +21,13 @@ from nsj_rest_lib.exception import (
 )
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.settings import get_logger, DEFAULT_PAGE_SIZE
+from nsj_rest_lib.util.cache_util import LRUTTLCache, register_entity_cache
 from nsj_rest_lib.util.fields_util import merge_fields_tree
+from nsj_rest_lib.util.json_backend import json_dumps
+from nsj_rest_lib.util.json_stream_util import (
+    stream_encoded_json_page,
+    stream_json_page,
+)
 
 
 class ListRoute(RouteBase):
@@ -39,6 +45,11 @@ class ListRoute(RouteBase):
         list_function_response_dto_class: type | None = None,
         custom_json_response: bool = False,
         audit_config: AuditConfig | None = None,
+        stream_response: bool = False,
+        db_json_response: bool = False,
+        etag_response: bool = False,
+        cache_ttl: float | None = None,
+        cache_maxsize: int = 1024,
     ):
         """
         Rota de LIST (GET sem ID).
@@ -52,6 +63,32 @@ class ListRoute(RouteBase):
           função (ex.: ``teste.api_classificacaofinanceiralist``).
         - ``list_function_response_dto_class``: DTO usado para mapear o
           retorno da função (fallback para ``dto_class``).
+        - ``stream_response``: quando ``True``, o json da página é enviado em
+          streaming (cada item é convertido e codificado à medida que é escrito
+          na resposta), reduzindo o pico de memória e o tempo até o primeiro byte
+          em páginas grandes. Erros ocorridos durante a escrita não podem mais
+          alterar o status HTTP (a resposta é interrompida).
+        - ``db_json_response``: quando ``True``, e o DTO é um mapeamento direto das
+          colunas (sem conversões na leitura, relacionamentos, expands, partial_of ou
+          data_override, nos fields solicitados), o json de cada item é montado pelo
+          próprio banco (``json_build_object``), e a página é enviada em streaming,
+          sem instanciar entities, DTOs ou dicts. Nos demais casos, a listagem segue
+          o fluxo padrão (inclusive para campos cujo tipo é formatado de outra
+          forma pelo PostgreSQL, como Decimal e datas).
+        - ``etag_response``: quando ``True`` (e o DTO define ``etag_fields``), a
+          página é retornada com o header ``ETag``, calculado a partir da query da
+          listagem e da PK e do ETag de cada item (ou do json de cada item, no modo
+          ``db_json_response``). Se o header ``If-None-Match`` contém o ETag da
+          página, a rota retorna ``304`` (sem converter e enviar os itens).
+        - ``cache_ttl``: quando informado, as páginas recuperadas (listas de DTOs)
+          são mantidas num cache em memória (por processo), por até ``cache_ttl``
+          segundos, e reutilizadas nas requisições com a mesma consulta (filtros,
+          paginação, fields, ordenação, busca e expands). O cache é invalidado pelas
+          gravações (insert, update e delete) feitas pelos services sobre a mesma
+          entidade e partição, no mesmo processo. Consultas que recuperam campos
+          de outras tabelas (listas, objetos, joins etc.) não usam o cache.
+        - ``cache_maxsize``: quantidade máxima de páginas no cache (descartando as
+          menos usadas recentemente).
         """
         super().__init__(
             url=url,
@@ -70,6 +107,15 @@ class ListRoute(RouteBase):
             list_function_response_dto_class or dto_class
         )
         self.custom_json_response = custom_json_response
+        self.stream_response = stream_response
+        self.db_json_response = db_json_response
+        self.etag_response = etag_response
+
+        # Cache das páginas recuperadas (invalidado pelas gravações na mesma tabela)
+        self._list_cache = None
+        if cache_ttl is not None:
+            self._list_cache = LRUTTLCache(cache_maxsize, cache_ttl)
+            register_entity_cache(entity_class.table_name, self._list_cache)
 
     def _get_service(self, factory: NsjInjectorFactoryBase):
         """
@@ -140,6 +186,19 @@ class ListRoute(RouteBase):
             # Tratando dos campos de data_override
             self._validade_data_override_parameters(args)
 
+            # Campos do ETag da página (recuperados mesmo quando não solicitados)
+            list_fields = fields
+            if_none_match = None
+            page_key = None
+            if self.etag_response and len(self._dto_class.etag_fields) > 0:
+                list_fields = {
+                    **fields,
+                    "root": fields["root"] | self._dto_class.etag_fields,
+                }
+                if os.getenv("ENV", "").lower() != "erp_sql":
+                    if_none_match = request.headers.get("If-None-Match")
+                page_key = f"{url_args}|{limit}|{current_after}"
+
             # Construindo os objetos
             service = self._get_service(self.get_injector_factory())
 
@@ -152,12 +211,47 @@ class ListRoute(RouteBase):
                 )
             function_params = None if function_object is not None else filters
 
+            # Montando o json dos registros diretamente no banco (quando possível)
+            if self.db_json_response and self._list_function_name is None:
+                json_rows = service.list_json(
+                    current_after,
+                    limit,
+                    fields,
+                    None,
+                    filters,
+                    search_query=search_query,
+                    expands=expands,
+                )
+                if json_rows is not None:
+                    headers = {**DEFAULT_RESP_HEADERS}
+                    if page_key is not None:
+                        not_modified = self._add_page_etag(
+                            headers,
+                            page_key,
+                            (f"{key}:{json_row}" for key, json_row in json_rows),
+                            if_none_match,
+                        )
+                        if not_modified is not None:
+                            return not_modified
+
+                    return self._db_json_page(
+                        json_rows, url_args, limit, current_after, headers
+                    )
+
             # Chamando o service (método list)
             # TODO Rever parametro order_fields abaixo
+            cache_kwargs = {}
+            if (
+                self._list_cache is not None
+                and self._list_function_name is None
+                and RouteBase.accepts_kwarg(service.list, "cache")
+            ):
+                cache_kwargs["cache"] = self._list_cache
+
             data = service.list(
                 current_after,
                 limit,
-                fields,
+                list_fields,
                 None,
                 filters,
                 search_query=search_query,
@@ -166,17 +260,50 @@ class ListRoute(RouteBase):
                 function_object=function_object,
                 function_name=self._list_function_name,
                 custom_json_response=self.custom_json_response,
+                **cache_kwargs,
             )
 
             if self.custom_json_response and self._list_function_name is not None:
                 return (json_dumps(data), 200, {**DEFAULT_RESP_HEADERS})
 
-            # Convertendo para o formato de dicionário (permitindo omitir campos do DTO)
-            dict_data = [dto.convert_to_dict(fields, expands) for dto in data]
+            # Guardando os ETags dos registros listados
+            if self._list_function_name is None:
+                RouteBase.cache_etags(self._entity_class, data, fields=list_fields)
 
             # Recuperando o campo referente à chave primária do DTO
             pk_field = self._dto_class.pk_field
 
+            # Calculando o ETag da página (e tratando o If-None-Match)
+            headers = {**DEFAULT_RESP_HEADERS}
+            if page_key is not None:
+                not_modified = self._add_page_etag(
+                    headers,
+                    page_key,
+                    (
+                        f"{getattr(dto, pk_field)}:{RouteBase.get_etag_value(dto)}"
+                        for dto in data
+                    ),
+                    if_none_match,
+                )
+                if not_modified is not None:
+                    return not_modified
+
+            if self.stream_response and os.getenv("ENV", "").lower() != "erp_sql":
+                return self._stream_page(
+                    data,
+                    fields,
+                    expands,
+                    url_args,
+                    limit,
+                    current_after,
+                    pk_field,
+                    headers,
+                )
+
+            # Convertendo para o formato de dicionário (permitindo omitir campos do DTO)
+            convert = self._page_converter(data, fields, expands)
+            dict_data = [convert(dto) for dto in data]
+
             # Construindo o corpo da página
             page = page_body(
                 base_url=url_args,
@@ -188,7 +315,7 @@ class ListRoute(RouteBase):
             )
 
             # Retornando a resposta da requuisição
-            return (json_dumps(page), 200, {**DEFAULT_RESP_HEADERS})
+            return (json_dumps(page), 200, headers)
         except MissingParameterException as e:
             get_logger().warning(e)
             if self._handle_exception is not None:
@@ -217,3 +344,112 @@ class ListRoute(RouteBase):
                     500,
                     {**DEFAULT_RESP_HEADERS},
                 )
+
+    @staticmethod
+    def _page_converter(
+        data: ty.List[DTOBase], fields, expands
+    ) -> ty.Callable[[DTOBase], ty.Any]:
+        """
+        Retorna a função de conversão (para dict) dos itens da página, com a projeção
+        resolvida uma única vez por página (e não a cada item).
+        """
+        if not data or not hasattr(data[0], "get_dict_projector"):
+            return lambda dto: dto.convert_to_dict(fields, expands)
+
+        return type(data[0]).get_dict_projector(fields, expands).convert
+
+    def _stream_page(
+        self,
+        data: ty.List[DTOBase],
+        fields,
+        expands,
+        url_args: str,
+        limit: int,
+        current_after,
+        pk_field: str,
+        headers: ty.Optional[ty.Dict[str, str]] = None,
+    ):
+        """
+        Monta a resposta da listagem em streaming.
+
+        A paginação (url "next") é resolvida antecipadamente, a partir apenas das
+        chaves primárias, e os itens são convertidos para dict e codificados um a
+        um, durante o envio.
+        """
+
+        page = page_body(
+            base_url=url_args,
+            limit=limit,
+            current_after=current_after,
+            current_before=None,
+            result=[{pk_field: getattr(dto, pk_field)} for dto in data],
+            id_field=pk_field,
+        )
+
+        body = stream_json_page(
+            page["next"],
+            data[0:limit],
+            self._page_converter(data, fields, expands),
+        )
+
+        return (body, 200, headers or {**DEFAULT_RESP_HEADERS})
+
+    def _db_json_page(
+        self,
+        json_rows: ty.List[ty.Tuple[ty.Any, str]],
+        url_args: str,
+        limit: int,
+        current_after,
+        headers: ty.Optional[ty.Dict[str, str]] = None,
+    ):
+        """
+        Monta a resposta da listagem a partir dos jsons dos itens, já montados pelo
+        banco (tuplas: valor da chave primária, json do item).
+        """
+
+        pk_field = self._dto_class.pk_field
+        page = page_body(
+            base_url=url_args,
+            limit=limit,
+            current_after=current_after,
+            current_before=None,
+            result=[{pk_field: key} for key, _ in json_rows],
+            id_field=pk_field,
+        )
+
+        body = stream_encoded_json_page(
+            page["next"],
+            (json_row for _, json_row in json_rows[0:limit]),
+        )
+
+        if os.getenv("ENV", "").lower() == "erp_sql":
+            body = b"".join(body).decode("utf-8")
+
+        return (body, 200, headers or {**DEFAULT_RESP_HEADERS})
+
+    @staticmethod
+    def _add_page_etag(
+        headers: ty.Dict[str, str],
+        page_key: str,
+        item_tags: ty.Iterable[str],
+        if_none_match: ty.Optional[str],
+    ):
+        """
+        Calcula o ETag da página (hash da query da listagem e das identificações de
+        cada item), adicionando-o aos headers. Retorna a resposta 304 quando o ETag
+        consta do header If-None-Match; ou None, caso contrário.
+        """
+        digest = hashlib.sha256(page_key.encode("utf-8"))
+        for tag in item_tags:
+            digest.update(b"\x00")
+            digest.update(tag.encode("utf-8"))
+
+        etag_value = digest.hexdigest()
+        headers["ETag"] = "W/" + RouteBase.quote_and_escape_string(etag_value)
+
+        if if_none_match is not None and etag_value in RouteBase.parse_if_none_match(
+            if_none_match
+        ):
+            return ("", 304, headers)
+
+        return None
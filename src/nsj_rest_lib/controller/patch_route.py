@@ -6,7 +6,7 @@ from sqlalchemy.exc import IntegrityError, ProgrammingError
 from typing import Callable
 
 from nsj_audit_lib.util.audit_config import AuditConfig
-from nsj_gcf_utils.json_util import json_dumps, JsonLoadException
+from nsj_gcf_utils.json_util import JsonLoadException
 from nsj_gcf_utils.rest_error_util import format_json_error
 
 from nsj_rest_lib.controller.controller_util import (
@@ -20,6 +20,7 @@ from nsj_rest_lib.entity.entity_base import EntityBase
 from nsj_rest_lib.exception import MissingParameterException, NotFoundException
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.settings import get_logger
+from nsj_rest_lib.util.json_backend import json_dumps
 
 
 class PatchRoute(RouteBase):
@@ -149,6 +150,12 @@ class PatchRoute(RouteBase):
                 ):
                     return (json_dumps(data), 200, {**DEFAULT_RESP_HEADERS})
 
+                # Guardando o ETag do registro recuperado após a gravação
+                if self.retrieve_after_partial_update:
+                    RouteBase.cache_etags(
+                        self._entity_class, [data], partition_filters, retrieve_fields
+                    )
+
                 # Convertendo para o formato de dicionário
                 dict_data = data.convert_to_dict(retrieve_fields)
 
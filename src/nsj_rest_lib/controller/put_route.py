@@ -5,7 +5,7 @@ from sqlalchemy.exc import IntegrityError, ProgrammingError
 from typing import Callable, Type
 
 from nsj_audit_lib.util.audit_config import AuditConfig
-from nsj_gcf_utils.json_util import json_dumps, JsonLoadException
+from nsj_gcf_utils.json_util import JsonLoadException
 from nsj_gcf_utils.rest_error_util import format_json_error
 
 from nsj_rest_lib.controller.controller_util import (
@@ -25,6 +25,7 @@ from nsj_rest_lib.exception import (
 )
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.settings import get_logger
+from nsj_rest_lib.util.json_backend import json_dumps
 
 
 class PutRoute(RouteBase):
@@ -105,6 +106,13 @@ class PutRoute(RouteBase):
 
         return partition_filters
 
+    def _cache_etags(self, dtos, partition_filters, retrieve_fields):
+        # Guardando os ETags dos registros recuperados após a gravação
+        if self.retrieve_after_update and self._update_function_name is None:
+            RouteBase.cache_etags(
+                self._entity_class, dtos, partition_filters, retrieve_fields
+            )
+
     def handle_request(
         self,
         id: str = None,
@@ -208,6 +216,8 @@ class PutRoute(RouteBase):
                     ):
                         return (json_dumps(data), 200, {**DEFAULT_RESP_HEADERS})
 
+                    self._cache_etags([data], partition_filters, retrieve_fields)
+
                     # Convertendo para o formato de dicionário
                     lst_data.append(data.convert_to_dict(retrieve_fields))
             else:
@@ -231,6 +241,8 @@ class PutRoute(RouteBase):
                     return (json_dumps(data), 200, {**DEFAULT_RESP_HEADERS})
 
                 if data is not None or not len(data) > 0:
+                    self._cache_etags(data, partition_filters, retrieve_fields)
+
                     # Convertendo para o formato de dicionário (permitindo omitir campos do DTO)
                     lst_data = [item.convert_to_dict(retrieve_fields) for item in data]
 
@@ -1,6 +1,8 @@
+import functools
 import hashlib
+import inspect
 from typing import (
-    Callable, Dict, List, Optional, Any, Type, Tuple, Set, Union, Literal
+    Callable, Dict, Iterable, List, Optional, Any, Type, Tuple, Set, Union, Literal
 )
 import datetime as dt
 
@@ -16,9 +18,35 @@ from nsj_rest_lib.exception import DataOverrideParameterException, MissingParame
 from nsj_rest_lib.entity.function_type_base import FunctionTypeBase
 from nsj_rest_lib.injector_factory_base import NsjInjectorFactoryBase
 from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.settings import REST_LIB_ETAG_CACHE_MAXSIZE, REST_LIB_ETAG_CACHE_TTL
+from nsj_rest_lib.util.cache_util import (
+    MISS,
+    LRUTTLCache,
+    entity_cache_tags,
+    partition_cache_key,
+    register_entity_cache,
+)
 from nsj_rest_lib.util.fields_util import FieldsTree, parse_fields_expression
 
 
+@functools.lru_cache(maxsize=1024)
+def _accepts_kwarg(func: Callable, name: str) -> bool:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+
+    return any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        or (
+            parameter.name == name
+            and parameter.kind
+            in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        )
+        for parameter in parameters
+    )
+
+
 class RouteBase:
     """
     # Examplo de SubRotas
@@ -85,6 +113,14 @@ class RouteBase:
     registered_routes: List["RouteBase"] = []
     function_wrapper: FunctionRouteWrapper
 
+    # Cache (por processo) dos ETags dos registros, por DTO, partição e ID (habilitado
+    # pela variável REST_LIB_ETAG_CACHE_TTL, e invalidado pelas gravações)
+    etag_cache: Optional[LRUTTLCache] = (
+        LRUTTLCache(REST_LIB_ETAG_CACHE_MAXSIZE, REST_LIB_ETAG_CACHE_TTL)
+        if REST_LIB_ETAG_CACHE_TTL > 0
+        else None
+    )
+
     _injector_factory: NsjInjectorFactoryBase
     _service_name: str
     _handle_exception: Callable
@@ -177,6 +213,14 @@ class RouteBase:
                 self._dto_response_class,
             )
 
+    @staticmethod
+    def accepts_kwarg(method: Callable, name: str) -> bool:
+        """
+        Verifica se o método (normalmente, de um service customizado) aceita o
+        argumento nomeado recebido (explicitamente, ou por meio de **kwargs).
+        """
+        return _accepts_kwarg(getattr(method, "__func__", method), name)
+
     @staticmethod
     def parse_fields(dto_class: DTOBase, fields: str) -> FieldsTree:
         """
@@ -311,6 +355,8 @@ class RouteBase:
         function_params: Any,
         function_object: Any,
         function_name: Any,
+        entity_class: Optional[Type[EntityBase]] = None,
+        shallow_fetch: bool = True,
     ) -> Tuple[FieldsTree, Optional[Any]]:
         """
         Avalia o header If-None-Match para GET por id.
@@ -321,6 +367,14 @@ class RouteBase:
         Sempre adiciona o campo ETag em ``fields`` para garantir o
         retorno do header em respostas 200.
 
+        Com ``shallow_fetch=False``, a busca rasa não é feita, e a
+        comparação fica a cargo de quem recupera o DTO completo (ver
+        ``not_modified_response``), num único acesso ao banco.
+
+        Quando o cache de ETags está habilitado (e a ``entity_class`` é
+        informada), o ETag guardado para o registro é usado no lugar da
+        busca rasa (retornando 304 sem acesso ao banco, em caso de match).
+
         Exemplo:
         >>> class DummyDTO:
         ...     etag_fields = {"version"}
@@ -362,6 +416,25 @@ class RouteBase:
         #           not match
         fields['root'].update(etag_fields)
 
+        vals: List[str] = RouteBase.parse_if_none_match(etag_header)
+
+        # Tentando decidir pelo ETag em cache (sem acesso ao banco)
+        use_cache = entity_class is not None and function_name is None
+        if use_cache:
+            etag_value = RouteBase.get_cached_etag(dto_class, partition_fields, id_)
+            if etag_value is not None:
+                if not RouteBase.is_etag_value_in_list(
+                    dto_class.etag_type, etag_value, vals
+                ):
+                    return fields, None
+
+                headers: Dict[str, str] = {**DEFAULT_RESP_HEADERS}
+                headers["ETag"] = "W/" + RouteBase.quote_and_escape_string(etag_value)
+                return fields, ("", 304, headers)
+
+        if not shallow_fetch:
+            return fields, None
+
         # NOTE: Doing a shallow fetch to save on IO to DB
         fetch_fields: FieldsTree = {
             'root': {dto_class.pk_field} | etag_fields
@@ -377,18 +450,44 @@ class RouteBase:
             custom_json_response=False,
         )
 
-        etag_value: str = RouteBase.get_etag_value(etag_dto)
-        vals: List[str] = RouteBase.parse_if_none_match(etag_header)
+        if use_cache:
+            RouteBase.cache_etags(entity_class, [etag_dto], partition_fields)
+
+        return fields, RouteBase.not_modified_response(etag_header, etag_dto)
+
+    @staticmethod
+    def not_modified_response(
+        header_val: Optional[str],
+        dto: DTOBase,
+    ) -> Optional[Tuple[str, int, Dict[str, str]]]:
+        """
+        Retorna a resposta 304 (com o header ETag) se o ETag calculado a partir do
+        DTO consta do header If-None-Match; ou None, caso contrário.
+
+        Exemplo:
+        >>> class DummyDTO:
+        ...     etag_fields = {"version"}
+        ...     etag_type = "RAW"
+        ...     def __init__(self, version):
+        ...         self.version = version
+        >>> RouteBase.not_modified_response('"v1"', DummyDTO("v1"))[1]
+        304
+        >>> RouteBase.not_modified_response('"v1"', DummyDTO("v2")) is None
+        True
+        """
+        if header_val is None or len(dto.etag_fields) == 0:
+            return None
+
         if not RouteBase.is_etag_value_in_list(
-            dto_class.etag_type,
-            etag_value,
-            vals
+            dto.etag_type,
+            RouteBase.get_etag_value(dto),
+            RouteBase.parse_if_none_match(header_val),
         ):
-            return fields, None
+            return None
 
         headers: Dict[str, str] = {**DEFAULT_RESP_HEADERS}
-        RouteBase.add_etag_header_if_needed(headers, etag_dto)
-        return fields, ("", 304, headers)
+        RouteBase.add_etag_header_if_needed(headers, dto)
+        return ("", 304, headers)
 
     @staticmethod
     def is_etag_value_in_list(
@@ -466,6 +565,103 @@ class RouteBase:
             return hashlib.sha256(etag_value.encode('utf-8')).hexdigest()
         return etag_value
 
+    @staticmethod
+    def _etag_cache_enabled(dto_class: Type[DTOBase]) -> bool:
+        # Os DTOs com conjuntos ou data_override não são guardados, pois o conteúdo
+        # retornado depende de outros parâmetros além da partição e do ID
+        return (
+            RouteBase.etag_cache is not None
+            and len(dto_class.etag_fields) > 0
+            and getattr(dto_class, "conjunto_field", None) is None
+            and not getattr(dto_class, "data_override_fields", None)
+        )
+
+    @staticmethod
+    def get_cached_etag(
+        dto_class: Type[DTOBase],
+        partition_fields: Optional[Dict[str, Any]],
+        id_: Any,
+    ) -> Optional[str]:
+        """
+        Retorna o ETag guardado no cache (por processo) para o registro, ou None se
+        o cache não estiver habilitado, ou se o ETag do registro não for conhecido.
+        """
+        if not RouteBase._etag_cache_enabled(dto_class):
+            return None
+
+        partition = partition_cache_key(dto_class.partition_fields, partition_fields)
+        if partition is None:
+            return None
+
+        etag_value = RouteBase.etag_cache.get((dto_class, partition, str(id_)))
+        return None if etag_value is MISS else etag_value
+
+    @staticmethod
+    def cache_etags(
+        entity_class: Type[EntityBase],
+        dtos: Iterable[Any],
+        partition_fields: Optional[Dict[str, Any]] = None,
+        fields: Optional[FieldsTree] = None,
+    ) -> None:
+        """
+        Guarda no cache (por processo) os ETags dos DTOs recebidos (resultantes de
+        GETs, listagens ou gravações), quando o cache está habilitado.
+
+        Apenas os DTOs com a PK e os campos do ETag preenchidos, e com a partição
+        conhecida (pelos valores do DTO ou pelos ``partition_fields`` recebidos),
+        são guardados. Quando os ``fields`` recuperados são informados, os DTOs cujos
+        campos do ETag não foram recuperados são ignorados. Os itens são invalidados
+        pelas gravações feitas pelos services sobre a mesma tabela (e partição).
+        """
+        cache = RouteBase.etag_cache
+        if cache is None or entity_class is None:
+            return
+
+        table_name = entity_class.table_name
+        registered = False
+        for dto in dtos:
+            if not isinstance(dto, DTOBase):
+                continue
+
+            dto_class = type(dto)
+            if not RouteBase._etag_cache_enabled(dto_class):
+                continue
+
+            if fields is not None and not dto_class.etag_fields <= (
+                fields["root"] | {dto_class.pk_field}
+            ):
+                continue
+
+            try:
+                id_ = getattr(dto, dto_class.pk_field)
+                for field in dto_class.etag_fields:
+                    getattr(dto, field)
+            except (AttributeError, KeyError):
+                # Campo não recuperado (DTO parcial)
+                continue
+
+            partition_values = dict(partition_fields or {})
+            for field in dto_class.partition_fields:
+                value = getattr(dto, field, None)
+                if value is not None:
+                    partition_values[field] = value
+            partition = partition_cache_key(
+                dto_class.partition_fields, partition_values
+            )
+
+            if id_ is None or partition is None:
+                continue
+
+            if not registered:
+                register_entity_cache(table_name, cache)
+                registered = True
+
+            cache.set(
+                (dto_class, partition, str(id_)),
+                RouteBase.get_etag_value(dto),
+                tags=entity_cache_tags(table_name, partition),
+            )
+
     @staticmethod
     def add_etag_header_if_needed(
         headers: Dict[str, str],
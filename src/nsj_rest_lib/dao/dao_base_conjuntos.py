@@ -128,6 +128,7 @@ class DAOBaseConjuntos(DAOBaseUtil):
         """
 
         data = {"conjunto": resp[0]["conjunto"], "registro": id}
+        self._invalidate_identity_map()
         self._db.execute(sql, **data)
 
     def delete_relacionamento_conjunto(
@@ -143,6 +144,7 @@ class DAOBaseConjuntos(DAOBaseUtil):
         delete from {tabela_conjunto} where registro = :registro
         """
 
+        self._invalidate_identity_map()
         self._db.execute(sql, registro=id)
 
     def delete_relacionamentos_conjunto(
@@ -158,4 +160,5 @@ class DAOBaseConjuntos(DAOBaseUtil):
         delete from {tabela_conjunto} where registro in :registro
         """
 
+        self._invalidate_identity_map()
         self._db.execute(sql, registro=tuple(ids))
@@ -68,6 +68,7 @@ class DAOBaseDelete(DAOBaseUtil):
         """
 
         # Executando a query
+        self._invalidate_identity_map()
         rowcount, _ = self._db.execute(sql, **filter_values_map)
 
         # Verificando se houve alguma deleção
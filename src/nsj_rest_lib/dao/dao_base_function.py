@@ -57,6 +57,7 @@ class DAOBaseFunction(DAOBaseUtil):
 
         get_logger().debug(f"[RestLib Debug] Function SQL: {sql}")
         get_logger().debug(f"[RestLib Debug] Function Parameters: {values_map}")
+        self._invalidate_identity_map()
         _, returning = self._db.execute_batch(sql, **values_map)
 
         if not returning:
@@ -97,6 +98,7 @@ class DAOBaseFunction(DAOBaseUtil):
         args_sql = ", ".join(placeholders)
         sql = f"select * from {function_name}({args_sql});"
 
+        self._invalidate_identity_map()
         returning = self._db.execute_query(sql, **values_map)
 
         return returning or []
@@ -5,6 +5,8 @@ from typing import List, Tuple
 from nsj_rest_lib.descriptor.conjunto_type import ConjuntoType
 from nsj_rest_lib.entity.entity_base import EntityBase
 from nsj_rest_lib.exception import ConflictException, NotFoundException
+from nsj_rest_lib.util.cache_util import MISS
+from nsj_rest_lib.util.identity_map import current_identity_map, freeze_filters
 from nsj_rest_lib.util.join_aux import JoinAux
 
 from .dao_base_conjuntos import DAOBaseConjuntos
@@ -23,11 +25,44 @@ class DAOBaseGet(DAOBaseConjuntos):
         joins_aux: List[JoinAux] = None,
         override_data: bool = False,
         partial_exists_clause: Tuple[str, str, str] = None,
+        as_rows: bool = False,
+        json_fields: List[Tuple[str, str]] = None,
     ) -> EntityBase:
         """
         Returns an entity instance by its ID.
+
+        If as_rows is True, returns a dict (with the entity fields as keys), instead
+        of the entity instance.
+
+        If json_fields is informed (a list of tuples: (json key, entity field)), the
+        json of the record is built by the database, and a dict is returned, with the
+        json text (key JSON_ROW_COLUMN) and the received fields (if any).
+
+        If there is an identity map opened for the current request, the loaded
+        record is reused by the following equivalent loads (same entity, key,
+        columns and filters), until a write is made.
         """
 
+        # Verificando se o registro já foi carregado na requisição
+        identity_map = current_identity_map()
+        identity_key = None
+        if identity_map is not None and json_fields is None and not joins_aux:
+            identity_key = (
+                self._entity_class,
+                key_field,
+                str(id),
+                frozenset(fields) if fields is not None else None,
+                freeze_filters(filters),
+                conjunto_type,
+                conjunto_field,
+                override_data,
+                partial_exists_clause,
+                as_rows,
+            )
+            loaded = identity_map.get(identity_key)
+            if loaded is not MISS:
+                return loaded
+
         # Creating a entity instance
         entity = self._entity_class()
 
@@ -70,12 +105,20 @@ class DAOBaseGet(DAOBaseConjuntos):
             )
             """
 
+        # Montando os campos (ou o json) a serem retornados
+        if json_fields is not None:
+            select_fields = self._sql_json_fields(json_fields, key_field)
+            if fields:
+                select_fields = f"{self._sql_fields(fields)}, {select_fields}"
+        else:
+            select_fields = self._sql_fields(fields)
+
         # Building query
         sql = f"""
         {with_conjunto}
         select
             {fields_conjunto}
-            {self._sql_fields(fields)}
+            {select_fields}
             {sql_join_fields}
         from
             {entity.get_table_name()} as t0
@@ -92,7 +135,12 @@ class DAOBaseGet(DAOBaseConjuntos):
         values.update(conjunto_map)
 
         # Running query
-        resp = self._db.execute_query_to_model(sql, self._entity_class, **values)
+        if json_fields is not None:
+            resp = self._db.execute_query(sql, **values)
+        elif as_rows:
+            resp = self._execute_query_to_rows(sql, **values)
+        else:
+            resp = self._db.execute_query_to_model(sql, self._entity_class, **values)
 
         # Checking if ID was found
         if len(resp) <= 0:
@@ -106,7 +154,8 @@ class DAOBaseGet(DAOBaseConjuntos):
                 f"Encontrado mais de um registro do tipo {self._entity_class.__name__}, para o id {id}."
             )
 
-        if not override_data:
-            return resp[0]
-        else:
-            return resp
+        result = resp[0] if not override_data else resp
+        if identity_key is not None:
+            identity_map.set(identity_key, result)
+
+        return result
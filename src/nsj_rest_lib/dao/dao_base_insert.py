@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from nsj_gcf_utils.json_util import convert_to_dumps
 from nsj_rest_lib.entity.entity_base import EntityBase
@@ -42,9 +42,17 @@ class DAOBaseInsert(DAOBaseSaveByFunction):
 
         return (", ".join(fields), ", ".join(ref_values))
 
-    def insert(self, entity: EntityBase, sql_read_only_fields: List[str] = []):
+    def insert(
+        self,
+        entity: EntityBase,
+        sql_read_only_fields: List[str] = [],
+        extra_returning_fields: List[str] = None,
+    ):
         """
         Insere o objeto de entidade "entity" no banco de dados
+
+        Os campos de "extra_returning_fields" são adicionados à cláusula returning
+        (se habilitada), e recarregados na entity com os valores gravados.
         """
 
         # Montando as cláusulas dos campos
@@ -66,7 +74,10 @@ class DAOBaseInsert(DAOBaseSaveByFunction):
         """
 
         # Montando as cláusulas returning
-        returning_fields = entity.get_insert_returning_fields()
+        returning_fields = list(entity.get_insert_returning_fields())
+        for field in extra_returning_fields or []:
+            if field not in returning_fields:
+                returning_fields.append(field)
         if (
             getattr(entity, entity.get_pk_field()) is None
             and entity.get_pk_field() not in returning_fields
@@ -83,6 +94,7 @@ class DAOBaseInsert(DAOBaseSaveByFunction):
         values_map = convert_to_dumps(entity)
 
         # Realizando o insert no BD
+        self._invalidate_identity_map()
         rowcount, returning = self._db.execute(sql, **values_map)
 
         if rowcount <= 0:
@@ -96,3 +108,67 @@ class DAOBaseInsert(DAOBaseSaveByFunction):
                 setattr(entity, field, returning[0][field])
 
         return entity
+
+    def insert_list(
+        self,
+        entities: List[EntityBase],
+        sql_read_only_fields: List[str] = [],
+    ) -> List[EntityBase]:
+        """
+        Insere uma lista de entidades (do mesmo tipo), por meio de um único insert
+        (com múltiplas linhas na cláusula values) por conjunto de campos. Listas
+        grandes são divididas em mais de um insert, respeitando o limite de
+        parâmetros por comando.
+
+        Entidades sem valor de chave primária, ou com campos de returning configurados,
+        são inseridas uma a uma (para que o retorno seja associado corretamente).
+        """
+
+        groups: Dict[str, List[EntityBase]] = {}
+        for entity in entities:
+            if (
+                getattr(entity, entity.get_pk_field()) is None
+                or len(entity.get_insert_returning_fields()) > 0
+            ):
+                self.insert(entity, sql_read_only_fields)
+                continue
+
+            sql_fields, _ = self._sql_insert_fields(entity, sql_read_only_fields)
+            groups.setdefault(sql_fields, []).append(entity)
+
+        for sql_fields, group in groups.items():
+            fields = [field.strip() for field in sql_fields.split(",")]
+
+            # Dividindo o insert, para não exceder o limite de parâmetros do comando
+            for chunk in self._batch_chunks(group, len(fields)):
+                kwargs = {}
+                sql_values = []
+                for idx, entity in enumerate(chunk):
+                    values_map = convert_to_dumps(entity)
+                    refs = []
+                    for field in fields:
+                        kwargs[f"{field}_{idx}"] = values_map[field]
+                        refs.append(f":{field}_{idx}")
+                    sql_values.append(f"({', '.join(refs)})")
+
+                # Montando a query principal
+                sql = f"""
+                insert into {chunk[0].get_table_name()} (
+
+                    {sql_fields}
+
+                ) values
+
+                    {', '.join(sql_values)}
+                """
+
+                # Realizando o insert no BD
+                self._invalidate_identity_map()
+                rowcount, _ = self._db.execute(sql, **kwargs)
+
+                if rowcount < len(chunk):
+                    raise Exception(
+                        f"Erro inserindo {chunk[0].__class__.__name__} no banco de dados"
+                    )
+
+        return entities
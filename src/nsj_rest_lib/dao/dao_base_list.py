@@ -1,7 +1,7 @@
 import re
 import uuid
 
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from nsj_gcf_utils.log_time import log_time
 
@@ -20,6 +20,7 @@ from nsj_rest_lib.util.order_spec import (
 from nsj_rest_lib.settings import get_logger
 
 from .dao_base_search import DAOBaseSearch
+from .dao_base_util import JSON_KEY_COLUMN, JSON_ROW_COLUMN
 
 
 class DAOBaseList(DAOBaseSearch):
@@ -40,9 +41,18 @@ class DAOBaseList(DAOBaseSearch):
         search_fields: List[str] = None,
         joins_aux: List[JoinAux] = None,
         partial_exists_clause: Tuple[str, str, str] = None,
-    ) -> List[EntityBase]:
+        as_rows: bool = False,
+        json_fields: List[Tuple[str, str]] = None,
+    ) -> List[EntityBase] | List[Dict[str, Any]] | List[Tuple[Any, str]]:
         """
         Returns a paginated entity list.
+
+        If as_rows is True, returns a list of dicts (one per record, with the entity
+        fields as keys), instead of the entity instances.
+
+        If json_fields is informed (a list of tuples: (json key, entity field)), the
+        json of each record is built by the database, and a list of tuples is
+        returned: (primary key value, json text).
         """
 
         # Creating a entity instance
@@ -203,13 +213,19 @@ class DAOBaseList(DAOBaseSearch):
             )
             """
 
+        # Montando os campos (ou o json) a serem retornados
+        if json_fields is not None:
+            select_fields = self._sql_json_fields(json_fields, entity.get_pk_field())
+        else:
+            select_fields = self._sql_fields(fields)
+
         # Montando a query em si
         sql = f"""
         {with_conjunto}
         select
 
             {fields_conjunto}
-            {self._sql_fields(fields)}
+            {select_fields}
             {sql_join_fields}
 
         from
@@ -238,6 +254,14 @@ class DAOBaseList(DAOBaseSearch):
         # Running the SQL query
         get_logger().debug(f"[RestLib Debug] List SQL: {sql}")
         get_logger().debug(f"[RestLib Debug] List Parameters: {kwargs}")
-        resp = self._db.execute_query_to_model(sql, self._entity_class, **kwargs)
+        if json_fields is not None:
+            resp = [
+                (row[JSON_KEY_COLUMN], row[JSON_ROW_COLUMN])
+                for row in self._db.execute_query(sql, **kwargs)
+            ]
+        elif as_rows:
+            resp = self._execute_query_to_rows(sql, **kwargs)
+        else:
+            resp = self._db.execute_query_to_model(sql, self._entity_class, **kwargs)
 
         return resp
@@ -31,6 +31,7 @@ class DAOBasePartialOf(DAOBaseUtil):
             f"values ({', '.join(placeholders)})"
         )
 
+        self._invalidate_identity_map()
         rowcount, _ = self._db.execute(sql, **params)
 
         if rowcount <= 0:
@@ -61,6 +62,7 @@ class DAOBasePartialOf(DAOBaseUtil):
         )
 
         params = {**set_params, "relation_value": relation_value}
+        self._invalidate_identity_map()
         rowcount, _ = self._db.execute(sql, **params)
 
         return rowcount
@@ -245,6 +245,7 @@ class DAOBaseSaveByFunction(DAOBaseUtil):
         SELECT current_setting('retorno.bloco', true)::jsonb as retorno;
         """
 
+        self._invalidate_identity_map()
         rowcount, returning = self._db.execute_batch(sql, **values_map)
 
         if rowcount <= 0 or len(returning) <= 0:
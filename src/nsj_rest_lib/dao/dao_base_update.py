@@ -55,6 +55,23 @@ class DAOBaseUpdate(DAOBaseInsert):
         Retorna lista com os campos para update, no padrão "field = :field"
         """
 
+        fields = self._update_fields(
+            entity, ignore_nones, sql_read_only_fields, sql_no_update_fields
+        )
+
+        return ", ".join([f"{k} = :{k}" for k in fields])
+
+    def _update_fields(
+        self,
+        entity: EntityBase,
+        ignore_nones: bool = False,
+        sql_read_only_fields: List[str] = [],
+        sql_no_update_fields: Set[str] = [],
+    ) -> List[str]:
+        """
+        Retorna a lista com os nomes dos campos a atualizar
+        """
+
         sql_fields = (
             entity._sql_fields
             if entity._sql_fields
@@ -68,7 +85,7 @@ class DAOBaseUpdate(DAOBaseInsert):
         # Building SQL fields
         if ignore_nones:
             fields = [
-                f"{k} = :{k}"
+                k
                 for k in sql_fields
                 if k not in entity.get_const_fields()
                 and k != entity.get_pk_field()
@@ -78,7 +95,7 @@ class DAOBaseUpdate(DAOBaseInsert):
             ]
         else:
             fields = [
-                f"{k} = :{k}"
+                k
                 for k in sql_fields
                 if k not in entity.get_const_fields()
                 and k != entity.get_pk_field()
@@ -86,7 +103,7 @@ class DAOBaseUpdate(DAOBaseInsert):
                 and k not in sql_no_update_fields
             ]
 
-        return ", ".join(fields)
+        return fields
 
     def update(
         self,
@@ -98,9 +115,13 @@ class DAOBaseUpdate(DAOBaseInsert):
         sql_read_only_fields: List[str] = [],
         sql_no_update_fields: Set[str] = [],
         upsert: bool = False,
+        extra_returning_fields: List[str] = None,
     ):
         """
         Atualiza o objeto de entidade "entity" no banco de dados
+
+        Os campos de "extra_returning_fields" são adicionados à cláusula returning
+        (se habilitada), e recarregados na entity com os valores gravados.
         """
 
         # Organizando o where dos filtros
@@ -173,7 +194,10 @@ class DAOBaseUpdate(DAOBaseInsert):
             """
 
         # Montando as cláusulas returning
-        returning_fields = entity.get_update_returning_fields()
+        returning_fields = list(entity.get_update_returning_fields())
+        for field in extra_returning_fields or []:
+            if field not in returning_fields:
+                returning_fields.append(field)
         if (
             getattr(entity, entity.get_pk_field()) is None
             and entity.get_pk_field() not in returning_fields
@@ -193,6 +217,7 @@ class DAOBaseUpdate(DAOBaseInsert):
         kwargs = {"candidate_key_value": key_value, **values_map, **filter_values_map}
 
         # Realizando o update no BD
+        self._invalidate_identity_map()
         rowcount, returning = self._db.execute(sql, **kwargs)
 
         if rowcount <= 0:
@@ -206,3 +231,101 @@ class DAOBaseUpdate(DAOBaseInsert):
                 setattr(entity, field, returning[0][field])
 
         return entity
+
+    def update_list(
+        self,
+        key_field: str,
+        entities: List[EntityBase],
+        filters: Dict[str, List[Filter]],
+        partial_update: bool = False,
+        sql_read_only_fields: List[str] = [],
+        sql_no_update_fields: Set[str] = [],
+    ) -> List[EntityBase]:
+        """
+        Atualiza uma lista de entidades (do mesmo tipo) por meio de um único update
+        (por conjunto de campos alterados), identificando cada registro pelo valor
+        do campo "key_field" da própria entity. Listas grandes são divididas em mais
+        de um update, respeitando o limite de parâmetros por comando.
+        """
+
+        # Agrupando as entidades pelos campos a atualizar
+        groups: Dict[tuple, List[EntityBase]] = {}
+        for entity in entities:
+            fields = tuple(
+                self._update_fields(
+                    entity, partial_update, sql_read_only_fields, sql_no_update_fields
+                )
+            )
+            groups.setdefault(fields, []).append(entity)
+
+        # Organizando o where dos filtros
+        filters_where, filter_values_map = self._make_filters_sql(filters, True)
+
+        for fields, group in groups.items():
+            if len(fields) <= 0:
+                continue
+
+            # Dividindo o update, para não exceder o limite de parâmetros do comando
+            # (a chave é referenciada no "in" e em cada "case")
+            for chunk in self._batch_chunks(
+                group, 1 + 2 * len(fields), len(filter_values_map)
+            ):
+                self._update_chunk(
+                    key_field, fields, chunk, filters_where, filter_values_map
+                )
+
+        return entities
+
+    def _update_chunk(
+        self,
+        key_field: str,
+        fields: tuple,
+        chunk: List[EntityBase],
+        filters_where: str,
+        filter_values_map: Dict[str, Any],
+    ):
+        """
+        Executa o update (com um "case" por campo) de uma parte das entidades do
+        update_list (todas com o mesmo conjunto de campos a atualizar).
+        """
+        kwargs = {**filter_values_map}
+        key_refs = []
+        values_list = []
+        for idx, entity in enumerate(chunk):
+            values_map = convert_to_dumps(entity)
+            kwargs[f"candidate_key_value_{idx}"] = values_map[key_field]
+            key_refs.append(f":candidate_key_value_{idx}")
+            values_list.append(values_map)
+
+        # Montando um "case" por campo, selecionando o valor pela chave
+        sql_fields = []
+        for field in fields:
+            whens = []
+            for idx, values_map in enumerate(values_list):
+                kwargs[f"{field}_{idx}"] = values_map[field]
+                whens.append(f"when :candidate_key_value_{idx} then :{field}_{idx}")
+
+            sql_fields.append(
+                f"{field} = case t0.{key_field} {' '.join(whens)} else t0.{field} end"
+            )
+
+        # Montando a query principal
+        sql = f"""
+        update {chunk[0].get_table_name()} as t0 set
+
+            {', '.join(sql_fields)}
+
+        where
+            true
+            and t0.{key_field} in ({', '.join(key_refs)})
+            {filters_where}
+        """
+
+        # Realizando o update no BD
+        self._invalidate_identity_map()
+        rowcount, _ = self._db.execute(sql, **kwargs)
+
+        if rowcount < len(chunk):
+            raise NotFoundException(
+                f"{self._entity_class.__name__} não encontrado. Atualizados {rowcount} de {len(chunk)} registros."
+            )
@@ -1,5 +1,6 @@
 import enum
 import re
+import threading
 import uuid
 
 from typing import Any, Dict, List, Tuple, Type
@@ -9,7 +10,19 @@ from nsj_gcf_utils.db_adapter2 import DBAdapter2
 from nsj_rest_lib.descriptor.filter_operator import FilterOperator
 from nsj_rest_lib.entity.entity_base import EntityBase
 from nsj_rest_lib.entity.filter import Filter
-from nsj_rest_lib.settings import REST_LIB_AUTO_INCREMENT_TABLE
+from nsj_rest_lib.settings import (
+    REST_LIB_AUTO_INCREMENT_BLOCK_SIZE,
+    REST_LIB_AUTO_INCREMENT_TABLE,
+)
+from nsj_rest_lib.util.cache_invalidation_bus import (
+    discard_deferred_cache_invalidation_events,
+    flush_deferred_cache_invalidation_events,
+)
+from nsj_rest_lib.util.cache_util import (
+    discard_deferred_entity_cache_invalidations,
+    flush_deferred_entity_cache_invalidations,
+)
+from nsj_rest_lib.util.identity_map import current_identity_map
 from nsj_rest_lib.util.join_aux import JoinAux
 from nsj_rest_lib.util.order_spec import (
     OrderFieldSource,
@@ -18,7 +31,27 @@ from nsj_rest_lib.util.order_spec import (
 )
 
 
+# Colunas retornadas nas consultas em que o json dos registros é montado pelo banco
+JSON_KEY_COLUMN = "_json_key"
+JSON_ROW_COLUMN = "_json_row"
+
+# Quantidade máxima de campos do json_build_object (a função recebe 2 argumentos por
+# campo, e o PostgreSQL limita as funções a 100 argumentos)
+JSON_BUILD_OBJECT_MAX_FIELDS = 50
+
+# Quantidade máxima de parâmetros por comando, nas gravações em lote (o protocolo do
+# PostgreSQL admite no máximo 65535 parâmetros, e alguns drivers, menos)
+SQL_MAX_BATCH_PARAMETERS = 30000
+
+# Cache, por processo, dos blocos de valores já reservados na tabela de controle
+# de sequências (chave: nome da sequência; valor: lista de valores ainda livres).
+_auto_increment_block_cache: Dict[str, List[int]] = {}
+_auto_increment_block_lock = threading.Lock()
+
+
 class DAOBaseUtil:
+    # Limite de parâmetros por comando, nas gravações em lote
+    _batch_max_parameters: int = SQL_MAX_BATCH_PARAMETERS
 
     def __init__(self, db: DBAdapter2, entity_class: Type[EntityBase]):
         self._db = db
@@ -38,14 +71,47 @@ class DAOBaseUtil:
         """
         self._db.commit()
 
+        # Repetindo as invalidações de cache das gravações feitas na transação (e
+        # publicando os respectivos eventos aos demais processos, fora da transação)
+        flush_deferred_entity_cache_invalidations()
+        flush_deferred_cache_invalidation_events(self._db)
+
     def rollback(self):
         """
         Faz rollback da transação corrente no banco de dados (se houver uma).
 
         Não dá erro, se não houver uma transação.
         """
+        self._invalidate_identity_map()
         self._db.rollback()
 
+        discard_deferred_entity_cache_invalidations()
+        discard_deferred_cache_invalidation_events()
+
+    def _batch_chunks(
+        self, items: List[Any], parameters_per_item: int, fixed_parameters: int = 0
+    ):
+        """
+        Divide os itens de uma gravação em lote em partes, de modo que nenhum comando
+        exceda o limite de parâmetros (_batch_max_parameters).
+        """
+        size = max(
+            1,
+            (self._batch_max_parameters - fixed_parameters)
+            // max(1, parameters_per_item),
+        )
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    def _invalidate_identity_map(self):
+        """
+        Limpa o mapa de identidade da requisição corrente (se houver um), pois os
+        registros carregados podem ter sido alterados por uma gravação.
+        """
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.clear()
+
     def in_transaction(self) -> bool:
         """
         Verifica se há uma transação em aberto no banco de dados
@@ -53,6 +119,47 @@ class DAOBaseUtil:
         """
         return self._db.in_transaction()
 
+    def _execute_query_to_rows(self, sql: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Executa uma query retornando, para cada registro, um dict com os mesmos valores
+        que seriam atribuídos a uma entity pelo "execute_query_to_model" (isto é:
+        os campos da entity não retornados ficam como None, e as colunas que não
+        correspondem a atributos da entity são descartadas), mas sem instanciar
+        as entities.
+
+        O plano de mapeamento (colunas ignoradas e campos faltantes) é resolvido uma
+        única vez por query, a partir das colunas do primeiro registro.
+        """
+
+        rows = self._db.execute_query(sql, **kwargs)
+        if len(rows) <= 0:
+            return rows
+
+        template = self._entity_class()
+        defaults = {
+            field: value
+            for field, value in template.__dict__.items()
+            if field != "_sql_fields"
+        }
+
+        columns = rows[0].keys()
+        ignored_columns = [
+            column for column in columns if not hasattr(template, column)
+        ]
+        missing_defaults = {
+            field: value for field, value in defaults.items() if field not in columns
+        }
+
+        for row in rows:
+            for column in ignored_columns:
+                del row[column]
+
+            if missing_defaults:
+                for field, value in missing_defaults.items():
+                    row[field] = value
+
+        return rows
+
     def _sql_fields(self, fields: List[str] = None, table_alias: str = "t0") -> str:
         """
         Returns a list of fields to build select queries (in string, with comma separator)
@@ -79,6 +186,39 @@ class DAOBaseUtil:
         resp = f", {table_alias}.".join(fields)
         return f"{table_alias}.{resp}"
 
+    def _sql_json_fields(
+        self,
+        json_fields: List[Tuple[str, str]],
+        key_field: str,
+        table_alias: str = "t0",
+    ) -> str:
+        """
+        Returns the select clause that builds, in the database, the json of each record
+        (a list of tuples: (json key, entity field)), and the key used for pagination.
+        """
+
+        if len(json_fields) <= JSON_BUILD_OBJECT_MAX_FIELDS:
+            pairs = ", ".join(
+                f"'{json_key}', {table_alias}.{entity_field}"
+                for json_key, entity_field in json_fields
+            )
+            json_sql = f"json_build_object({pairs})"
+        else:
+            # Para muitos campos, o json é montado a partir de um registro com as colunas
+            # renomeadas (preservando a ordem dos campos)
+            columns = ", ".join(
+                f'{table_alias}.{entity_field} as "{json_key}"'
+                for json_key, entity_field in json_fields
+            )
+            json_sql = (
+                f"(select row_to_json(json_obj) from (select {columns}) as json_obj)"
+            )
+
+        return (
+            f"{table_alias}.{key_field} as {JSON_KEY_COLUMN}, "
+            f"{json_sql}::text as {JSON_ROW_COLUMN}"
+        )
+
     def _resolve_order_alias(self, spec: OrderFieldSpec) -> str:
         if spec.alias:
             return spec.alias
@@ -409,17 +549,62 @@ exists (
         # Resolvendo o nome da sequência
         sequence_name = f"{sequence_base_name}_{'_'.join(group_fields)}"
 
+        # Sem cache de blocos (ou dentro de uma transação, onde um rollback
+        # desfaria a reserva, mas não o cache), reserva apenas um valor.
+        if REST_LIB_AUTO_INCREMENT_BLOCK_SIZE <= 1 or self._db.in_transaction():
+            return self._reserve_block(sequence_name, 1, start_value)[0]
+
+        with _auto_increment_block_lock:
+            cached_values = _auto_increment_block_cache.get(sequence_name)
+            if not cached_values:
+                cached_values = self._reserve_block(
+                    sequence_name, REST_LIB_AUTO_INCREMENT_BLOCK_SIZE, start_value
+                )
+                _auto_increment_block_cache[sequence_name] = cached_values
+
+            return cached_values.pop(0)
+
+    def reserve_vals(
+        self,
+        sequence_base_name: str,
+        group_fields: List[str],
+        quantity: int,
+        start_value: int = 1,
+    ) -> List[int]:
+        """
+        Reserva, numa única instrução, um bloco de "quantity" valores consecutivos
+        da sequência (evitando uma ida ao banco, e uma disputa pelo lock da linha
+        da tabela de controle, para cada valor gerado).
+
+        Retorna a lista dos valores reservados, em ordem crescente.
+        """
+        # Resolvendo o nome da sequência
+        sequence_name = f"{sequence_base_name}_{'_'.join(group_fields)}"
+
+        return self._reserve_block(sequence_name, quantity, start_value)
+
+    def _reserve_block(
+        self,
+        sequence_name: str,
+        quantity: int,
+        start_value: int,
+    ) -> List[int]:
         # Montando a query
         sql = f"""
         INSERT INTO {REST_LIB_AUTO_INCREMENT_TABLE} (seq_name, current_value)
-        VALUES (:sequence_name, :start_value)
+        VALUES (:sequence_name, :initial_value)
         ON CONFLICT (seq_name)
-        DO UPDATE SET current_value = {REST_LIB_AUTO_INCREMENT_TABLE}.current_value + 1
+        DO UPDATE SET current_value = {REST_LIB_AUTO_INCREMENT_TABLE}.current_value + :quantity
         RETURNING {REST_LIB_AUTO_INCREMENT_TABLE}.current_value
         """
 
-        # Executando e retornando
+        # Executando e montando o intervalo reservado
         resp = self._db.execute_query_first_result(
-            sql, sequence_name=sequence_name, start_value=start_value
+            sql,
+            sequence_name=sequence_name,
+            initial_value=start_value + quantity - 1,
+            quantity=quantity,
         )
-        return resp["current_value"]
+        last_value = resp["current_value"]
+
+        return list(range(last_value - quantity + 1, last_value + 1))
@@ -5,6 +5,11 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional, Set, Type, Union, Literal
 
 from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import (
+    CompactDTOField,
+    install_compact_storage,
+)
+from nsj_rest_lib.dto.dto_hydrator import DTOHydrator
 from nsj_rest_lib.descriptor.dto_aggregator import DTOAggregator
 from nsj_rest_lib.descriptor.dto_one_to_one_field import DTOOneToOneField
 from nsj_rest_lib.descriptor.conjunto_type import ConjuntoType
@@ -41,6 +46,9 @@ class DTO:
             Literal["RAW"], Literal["DATE"], Literal["HASH"]
         ] = "HASH",
         partial_of: Optional[Dict[str, Any]] = None,
+        skip_unchanged_update: bool = False,
+        compact_storage: bool = False,
+        lazy_fields: bool = False,
     ) -> None:
         """
         -----------
@@ -110,6 +118,24 @@ class DTO:
                 "relation_field": "{Nome do campo, da entity extensora, usado como chave do relacionamento}",
                 "related_entity_field": "{Nome do campo, da entity principal, para onde o relacionamento aponta}"
             }
+
+        - skip_unchanged_update: Se True, nas atualizações (PUT/PATCH), os dados recebidos são comparados com o registro
+            já gravado (recuperado antes do update), e apenas as colunas alteradas são enviadas ao banco. Se nenhuma
+            coluna for alterada, o update não é executado (evitando escrita, triggers e atualização de "atualizado_em"
+            desnecessárias). Padrão: False.
+
+        - compact_storage: Se True, os valores dos campos simples (DTOField) de cada instância são guardados numa
+            lista de posições fixas (em vez de uma chave por campo no __dict__), e os DTOs de leitura compartilham
+            um mesmo conjunto vazio de "_provided_fields" (imutável). Reduz o consumo de memória em listagens
+            grandes, sobretudo de DTOs com muitos campos. O acesso aos campos (getattr/setattr) não muda, mas o
+            __dict__ da instância deixa de conter os campos simples. Padrão: False.
+
+        - lazy_fields: Se True, os DTOs montados a partir do banco (caminho de leitura) guardam a linha recuperada, e
+            os campos simples (DTOField) só são convertidos e validados na primeira leitura (pelo próprio campo, ou
+            pelo convert_to_dict). Assim, numa listagem, apenas os campos efetivamente retornados são convertidos.
+            Os campos com convert_from_entity são convertidos juntos, na primeira leitura de qualquer um deles.
+            Erros de conversão desses campos passam a ocorrer na leitura do campo (e não na criação do DTO).
+            Padrão: False.
         """
         super().__init__()
 
@@ -120,6 +146,9 @@ class DTO:
         self._partial_of_config = partial_of
         self._etag_fields = etag_fields
         self._etag_type = etag_type
+        self._skip_unchanged_update = skip_unchanged_update
+        self._compact_storage = compact_storage
+        self._lazy_fields = lazy_fields
 
         # Validando os parâmetros de data_override
         self._validate_data_override(data_override)
@@ -289,6 +318,12 @@ class DTO:
         # Criando a propriedade "auto_increment_fields"
         self._check_class_attribute(cls, "auto_increment_fields", set())
 
+        # Criando a propriedade "skip_unchanged_update"
+        cls.skip_unchanged_update = self._skip_unchanged_update
+
+        # Criando a propriedade "lazy_fields"
+        cls.lazy_fields = self._lazy_fields
+
         # Tratando das propriedades das extensões parciais
         partial_parent_fields: Set[str] = set()
         partial_extension_fields: Set[str] = set()
@@ -600,6 +635,15 @@ class DTO:
             child_dto.fields_map[key_in_child] = field
             child_dto.search_fields.add(key_in_child)
             child_dto.integrity_check_fields_map[key_in_child] = attr
+
+            field.compile_validator()
+
+            # Recompilando o plano de montagem do DTO filho (por conta do novo campo)
+            if "_dto_hydrator" in child_dto.__dict__:
+                child_dto._dto_hydrator = DTOHydrator(child_dto)
+            child_dto._dict_projectors = {}
+            child_dto._entity_converters = {}
+            child_dto._default_fields_tree = None
             pass
 
         # Setting tipo de Conjunto
@@ -651,6 +695,30 @@ class DTO:
         for operation in ("insert", "update", "get", "list", "delete"):
             self._build_function_field_lookup(cls, operation=operation)
 
+        # Armazenamento compacto dos campos (também mantido nas classes que herdam,
+        # ou copiam, campos de um DTO compacto)
+        if self._compact_storage or any(
+            isinstance(dto_field, CompactDTOField)
+            for dto_field in cls.fields_map.values()
+        ):
+            install_compact_storage(cls)
+
+        # Compilando os validadores especializados dos campos (caminho de escrita)
+        for dto_field in cls.fields_map.values():
+            dto_field.compile_validator()
+
+        # Compilando o plano de montagem do DTO a partir de entities (caminho de leitura)
+        cls._dto_hydrator = DTOHydrator(cls)
+
+        # Cache das projeções (para dict) compiladas, por fields e expands
+        cls._dict_projectors = {}
+
+        # Cache dos planos de conversão para entity, por classe de entidade
+        cls._entity_converters = {}
+
+        # A árvore de fields padrão (resumo) é montada sob demanda, após a configuração
+        cls._default_fields_tree = None
+
         return cls
 
     def _validate_data_override_properties(self, cls):
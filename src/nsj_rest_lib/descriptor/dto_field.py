@@ -7,6 +7,9 @@ from typing import Any
 from nsj_rest_lib.descriptor.filter_operator import FilterOperator
 from nsj_rest_lib.util.type_validator_util import TypeValidatorUtil
 
+# Chave (no __dict__ da instância) da linha de origem dos DTOs com lazy_fields
+LAZY_ROW = "_lazy_row"
+
 
 class DTOFieldFilter:
     def __init__(
@@ -228,20 +231,32 @@ class DTOField:
         self.storage_name = f"_{self.__class__.__name__}#{self.__class__._ref_counter}"
         self.__class__._ref_counter += 1
 
+        # Validador especializado (montado no decorator DTO, por meio do compile_validator)
+        self._compiled_validate = None
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        else:
+
+        try:
+            return instance.__dict__[self.storage_name]
+        except KeyError:
+            # Campo ainda não materializado (DTO com lazy_fields)
+            lazy_row = instance.__dict__.get(LAZY_ROW)
+            if lazy_row is None or not lazy_row.load(instance, self.name):
+                raise
+
             return instance.__dict__[self.storage_name]
 
     def __set__(self, instance, value):
         try:
-            if self.validator is None:
-                if self.use_default_validator:
-                    value = self.validate(self, value, instance)
-            else:
-                if self.use_default_validator:
+            if self.use_default_validator:
+                compiled_validate = self._compiled_validate
+                if compiled_validate is not None:
+                    value = compiled_validate(value, instance)
+                else:
                     value = self.validate(self, value, instance)
+            if self.validator is not None:
                 value = self.validator(self, value)
         except ValueError as e:
             if not (
@@ -322,6 +337,110 @@ class DTOField:
 
         return value
 
+    def compile_validator(self):
+        """
+        Monta o validador padrão especializado para a configuração atual do campo
+        (equivalente ao método validate, mas com a conversão de tipo resolvida uma
+        única vez, e sem testar as restrições não configuradas).
+
+        Deve ser chamado após a configuração completa do campo (o que é feito no
+        decorator DTO). Se o método validate for sobrescrito, ou o tipo esperado não
+        for uma classe, mantém-se a validação genérica.
+        """
+
+        expected_type = self.expected_type
+        if type(self).validate is not DTOField.validate or not (
+            expected_type is None or isinstance(expected_type, type)
+        ):
+            self._compiled_validate = None
+            return
+
+        storage_name = self.storage_name
+        not_null = self.not_null
+        strip = self.strip
+        pk = self.pk
+        min_value = self.min
+        max_value = self.max
+        field = self
+        convert = (
+            TypeValidatorUtil.get_converter(expected_type)
+            if expected_type is not None
+            else None
+        )
+
+        if not not_null and min_value is None and max_value is None and not strip:
+            # Caso mais comum: apenas a verificação de tipo
+            if convert is None:
+
+                def validate_nothing(value, instance):
+                    return value
+
+                self._compiled_validate = validate_nothing
+                return
+
+            def validate_type(value, instance):
+                if value is None or isinstance(value, expected_type):
+                    return value
+                return convert(field, value)
+
+            self._compiled_validate = validate_type
+            return
+
+        def validate(value, instance):
+            # Checking not null constraint
+            if (
+                not_null
+                and (
+                    value is None
+                    or (
+                        isinstance(value, str)
+                        and len(value.strip() if strip else value) <= 0
+                    )
+                )
+                and (not pk or instance.__dict__.get("generate_default_pk_value"))
+            ):
+                raise ValueError(f"O campo {storage_name} deve estar preenchido.")
+
+            # Checking type constraint
+            if (
+                convert is not None
+                and value is not None
+                and not isinstance(value, expected_type)
+            ):
+                value = convert(field, value)
+
+            # Checking min constraint
+            if min_value is not None:
+                if isinstance(value, str):
+                    if len(value) < min_value:
+                        raise ValueError(
+                            f"O campo {storage_name} deve conter no mínimo {min_value} caracteres. Valor recebido: {value}."
+                        )
+                elif isinstance(value, (int, float, Decimal)) and value < min_value:
+                    raise ValueError(
+                        f"O campo {storage_name} deve ser maior ou igual a {min_value}. Valor recebido: {value}."
+                    )
+
+            # Checking max constraint
+            if max_value is not None:
+                if isinstance(value, str):
+                    if len(value) > max_value:
+                        raise ValueError(
+                            f"O campo {storage_name} deve conter no máximo {max_value} caracteres. Valor recebido: {value}."
+                        )
+                elif isinstance(value, (int, float, Decimal)) and value > max_value:
+                    raise ValueError(
+                        f"O campo {storage_name} deve ser menor ou igual a {max_value}. Valor recebido: {value}."
+                    )
+
+            # Striping strings (if desired)
+            if strip and isinstance(value, str):
+                value = value.strip()
+
+            return value
+
+        self._compiled_validate = validate
+
     def get_entity_field_name(self) -> str:
         """
         Retorna o nome correspondente do field no entity
@@ -6,6 +6,7 @@ from nsj_rest_lib.entity.function_type_base import (
     InsertFunctionTypeBase,
     UpdateFunctionTypeBase,
 )
+from nsj_rest_lib.util.cache_util import LRUTTLCache, register_entity_cache
 from nsj_rest_lib.util.fields_util import FieldsTree, build_fields_tree
 
 
@@ -31,6 +32,9 @@ class DTOObjectField:
         convert_to_function: typing.Callable = None,
         get_function_field: str = None,
         delete_function_field: str = None,
+        cache_ttl: typing.Optional[float] = None,
+        cache_maxsize: int = 1024,
+        cache_preload: bool = False,
     ):
         """
         DEPRECATED! Use DTOOneToOneField instead!
@@ -86,6 +90,17 @@ class DTOObjectField:
         - get_function_field: Nome do campo equivalente no Get/ListFunctionType (default: o próprio nome do campo no DTO).
 
         - delete_function_field: Nome do campo equivalente no DeleteFunctionType (default: o próprio nome do campo no DTO).
+
+        - cache_ttl: Quando informado, os DTOs relacionados são mantidos num cache em memória (por processo), por até
+            cache_ttl segundos (indicado para tabelas de referência, pequenas e raramente alteradas). O cache é invalidado
+            pelas gravações feitas pelos services sobre a entidade relacionada, no mesmo processo.
+
+        - cache_maxsize: Quantidade máxima de DTOs relacionados no cache.
+
+        - cache_preload: Se a tabela relacionada deve ser carregada inteira no primeiro uso do cache (padrão: False;
+            apenas para DTOs relacionados sem campos de partição). A carga é limitada ao cache_maxsize: se a tabela não
+            couber no cache, passam a ser consultadas apenas as chaves ausentes. O cache não é usado quando os fields
+            do DTO relacionado leem outras tabelas (relacionamentos e joins).
         """
         self.name = None
         self.description = description
@@ -105,6 +120,12 @@ class DTOObjectField:
         self.convert_to_function = convert_to_function
         self.get_function_field = get_function_field
         self.delete_function_field = delete_function_field
+        self.cache_preload = cache_preload
+
+        self.reference_cache = None
+        if cache_ttl is not None and entity_type is not None:
+            self.reference_cache = LRUTTLCache(cache_maxsize, cache_ttl)
+            register_entity_cache(entity_type.table_name, self.reference_cache)
 
         self.storage_name = f"_{self.__class__.__name__}#{self.__class__._ref_counter}"
         self.__class__._ref_counter += 1
@@ -6,6 +6,7 @@ from nsj_rest_lib.entity.function_type_base import (
     InsertFunctionTypeBase,
     UpdateFunctionTypeBase,
 )
+from nsj_rest_lib.util.cache_util import LRUTTLCache, register_entity_cache
 
 from .dto_field import DTOField
 
@@ -44,6 +45,8 @@ class DTOOneToOneField:
     validator: ty.Optional[ty.Callable[..., ty.Any]]
     description: str
     convert_to_function: ty.Optional[ty.Callable[..., ty.Any]]
+    reference_cache: ty.Optional[LRUTTLCache]
+    cache_preload: bool
 
     def __init__(
         self,
@@ -64,6 +67,9 @@ class DTOOneToOneField:
         get_function_field: ty.Optional[str] = None,
         delete_function_field: ty.Optional[str] = None,
         relation_field: ty.Optional[str] = None,
+        cache_ttl: ty.Optional[float] = None,
+        cache_maxsize: int = 1024,
+        cache_preload: bool = False,
     ):
         """Descriptor used for One to One relations.
         ---------
@@ -139,6 +145,21 @@ class DTOOneToOneField:
         - get_function_field: Nome do campo equivalente no Get/ListFunctionType (default: o próprio nome do campo no DTO).
 
         - delete_function_field: Nome do campo equivalente no DeleteFunctionType (default: o próprio nome do campo no DTO).
+
+        - cache_ttl: When set, the `Related DTO`s are kept in an in-memory
+            (per process) cache for up to `cache_ttl` seconds, so expanding
+            this field costs no extra queries (meant for small, rarely changing
+            reference tables). The cache is invalidated by writes made through
+            the services on the `entity_type` table, in the same process.
+
+        - cache_maxsize: Maximum number of `Related DTO`s in the cache.
+
+        - cache_preload: If the whole `entity_type` table should be loaded on
+            the first use of the cache (default: False; only when the
+            `Related DTO` has no partition fields). The load is bounded by
+            `cache_maxsize`: if the table does not fit in the cache, only the
+            missing keys are fetched. The cache is not used when the fields of
+            the `Related DTO` read other tables (relations and joins).
         """
         self.entity_type = entity_type
         self.relation_type = relation_type
@@ -157,6 +178,12 @@ class DTOOneToOneField:
         self.get_function_field = get_function_field
         self.delete_function_field = delete_function_field
         self.relation_field = relation_field or ''
+        self.cache_preload = cache_preload
+
+        self.reference_cache = None
+        if cache_ttl is not None:
+            self.reference_cache = LRUTTLCache(cache_maxsize, cache_ttl)
+            register_entity_cache(entity_type.table_name, self.reference_cache)
 
         self.name = None
         self.expected_type = ty.cast(ty.Type['DTOBase'], type)
@@ -12,17 +12,25 @@ from nsj_rest_lib.entity.entity_base import EMPTY, EntityBase
 from nsj_rest_lib.descriptor.dto_aggregator import DTOAggregator
 from nsj_rest_lib.descriptor.dto_one_to_one_field import DTOOneToOneField
 from nsj_rest_lib.descriptor.conjunto_type import ConjuntoType
-from nsj_rest_lib.descriptor.dto_field import DTOField, DTOFieldFilter
+from nsj_rest_lib.descriptor.dto_field import LAZY_ROW, DTOField, DTOFieldFilter
+from nsj_rest_lib.dto.dto_compact_storage import (
+    COMPACT_VALUES,
+    EMPTY_PROVIDED_FIELDS,
+    UNSET,
+)
+from nsj_rest_lib.dto.dto_entity_converter import DTOEntityConverter
+from nsj_rest_lib.dto.dto_projector import DTODictProjector
 from nsj_rest_lib.util.fields_util import (
     FieldsTree,
     clone_fields_tree,
-    extract_child_tree,
-    merge_fields_tree,
-    normalize_fields_tree,
+    freeze_fields_tree,
 )
-from nsj_rest_lib.util.enum_util import enum_to_primitive_value
+from nsj_rest_lib.util.enum_util import get_enum_lookup
 from nsj_rest_lib.util.sql_utils import montar_chave_map_sql_join
 
+# Quantidade máxima de projeções (para dict) mantidas em cache, por classe de DTO
+_MAX_DICT_PROJECTORS = 256
+
 
 class DTOBase(abc.ABC, DTOAuditavel):
     resume_fields: Set[str] = set()
@@ -59,6 +67,10 @@ class DTOBase(abc.ABC, DTOAuditavel):
     return_hidden_fields: dict[str, any] = {}
     etag_fields: Set[str] = set()
     etag_type: Union[Literal["RAW"], Literal["DATE"], Literal["HASH"]] = "HASH"
+    skip_unchanged_update: bool = False
+    lazy_fields: bool = False
+    _compact_fields: Tuple[str, ...] = ()
+    _compact_size: int = 0
 
     def __init__(
         self,
@@ -71,14 +83,32 @@ class DTOBase(abc.ABC, DTOAuditavel):
     ) -> None:
         super().__init__()
 
+        # Armazenamento compacto dos campos (ver parâmetro compact_storage do decorator DTO)
+        compact_size = self.__class__._compact_size
+        if compact_size:
+            self.__dict__[COMPACT_VALUES] = [UNSET] * compact_size
+
         self.escape_validator = escape_validator
         self.generate_default_pk_value = generate_default_pk_value
 
         if entity is None and not kwargs_as_entity:
             self._provided_fields = set(kwargs.keys())
+        elif compact_size:
+            self._provided_fields = EMPTY_PROVIDED_FIELDS
         else:
             self._provided_fields = set()
 
+        # Caminho de leitura: usando o plano de montagem pré-compilado para a classe
+        hydrator = self.__class__.__dict__.get("_dto_hydrator")
+        if (
+            hydrator is not None
+            and entity is not None
+            and escape_validator
+            and not validate_read_only
+        ):
+            hydrator.hydrate(self, entity, generate_default_pk_value)
+            return
+
         # Transformando a entity em dict (se houver uma entity)
         if entity is not None:
             kwargs = (
@@ -339,6 +369,52 @@ class DTOBase(abc.ABC, DTOAuditavel):
         """
         return None
 
+    def __getattr__(self, name: str):
+        # Atributos (fora do fields_map) criados pelas conversões customizadas ainda
+        # pendentes, nos DTOs com lazy_fields
+        lazy_row = self.__dict__.get(LAZY_ROW)
+        if lazy_row is not None and lazy_row.converters_pending:
+            lazy_row.load_converters(self)
+            return getattr(self, name)
+
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+    def snapshot(self) -> "DTOBase":
+        """
+        Retorna uma cópia rasa do DTO, preservando o estado atual dos campos (útil para
+        guardar o DTO recebido antes de hooks que possam alterá-lo).
+
+        Apenas o armazenamento dos campos é copiado (os valores são compartilhados), e os
+        itens das listas de relacionamento (DTOListField) são copiados da mesma forma.
+        Assim, atribuições feitas no DTO original (inclusive nos itens das listas) não
+        afetam o snapshot, mas alterações "in place" em valores mutáveis (como dicts)
+        são compartilhadas.
+        """
+        lazy_row = self.__dict__.get(LAZY_ROW)
+        if lazy_row is not None:
+            lazy_row.load_all(self)
+
+        result = object.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+
+        if COMPACT_VALUES in self.__dict__:
+            result.__dict__[COMPACT_VALUES] = list(self.__dict__[COMPACT_VALUES])
+
+        if "_provided_fields" in self.__dict__:
+            result._provided_fields = set(self._provided_fields)
+
+        for field in self.__class__.list_fields_map:
+            value = self.__dict__.get(field)
+            if value is not None:
+                result.__dict__[field] = [
+                    item.snapshot() if isinstance(item, DTOBase) else item
+                    for item in value
+                ]
+
+        return result
+
     def convert_to_entity(
         self,
         entity_class: EntityBase,
@@ -353,101 +429,32 @@ class DTOBase(abc.ABC, DTOAuditavel):
         são tratadas neste método.
         """
 
-        entity: EntityBase = entity_class()
+        converter = self.__class__._get_entity_converter(entity_class, is_insert)
+        return converter.convert(self, none_as_empty)
 
-        for field, dto_field in self.__class__.fields_map.items():
-            # Verificando se é preciso realizar uma tradução de nome do campo
-            entity_field = field
-            if dto_field.entity_field is not None:
-                entity_field = dto_field.entity_field
-
-            # Verificando se o campo existe na entity
-            if not hasattr(entity, entity_field):
-                continue
-
-            # Recuperando o valor
-            value = getattr(self, field)
-
-            # Verificando se o campo é de auto incremento gerenciado pelo banco de dados, e,
-            # se o valor é None pulando o campo para não entrar na query
-            if (
-                is_insert
-                and dto_field.auto_increment is not None
-                and dto_field.auto_increment.db_managed
-                and value is None
-            ):
-                continue
-
-            # Verificando se é necessária alguma conversão customizada
-            custom_value_converted = DTOBase.custom_convert_value_to_entity(
-                value,
-                dto_field,
-                entity_field,
-                none_as_empty,
-                self.__dict__,
-            )
-            if len(custom_value_converted) > 0:
-                for key in custom_value_converted:
-                    setattr(entity, key, custom_value_converted[key])
-                    entity._sql_fields.append(key)
-            else:
-                # Convertendo o value para o correspondente nos fields
-                value = DTOBase.convert_value_to_entity(
-                    value,
-                    dto_field,
-                    none_as_empty,
-                    entity_class,
-                )
-
-                # Setando na entidade
-                setattr(entity, entity_field, value)
-                entity._sql_fields.append(entity_field)
-
-        for k, _ in self.__class__.aggregator_fields_map.items():
-            dto = getattr(self, k)
-            if dto is None:
-                # NOTE: Skipping if the field was not given
-                continue
-
-            for agg_field, dto_field in dto.fields_map.items():
-                entity_field = dto_field.entity_field or agg_field
-
-                if hasattr(entity, entity_field) is False:
-                    continue
-
-                # pylint: disable-next=protected-access
-                if entity_field in entity._sql_fields:
-                    # NOTE: Skipping a field if it was already created
-                    #           previously. This means that the field in
-                    #           the base DTO is always.
-                    continue
+    @classmethod
+    def _get_entity_converter(
+        cls,
+        entity_class: EntityBase,
+        is_insert: bool,
+    ) -> DTOEntityConverter:
+        """
+        Retorna o plano de conversão (para entity) compilado para a classe de
+        entidade recebida, mantendo um cache por classe de DTO.
+        """
 
-                value = getattr(dto, agg_field)
-                custom_value_converted = DTOBase.custom_convert_value_to_entity(
-                    value,
-                    dto_field,
-                    entity_field,
-                    none_as_empty,
-                    self.__dict__,
-                )
-                if len(custom_value_converted) > 0:
-                    for k1, v1 in custom_value_converted.items():
-                        setattr(entity, k1, v1)
-                        # pylint: disable-next=protected-access
-                        entity._sql_fields.append(k1)
-                else:
-                    val = DTOBase.convert_value_to_entity(
-                        value,
-                        dto_field,
-                        none_as_empty,
-                        entity_class,
-                    )
+        cache = cls.__dict__.get("_entity_converters")
+        if cache is None:
+            cache = {}
+            cls._entity_converters = cache
 
-                    setattr(entity, entity_field, val)
-                    # pylint: disable-next=protected-access
-                    entity._sql_fields.append(entity_field)
+        key = (entity_class, bool(is_insert))
+        converter = cache.get(key)
+        if converter is None:
+            converter = DTOEntityConverter(cls, entity_class, bool(is_insert))
+            cache[key] = converter
 
-        return entity
+        return converter
 
     def custom_convert_value_to_entity(
         value: Any,
@@ -519,51 +526,27 @@ class DTOBase(abc.ABC, DTOAuditavel):
             else:
                 return None
 
-        # Construindo uma lista com os itens do enumerado esperado
-        lista_enum = list(dto_field.expected_type)
+        # Tabelas de busca do enumerado esperado (montadas uma única vez por enum)
+        lookup = get_enum_lookup(dto_field.expected_type)
 
         # Se o enum estiver vazio
-        if len(lista_enum) <= 0:
+        if lookup.empty:
             return None
 
         # Verificando o tipo dos valores do enum
-        if isinstance(lista_enum[0].value, tuple):
+        if lookup.tuple_values:
             # Recuperando o item correspondente do enumerado
             enumerado = value
-            parou = False
             if not isinstance(value, dto_field.expected_type):
-                for item in dto_field.expected_type:
-                    lista_valores = list(item.value)
-                    for valor in lista_valores:
-                        if valor == value:
-                            enumerado = item
-                            parou = True
-                            break
-
-                        # Se o valor for string, testa inclusive em caixa alta e baixa
-                        if isinstance(value, str):
-                            if valor == value.lower() or valor == value.upper():
-                                enumerado = item
-                                parou = True
-                                break
-
-                    if parou:
-                        break
+                item = lookup.find_member(value)
+                if item is not None:
+                    enumerado = item
 
             # Convertendo do enumerado para o valor desejado na entidade
-            return enum_to_primitive_value(enumerado)
+            return lookup.entity_value(enumerado)
         else:
             # Tentando pelo valor do próprio enum (e testando os casos, se for str)
-            if isinstance(value, str):
-                try:
-                    return dto_field.expected_type(value)
-                except ValueError:
-                    try:
-                        return dto_field.expected_type(value.lower())
-                    except ValueError:
-                        return dto_field.expected_type(value.upper())
-            else:
-                return dto_field.expected_type(value)
+            return lookup.convert_value(value)
 
     @classmethod
     def build_default_fields_tree(cls) -> FieldsTree:
@@ -577,6 +560,16 @@ class DTOBase(abc.ABC, DTOAuditavel):
         :return: Uma estrutura de fields em formato de árvore.
         :rtype: FieldsTree
         """
+        # A árvore é montada uma única vez por classe (cada chamada recebe uma cópia)
+        default_tree = cls.__dict__.get("_default_fields_tree")
+        if default_tree is None:
+            default_tree = cls._make_default_fields_tree()
+            cls._default_fields_tree = default_tree
+
+        return clone_fields_tree(default_tree)
+
+    @classmethod
+    def _make_default_fields_tree(cls) -> FieldsTree:
         tree: FieldsTree = {"root": set(cls.resume_fields)}
 
         for field_name, descriptor in cls.list_fields_map.items():
@@ -613,120 +606,56 @@ class DTOBase(abc.ABC, DTOAuditavel):
         Converte DTO para dict
         """
 
-        # Resolving fields to use
-        if just_resume:
-            fields_tree = self.__class__.build_default_fields_tree()
-        else:
-            if fields is None:
-                fields_tree = self.__class__.build_default_fields_tree()
-            else:
-                fields_tree = normalize_fields_tree(fields)
-                merge_fields_tree(
-                    fields_tree,
-                    self.__class__.build_default_fields_tree(),
-                )
-
-        if expands is None:
-            expands = {"root": set()}
-
-        # Making result maps
-        result = {}
-
-        # Converting simple fields
-        for field in self.fields_map:
-            if field not in fields_tree["root"]:
-                continue
-
-            result[field] = getattr(self, field)
-
-        # Converting sql join fields
-        for field in self.sql_join_fields_map:
-            if field not in fields_tree["root"]:
-                continue
-
-            result[field] = getattr(self, field)
-
-        # Converting left join fields
-        for field in self.left_join_fields_map:
-            if field not in fields_tree["root"]:
-                continue
-
-            result[field] = getattr(self, field)
-
-        for field in self.object_fields_map:
-            if field not in fields_tree["root"]:
-                continue
-
-            result[field] = (
-                getattr(self, field).convert_to_dict(
-                    extract_child_tree(fields_tree, field)
-                )
-                if getattr(self, field) is not None
-                else None
-            )
-
-        for field, oto_field in self.one_to_one_fields_map.items():
-            if field not in fields_tree["root"] or field not in expands["root"]:
-                continue
-
-            if getattr(self, field) is None:
-                result[field] = None
-            else:
-                if isinstance(getattr(self, field), oto_field.expected_type):
-                    result[field] = getattr(self, field).convert_to_dict(
-                        fields_tree[field] if field in fields_tree else None,
-                        expands[field] if field in expands else None,
-                    )
-                    pass
-                pass
-            pass
+        projector = self.__class__._get_dict_projector(fields, expands, just_resume)
+        return projector.project(self)
 
-        for k in self.aggregator_fields_map:
-            if k not in fields_tree["root"]:
-                continue
+    @classmethod
+    def get_dict_projector(
+        cls,
+        fields: Optional[FieldsTree] = None,
+        expands: Optional[Dict[str, Set[str]]] = None,
+        just_resume: bool = False,
+    ) -> DTODictProjector:
+        """
+        Retorna a projeção (para dict) da classe de DTO, para os fields e expands
+        recebidos, permitindo converter vários DTOs (ex.: uma página da listagem)
+        sem resolver a projeção a cada objeto (ver DTODictProjector.convert).
+        """
+        return cls._get_dict_projector(fields, expands, just_resume)
 
-            value = getattr(self, k, None)
-            if value is None:
-                result[k] = None
-                continue
-            if hasattr(value, "convert_to_dict"):
-                result[k] = value.convert_to_dict(
-                    extract_child_tree(fields_tree, k),
-                    extract_child_tree(expands, k),
-                )
-            else:
-                result[k] = value
+    @classmethod
+    def _get_dict_projector(
+        cls,
+        fields: Optional[FieldsTree],
+        expands: Optional[Dict[str, Set[str]]],
+        just_resume: bool,
+    ) -> DTODictProjector:
+        """
+        Retorna a projeção (para dict) compilada para a combinação de fields e
+        expands recebida, mantendo um cache por classe de DTO.
+        """
 
-        # Converting list fields
-        for field in self.list_fields_map:
-            if field not in fields_tree["root"]:
-                continue
+        key = (
+            None if just_resume else freeze_fields_tree(fields),
+            freeze_fields_tree(expands),
+            just_resume,
+        )
 
-            # Criando o mapa de fields para a entidade aninhada
-            internal_fields = extract_child_tree(fields_tree, field)
-            internal_expands = extract_child_tree(expands, field)
+        cache = cls.__dict__.get("_dict_projectors")
+        if cache is None:
+            cache = {}
+            cls._dict_projectors = cache
 
-            # Recuperando o valor do atributo sem disparar descriptor em DTO incompleto
-            value = self.__dict__.get(field, None)
-            if value is None:
-                result[field] = None
-                continue
+        projector = cache.get(key)
+        if projector is None:
+            projector = DTODictProjector(cls, fields, expands, just_resume)
 
-            # Convetendo a lista de DTOs aninhados
-            result[field] = [
-                (
-                    item.convert_to_dict(
-                        clone_fields_tree(internal_fields),
-                        clone_fields_tree(internal_expands),
-                        just_resume,
-                    )
-                    if item is not None and hasattr(item, "convert_to_dict")
-                    else item
-                )
-                for item in value
-            ]
+            # Limitando o tamanho do cache (as combinações vêm das query strings)
+            if len(cache) >= _MAX_DICT_PROJECTORS:
+                cache.clear()
+            cache[key] = projector
 
-        return result
+        return projector
 
     def get_entity_field_name(self, dto_field_name: str) -> str | None:
         """
@@ -0,0 +1,129 @@
+import typing as ty
+
+from nsj_rest_lib.descriptor.dto_field import LAZY_ROW, DTOField
+
+# Chave (no __dict__ da instância) da lista com os valores dos campos compactos
+COMPACT_VALUES = "_compact_values"
+
+# Conjunto vazio compartilhado, usado como "_provided_fields" dos DTOs compactos
+EMPTY_PROVIDED_FIELDS: ty.FrozenSet[str] = frozenset()
+
+
+class _Unset:
+    def __repr__(self) -> str:
+        return "UNSET"
+
+
+# Marcador de campo ainda não preenchido (equivalente à ausência da chave no __dict__)
+UNSET = _Unset()
+
+
+class CompactDTOField(DTOField):
+    """
+    Variante do DTOField usada nos DTOs com armazenamento compacto (ver parâmetro
+    "compact_storage" do decorator DTO).
+
+    O valor do campo é guardado numa posição fixa da lista de valores da instância,
+    em vez de uma chave própria no __dict__. A configuração, validação e conversão
+    do campo são as mesmas do DTOField original (do qual é uma cópia).
+    """
+
+    compact_index: int
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = instance.__dict__[COMPACT_VALUES][self.compact_index]
+        if value is UNSET:
+            # Campo ainda não materializado (DTO com lazy_fields)
+            lazy_row = instance.__dict__.get(LAZY_ROW)
+            if lazy_row is None or not lazy_row.load(instance, self.name):
+                raise KeyError(self.storage_name)
+
+            value = instance.__dict__[COMPACT_VALUES][self.compact_index]
+            if value is UNSET:
+                raise KeyError(self.storage_name)
+
+        return value
+
+    def __set__(self, instance, value):
+        try:
+            if self.use_default_validator:
+                compiled_validate = self._compiled_validate
+                if compiled_validate is not None:
+                    value = compiled_validate(value, instance)
+                else:
+                    value = self.validate(self, value, instance)
+            if self.validator is not None:
+                value = self.validator(self, value)
+        except ValueError as e:
+            if not (
+                "escape_validator" in instance.__dict__
+                and instance.__dict__["escape_validator"] == True
+            ):
+                raise
+
+        instance.__dict__[COMPACT_VALUES][self.compact_index] = value
+
+
+def install_compact_storage(cls) -> None:
+    """
+    Substitui os DTOFields simples da classe por CompactDTOFields, definindo a
+    posição de cada campo na lista de valores das instâncias.
+
+    Apenas os campos declarados diretamente como DTOField (ou herdados) são
+    compactados; os demais descritores (listas, objetos, joins, etc.) continuam
+    guardados no __dict__.
+    """
+    compact_fields: ty.List[str] = []
+
+    for field, dto_field in list(cls.fields_map.items()):
+        descriptor = getattr(cls, field, None)
+        if descriptor is not dto_field or type(dto_field) not in (
+            DTOField,
+            CompactDTOField,
+        ):
+            continue
+
+        compact_field = CompactDTOField.__new__(CompactDTOField)
+        compact_field.__dict__.update(dto_field.__dict__)
+        compact_field.compact_index = len(compact_fields)
+        compact_field.compile_validator()
+
+        setattr(cls, field, compact_field)
+        cls.fields_map[field] = compact_field
+        compact_fields.append(compact_field.storage_name)
+
+    cls._compact_fields = tuple(compact_fields)
+    cls._compact_size = len(compact_fields)
+
+
+def dto_values_dict(dto) -> ty.Dict[str, ty.Any]:
+    """
+    Retorna os valores do DTO como um dict (no formato do __dict__ de um DTO comum,
+    isto é, apenas com os campos preenchidos).
+
+    Para os DTOs comuns, retorna o próprio __dict__ (sem cópia). Para os DTOs com
+    armazenamento compacto, monta um novo dict equivalente. Os campos ainda não
+    materializados (DTOs com lazy_fields) são materializados antes.
+    """
+    values = dto.__dict__
+    lazy_row = values.get(LAZY_ROW)
+    if lazy_row is not None:
+        lazy_row.load_all(dto)
+
+    compact_values = values.get(COMPACT_VALUES)
+    if compact_values is None:
+        return values
+
+    result = {
+        key: value
+        for key, value in values.items()
+        if key != COMPACT_VALUES and key != LAZY_ROW
+    }
+    for field, value in zip(type(dto)._compact_fields, compact_values):
+        if value is not UNSET:
+            result[field] = value
+
+    return result
@@ -0,0 +1,198 @@
+import enum
+import typing as ty
+
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
+from nsj_rest_lib.entity.entity_base import EMPTY
+
+
+class DTOEntityConverter:
+    """
+    Plano de conversão de DTOs para entities, pré-compilado por combinação de
+    (classe de DTO, classe de Entity, inserção ou não), e usado no método
+    DTOBase.convert_to_entity.
+
+    O resultado é equivalente ao da conversão campo a campo original, mas os nomes
+    das colunas, a existência das mesmas na entity, e a conversão a ser aplicada em
+    cada valor (enumerados, bool para int, conversões customizadas) são resolvidos
+    uma única vez.
+    """
+
+    def __init__(self, dto_class, entity_class, is_insert: bool):
+        self.dto_class = dto_class
+        self.entity_class = entity_class
+        self.is_insert = is_insert
+
+        # Instância de referência, para verificar os campos existentes na entity
+        self._probe = entity_class()
+
+        self._steps = tuple(
+            step
+            for field, dto_field in dto_class.fields_map.items()
+            for step in [self._compile_field(field, dto_field, is_insert)]
+            if step is not None
+        )
+
+        # Planos dos agregadores, por classe do DTO agregado (montados sob demanda)
+        self._aggregator_fields = tuple(dto_class.aggregator_fields_map.keys())
+        self._aggregator_steps: ty.Dict[type, ty.Tuple] = {}
+
+    def convert(self, dto, none_as_empty: bool = False):
+        """
+        Cria uma instância da entidade, e a popula com os dados do DTO recebido.
+        """
+        entity = self.entity_class()
+        sql_fields = entity._sql_fields
+        dto_values = dto_values_dict(dto)
+
+        for field, entity_field, skip_if_none, custom_convert, convert in self._steps:
+            # Recuperando o valor
+            value = getattr(dto, field)
+
+            # Campo de auto incremento gerenciado pelo BD (não entra na query, se vazio)
+            if skip_if_none and value is None:
+                continue
+
+            # Verificando se é necessária alguma conversão customizada
+            if custom_convert is not None and value is not None:
+                self._set_custom_converted(
+                    entity,
+                    custom_convert(value, dto_values),
+                    entity_field,
+                    none_as_empty,
+                )
+                continue
+
+            # Convertendo o value para o correspondente nos fields
+            setattr(entity, entity_field, convert(value, none_as_empty))
+            sql_fields.append(entity_field)
+
+        for k in self._aggregator_fields:
+            agg_dto = getattr(dto, k)
+            if agg_dto is None:
+                # NOTE: Skipping if the field was not given
+                continue
+
+            for field, entity_field, _, custom_convert, convert in (
+                self._get_aggregator_steps(agg_dto.__class__)
+            ):
+                if entity_field in sql_fields:
+                    # NOTE: Skipping a field if it was already created
+                    #           previously. This means that the field in
+                    #           the base DTO is always.
+                    continue
+
+                value = getattr(agg_dto, field)
+                if custom_convert is not None and value is not None:
+                    self._set_custom_converted(
+                        entity,
+                        custom_convert(value, dto_values),
+                        entity_field,
+                        none_as_empty,
+                    )
+                    continue
+
+                setattr(entity, entity_field, convert(value, none_as_empty))
+                sql_fields.append(entity_field)
+
+        return entity
+
+    def _set_custom_converted(
+        self,
+        entity,
+        fields_converted: ty.Dict[str, ty.Any],
+        entity_field: str,
+        none_as_empty: bool,
+    ):
+        sql_fields = entity._sql_fields
+
+        if entity_field not in fields_converted:
+            setattr(entity, entity_field, None if not none_as_empty else EMPTY)
+            sql_fields.append(entity_field)
+
+        for converted_key, value in fields_converted.items():
+            if value is None and none_as_empty:
+                value = EMPTY
+            setattr(entity, converted_key, value)
+            sql_fields.append(converted_key)
+
+    def _get_aggregator_steps(self, agg_dto_class) -> ty.Tuple:
+        steps = self._aggregator_steps.get(agg_dto_class)
+        if steps is None:
+            steps = tuple(
+                step
+                for field, dto_field in agg_dto_class.fields_map.items()
+                for step in [self._compile_field(field, dto_field, False)]
+                if step is not None
+            )
+            self._aggregator_steps[agg_dto_class] = steps
+
+        return steps
+
+    def _compile_field(self, field: str, dto_field, is_insert: bool):
+        # Verificando se é preciso realizar uma tradução de nome do campo
+        entity_field = dto_field.entity_field or field
+
+        # Verificando se o campo existe na entity
+        if not hasattr(self._probe, entity_field):
+            return None
+
+        skip_if_none = (
+            is_insert
+            and dto_field.auto_increment is not None
+            and dto_field.auto_increment.db_managed
+        )
+
+        return (
+            field,
+            entity_field,
+            skip_if_none,
+            dto_field.convert_to_entity,
+            self._compile_value_converter(dto_field),
+        )
+
+    def _compile_value_converter(
+        self, dto_field
+    ) -> ty.Callable[[ty.Any, bool], ty.Any]:
+        """
+        Equivalente pré-compilado do DTOBase.convert_value_to_entity.
+        """
+
+        # Enumerados
+        if isinstance(dto_field.expected_type, enum.EnumMeta):
+            from nsj_rest_lib.dto.dto_base import DTOBase
+
+            convert_enum = DTOBase._convert_enum_to_entity
+
+            def convert_enum_value(value, none_as_empty):
+                try:
+                    return convert_enum(value, dto_field, none_as_empty)
+                except ValueError:
+                    # Aceitando enumerados inválidos (só para os filtros)
+                    return value.value if isinstance(value, enum.Enum) else str(value)
+
+            return convert_enum_value
+
+        # Bool to int
+        entity_fields_map = getattr(self.entity_class, "fields_map", {})
+        entity_field_name = dto_field.entity_field or dto_field.name
+        if (
+            entity_field_name in entity_fields_map
+            and entity_fields_map[entity_field_name].expected_type == int
+        ):
+
+            def convert_bool_value(value, none_as_empty):
+                if isinstance(value, bool):
+                    return 1 if value else 0
+                if value is None and none_as_empty:
+                    return EMPTY
+                return value
+
+            return convert_bool_value
+
+        def convert_value(value, none_as_empty):
+            # Convertendo None para EMPTY (se desejado)
+            if value is None and none_as_empty:
+                return EMPTY
+            return value
+
+        return convert_value
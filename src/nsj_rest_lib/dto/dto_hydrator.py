@@ -0,0 +1,452 @@
+import typing as ty
+
+from nsj_rest_lib.descriptor.dto_field import LAZY_ROW, DTOField
+from nsj_rest_lib.dto.dto_compact_storage import (
+    COMPACT_VALUES,
+    EMPTY_PROVIDED_FIELDS,
+    UNSET,
+    CompactDTOField,
+)
+from nsj_rest_lib.util.sql_utils import montar_chave_map_sql_join
+
+
+class DTOHydrator:
+    """
+    Plano de montagem de DTOs a partir de entities (ou dicts de colunas), pré-compilado
+    por classe de DTO (no decorator DTO), e usado no caminho de leitura
+    (isto é, quando o DTO é construído com escape_validator=True).
+
+    O resultado é equivalente ao do construtor padrão do DTOBase, mas:
+    - Não faz deepcopy dos dados da entity (apenas uma cópia rasa do dict);
+    - Resolve uma única vez os nomes das colunas (inclusive os aliases dos SQL joins);
+    - Grava diretamente no armazenamento do DTO os valores que já estão no tipo
+      esperado (sem passar pelas validações do descriptor).
+    """
+
+    def __init__(self, dto_class):
+        self.dto_class = dto_class
+        self._steps: ty.List[ty.Callable[[ty.Any, dict, bool], None]] = []
+        self._compact = bool(dto_class._compact_size)
+
+        # Materialização sob demanda dos campos (ver parâmetro lazy_fields do decorator DTO)
+        self._lazy = bool(getattr(dto_class, "lazy_fields", False))
+        self._lazy_defaults: ty.List[ty.Callable[[dict, bool], None]] = []
+        self._lazy_steps: ty.Dict[str, ty.Callable[[ty.Any, dict], None]] = {}
+        self._lazy_present: ty.Dict[str, ty.Callable[[ty.Any], bool]] = {}
+        self._lazy_converters: ty.List[ty.Tuple[int, str, str, ty.Callable]] = []
+        self._converter_fields: ty.Set[str] = set()
+        self._last_converter_position = -1
+        self._field_positions: ty.Dict[str, int] = {}
+
+        for position, (field, dto_field) in enumerate(dto_class.fields_map.items()):
+            self._field_positions[field] = position
+            if self._lazy and self._is_lazy_field(field):
+                self._compile_lazy_field(position, field, dto_field)
+            else:
+                self._steps.append(self._compile_field(field, dto_field))
+
+        # Campos montados sempre na criação do DTO (fora do fields_map)
+        self._eager_keys: ty.Set[str] = set()
+        for fields_map in (
+            dto_class.sql_join_fields_map,
+            dto_class.left_join_fields_map,
+            dto_class.object_fields_map,
+            dto_class.one_to_one_fields_map,
+            dto_class.aggregator_fields_map,
+        ):
+            self._eager_keys.update(fields_map.keys())
+
+        for field, dto_field in dto_class.sql_join_fields_map.items():
+            step = self._compile_sql_join_field(field, dto_field)
+            if step is not None:
+                self._steps.append(step)
+
+        for field in dto_class.left_join_fields_map:
+            self._steps.append(self._compile_plain_field(field))
+
+        for field, dto_field in dto_class.object_fields_map.items():
+            self._steps.append(self._compile_object_field(field, dto_field))
+
+        for field, dto_field in dto_class.one_to_one_fields_map.items():
+            self._steps.append(self._compile_one_to_one_field(field, dto_field))
+
+        for field, dto_field in dto_class.aggregator_fields_map.items():
+            self._steps.append(self._compile_aggregator_field(field, dto_field))
+
+    def hydrate(self, instance, entity, generate_default_pk_value: bool = True):
+        """
+        Preenche a instância (recém criada) do DTO, a partir da entity recebida.
+        """
+        instance.escape_validator = True
+        instance.generate_default_pk_value = generate_default_pk_value
+        instance._provided_fields = (
+            EMPTY_PROVIDED_FIELDS if self._compact else set()
+        )
+
+        values = dict(entity) if type(entity) is dict else dict(entity.__dict__)
+
+        if self._lazy:
+            for apply_default in self._lazy_defaults:
+                apply_default(values, generate_default_pk_value)
+
+            instance.__dict__[LAZY_ROW] = LazyRow(
+                self, values, len(self._lazy_converters) > 0
+            )
+
+        for step in self._steps:
+            step(instance, values, generate_default_pk_value)
+
+    def _find_descriptor(self, field: str):
+        for klass in self.dto_class.__mro__:
+            if field in klass.__dict__:
+                return klass.__dict__[field]
+        return None
+
+    def _compile_setter(self, field: str) -> ty.Callable[[ty.Any, ty.Any], None]:
+        """
+        Retorna uma função para atribuição do valor de um campo, equivalente ao
+        "setattr", mas evitando as validações do DTOField quando o valor já está
+        no tipo esperado (e o campo não possui restrições que alterem o valor).
+        """
+        descriptor = self._find_descriptor(field)
+
+        if descriptor is None or not hasattr(type(descriptor), "__set__"):
+
+            def set_plain(instance, value):
+                instance.__dict__[field] = value
+
+            return set_plain
+
+        descriptor_type = type(descriptor)
+        expected_type = getattr(descriptor, "expected_type", None)
+        is_compact = isinstance(descriptor, CompactDTOField)
+        is_plain_dto_field = (
+            isinstance(descriptor, DTOField)
+            and descriptor_type.__set__
+            is (CompactDTOField.__set__ if is_compact else DTOField.__set__)
+            and descriptor_type.validate is DTOField.validate
+            and descriptor.validator is None
+            and descriptor.min is None
+            and descriptor.max is None
+            and not descriptor.strip
+            and (expected_type is None or isinstance(expected_type, type))
+        )
+
+        if not is_plain_dto_field:
+
+            def set_by_descriptor(instance, value):
+                descriptor.__set__(instance, value)
+
+            return set_by_descriptor
+
+        if is_compact:
+            compact_index = descriptor.compact_index
+
+            def set_fast_compact(instance, value):
+                if (
+                    value is None
+                    or expected_type is None
+                    or isinstance(value, expected_type)
+                ):
+                    instance.__dict__[COMPACT_VALUES][compact_index] = value
+                else:
+                    descriptor.__set__(instance, value)
+
+            return set_fast_compact
+
+        storage_name = descriptor.storage_name
+
+        def set_fast(instance, value):
+            if (
+                value is None
+                or expected_type is None
+                or isinstance(value, expected_type)
+            ):
+                instance.__dict__[storage_name] = value
+            else:
+                descriptor.__set__(instance, value)
+
+        return set_fast
+
+    def _compile_field(self, field: str, dto_field: DTOField):
+        entity_field = dto_field.entity_field or field
+        default_value = dto_field.default_value
+        is_pk = dto_field.pk
+        convert_from_entity = dto_field.convert_from_entity
+        setter = self._compile_setter(field)
+
+        def step(instance, values, generate_default_pk_value):
+            # Tratando do valor default
+            if (
+                default_value is not None
+                and values.get(field, None) is None
+                and (not is_pk or generate_default_pk_value)
+            ):
+                values[field] = (
+                    default_value() if callable(default_value) else default_value
+                )
+
+            if convert_from_entity is not None:
+                fields_converted = convert_from_entity(values[entity_field], values)
+                if field not in fields_converted:
+                    setattr(instance, field, None)
+
+                for converted_key in fields_converted:
+                    setattr(instance, converted_key, fields_converted[converted_key])
+                return
+
+            setter(instance, values.get(entity_field))
+
+        return step
+
+    def _is_lazy_field(self, field: str) -> bool:
+        """
+        Só podem ser materializados sob demanda os campos cujo descritor é um DTOField
+        (ou CompactDTOField) com a leitura padrão, a qual aciona a materialização.
+        """
+        descriptor = self._find_descriptor(field)
+        return isinstance(descriptor, DTOField) and type(descriptor).__get__ in (
+            DTOField.__get__,
+            CompactDTOField.__get__,
+        )
+
+    def _compile_presence(self, field: str) -> ty.Callable[[ty.Any], bool]:
+        descriptor = self._find_descriptor(field)
+
+        if isinstance(descriptor, CompactDTOField):
+            compact_index = descriptor.compact_index
+
+            def is_present_compact(instance):
+                return instance.__dict__[COMPACT_VALUES][compact_index] is not UNSET
+
+            return is_present_compact
+
+        storage_name = descriptor.storage_name
+
+        def is_present(instance):
+            return storage_name in instance.__dict__
+
+        return is_present
+
+    def _compile_lazy_field(self, position: int, field: str, dto_field: DTOField):
+        # Os valores default são aplicados na criação do DTO (como no fluxo normal)
+        default_value = dto_field.default_value
+        if default_value is not None:
+            is_pk = dto_field.pk
+
+            def apply_default(values, generate_default_pk_value):
+                if values.get(field, None) is None and (
+                    not is_pk or generate_default_pk_value
+                ):
+                    values[field] = (
+                        default_value() if callable(default_value) else default_value
+                    )
+
+            self._lazy_defaults.append(apply_default)
+
+        entity_field = dto_field.entity_field or field
+
+        # Campos com conversão customizada são materializados em conjunto
+        if dto_field.convert_from_entity is not None:
+            self._lazy_converters.append(
+                (position, field, entity_field, dto_field.convert_from_entity)
+            )
+            self._converter_fields.add(field)
+            self._last_converter_position = position
+            return
+
+        setter = self._compile_setter(field)
+        present = self._compile_presence(field)
+
+        def load(instance, values):
+            if not present(instance):
+                setter(instance, values.get(entity_field))
+
+        self._lazy_steps[field] = load
+        self._lazy_present[field] = present
+
+    def _run_lazy_converters(self, instance, values: dict):
+        """
+        Executa as conversões customizadas (convert_from_entity) pendentes, na ordem
+        dos campos, preservando o resultado que a montagem completa do DTO teria.
+        """
+        written: ty.Set[str] = set()
+
+        for position, field, entity_field, convert_from_entity in self._lazy_converters:
+            fields_converted = convert_from_entity(values[entity_field], values)
+            if field not in fields_converted:
+                self._set_lazy_converted(instance, field, None, position, written)
+
+            for converted_key in fields_converted:
+                self._set_lazy_converted(
+                    instance,
+                    converted_key,
+                    fields_converted[converted_key],
+                    position,
+                    written,
+                )
+
+    def _set_lazy_converted(
+        self,
+        instance,
+        key: str,
+        value: ty.Any,
+        position: int,
+        written: ty.Set[str],
+    ):
+        if key not in written:
+            # Campos montados depois (na montagem completa) sobrescreveriam o valor
+            if key in self._eager_keys:
+                return
+
+            key_position = self._field_positions.get(key)
+            if key_position is not None and key not in self._converter_fields:
+                if key_position > position:
+                    return
+
+                # Campo já atribuído diretamente no DTO (após a sua criação)
+                present = self._lazy_present.get(key)
+                if present is not None and present(instance):
+                    return
+
+            written.add(key)
+
+        setattr(instance, key, value)
+
+    def _compile_sql_join_field(self, field: str, dto_field):
+        if dto_field.related_dto_field not in dto_field.dto_type.fields_map:
+            return None
+
+        alias = self.dto_class.sql_join_fields_map_to_query[
+            montar_chave_map_sql_join(dto_field)
+        ]
+        entity_field = (
+            alias.sql_alias
+            + "_"
+            + dto_field.dto_type.fields_map[
+                dto_field.related_dto_field
+            ].get_entity_field_name()
+        )
+        convert_from_entity = dto_field.convert_from_entity
+        setter = self._compile_setter(field)
+
+        def step(instance, values, generate_default_pk_value):
+            if convert_from_entity is not None:
+                fields_converted = convert_from_entity(values[entity_field], values)
+                if field not in fields_converted:
+                    setattr(instance, field, None)
+
+                for converted_key in fields_converted:
+                    setattr(instance, converted_key, fields_converted[converted_key])
+                return
+
+            setter(instance, values.get(entity_field))
+
+        return step
+
+    def _compile_plain_field(self, field: str):
+        setter = self._compile_setter(field)
+
+        def step(instance, values, generate_default_pk_value):
+            setter(instance, values.get(field))
+
+        return step
+
+    def _compile_object_field(self, field: str, dto_field):
+        def step(instance, values, generate_default_pk_value):
+            value = values.get(field)
+            if value is None:
+                setattr(instance, field, None)
+            elif not isinstance(value, dict):
+                raise ValueError(
+                    f"O campo {field} deveria ser um dicionário com os campos da classe {dto_field.dto_type}."
+                )
+            else:
+                setattr(instance, field, dto_field.expected_type(**value))
+
+        return step
+
+    def _compile_one_to_one_field(self, oto_key: str, oto_field):
+        field = oto_field.entity_field
+
+        def step(instance, values, generate_default_pk_value):
+            if oto_key in values:
+                oto_value = values[oto_key]
+            else:
+                oto_value = values.get(field)
+
+            # Delega toda a validacao/conversao ao descriptor.
+            setattr(instance, oto_key, oto_value)
+
+        return step
+
+    def _compile_aggregator_field(self, field: str, dto_field):
+        def step(instance, values, generate_default_pk_value):
+            value = values.get(field)
+            if value is None:
+                if dto_field.not_null is True:
+                    raise ValueError(f"O campo {field} deve estar preenchido.")
+                setattr(instance, field, None)
+            elif isinstance(value, dto_field.expected_type):
+                setattr(instance, field, value)
+            elif isinstance(value, dict):
+                setattr(instance, field, dto_field.expected_type(**value))
+            else:
+                raise ValueError(
+                    f"O campo {field} deveria ser um dicionário com"
+                    f" os campos da classe {dto_field.expected_type}."
+                )
+
+        return step
+
+
+class LazyRow:
+    """
+    Linha (entity ou dict) de origem de um DTO com lazy_fields, guardada na instância
+    até que todos os campos sejam materializados.
+    """
+
+    __slots__ = ("hydrator", "values", "converters_pending")
+
+    def __init__(self, hydrator: DTOHydrator, values: dict, converters_pending: bool):
+        self.hydrator = hydrator
+        self.values = values
+        self.converters_pending = converters_pending
+
+    def load(self, instance, field: str) -> bool:
+        """
+        Materializa o campo recebido (e, na primeira chamada, as conversões
+        customizadas). Retorna False se o campo não é materializado sob demanda.
+        """
+        hydrator = self.hydrator
+
+        # As conversões customizadas só podem alterar os campos anteriores a elas
+        if (
+            self.converters_pending
+            and hydrator._field_positions.get(field, -1)
+            <= hydrator._last_converter_position
+        ):
+            self.load_converters(instance)
+
+        step = hydrator._lazy_steps.get(field)
+        if step is not None:
+            step(instance, self.values)
+            return True
+
+        return field in hydrator._converter_fields
+
+    def load_converters(self, instance):
+        self.converters_pending = False
+        self.hydrator._run_lazy_converters(instance, self.values)
+
+    def load_all(self, instance):
+        """
+        Materializa todos os campos pendentes (liberando a linha de origem).
+        """
+        if self.converters_pending:
+            self.load_converters(instance)
+
+        for step in self.hydrator._lazy_steps.values():
+            step(instance, self.values)
+
+        instance.__dict__[LAZY_ROW] = None
@@ -0,0 +1,199 @@
+import typing as ty
+
+from nsj_rest_lib.util.fields_util import (
+    FieldsTree,
+    extract_child_tree,
+    merge_fields_tree,
+    normalize_fields_tree,
+)
+
+
+class DTODictProjector:
+    """
+    Projeção pré-compilada de uma classe de DTO para dict, considerando uma
+    árvore de fields e de expands específica (ver DTOBase.convert_to_dict).
+
+    A resolução dos fields (incluindo os campos de resumo), a verificação de quais
+    propriedades compõem o retorno e as subárvores dos relacionamentos são feitas
+    uma única vez, na compilação. As projeções dos DTOs relacionados são resolvidas
+    no primeiro uso (por campo e classe), e chamadas diretamente a partir de então.
+    A projeção de cada objeto fica restrita à leitura dos atributos selecionados.
+
+    As subárvores pré-compiladas são compartilhadas entre as projeções (e, por isso,
+    não devem ser alteradas por quem as recebe).
+    """
+
+    def __init__(
+        self,
+        dto_class,
+        fields: ty.Optional[FieldsTree],
+        expands: ty.Optional[FieldsTree],
+        just_resume: bool,
+    ):
+        # Resolving fields to use
+        if just_resume or fields is None:
+            fields_tree = dto_class.build_default_fields_tree()
+        else:
+            fields_tree = normalize_fields_tree(fields)
+            merge_fields_tree(fields_tree, dto_class.build_default_fields_tree())
+
+        if expands is None:
+            expands = {"root": set()}
+
+        root = fields_tree["root"]
+
+        # Campos simples (fields, sql join e left join), na ordem original
+        self._simple_fields: ty.Tuple[str, ...] = tuple(
+            field
+            for fields_map in (
+                dto_class.fields_map,
+                dto_class.sql_join_fields_map,
+                dto_class.left_join_fields_map,
+            )
+            for field in fields_map
+            if field in root
+        )
+
+        self._object_fields = tuple(
+            (field, extract_child_tree(fields_tree, field))
+            for field in dto_class.object_fields_map
+            if field in root
+        )
+
+        self._one_to_one_fields = tuple(
+            (
+                field,
+                oto_field.expected_type,
+                fields_tree[field] if field in fields_tree else None,
+                expands[field] if field in expands else None,
+            )
+            for field, oto_field in dto_class.one_to_one_fields_map.items()
+            if field in root and field in expands["root"]
+        )
+
+        self._aggregator_fields = tuple(
+            (
+                field,
+                extract_child_tree(fields_tree, field),
+                extract_child_tree(expands, field),
+            )
+            for field in dto_class.aggregator_fields_map
+            if field in root
+        )
+
+        self._list_fields = tuple(
+            (
+                field,
+                extract_child_tree(fields_tree, field),
+                extract_child_tree(expands, field),
+            )
+            for field in dto_class.list_fields_map
+            if field in root
+        )
+
+        self._just_resume = just_resume
+
+        self._dto_class = dto_class
+        self._fields = fields
+        self._expands = expands
+
+        # Projeções dos DTOs relacionados: (campo, classe) -> DTODictProjector
+        self._child_projectors: ty.Dict[ty.Tuple[str, type], "DTODictProjector"] = {}
+
+    def _child_projector(
+        self,
+        field: str,
+        value,
+        child_fields: ty.Optional[FieldsTree],
+        child_expands: ty.Optional[FieldsTree],
+        just_resume: bool = False,
+    ) -> "DTODictProjector":
+        key = (field, type(value))
+        projector = self._child_projectors.get(key)
+        if projector is None:
+            projector = type(value)._get_dict_projector(
+                child_fields, child_expands, just_resume
+            )
+            self._child_projectors[key] = projector
+
+        return projector
+
+    def convert(self, value) -> ty.Any:
+        """
+        Converte o objeto recebido para dict: diretamente, se for da classe de DTO da
+        projeção, ou pelo convert_to_dict (para as demais classes).
+        """
+        if type(value) is self._dto_class:
+            return self.project(value)
+
+        if hasattr(value, "convert_to_dict"):
+            return value.convert_to_dict(self._fields, self._expands, self._just_resume)
+
+        return value
+
+    def project(self, dto) -> ty.Dict[str, ty.Any]:
+        """
+        Converte o DTO recebido para dict.
+        """
+        result = {}
+
+        for field in self._simple_fields:
+            result[field] = getattr(dto, field)
+
+        for field, child_fields in self._object_fields:
+            value = getattr(dto, field)
+            result[field] = (
+                self._child_projector(field, value, child_fields, None).project(value)
+                if value is not None
+                else None
+            )
+
+        for (
+            field,
+            expected_type,
+            child_fields,
+            child_expands,
+        ) in self._one_to_one_fields:
+            value = getattr(dto, field)
+            if value is None:
+                result[field] = None
+            elif isinstance(value, expected_type):
+                result[field] = self._child_projector(
+                    field, value, child_fields, child_expands
+                ).project(value)
+
+        for field, child_fields, child_expands in self._aggregator_fields:
+            value = getattr(dto, field, None)
+            if value is None:
+                result[field] = None
+            elif hasattr(value, "_get_dict_projector"):
+                result[field] = self._child_projector(
+                    field, value, child_fields, child_expands
+                ).project(value)
+            elif hasattr(value, "convert_to_dict"):
+                result[field] = value.convert_to_dict(child_fields, child_expands)
+            else:
+                result[field] = value
+
+        # Converting list fields
+        for field, child_fields, child_expands in self._list_fields:
+            # Recuperando o valor do atributo sem disparar descriptor em DTO incompleto
+            value = dto.__dict__.get(field, None)
+            if value is None:
+                result[field] = None
+                continue
+
+            items = []
+            for item in value:
+                if hasattr(item, "_get_dict_projector"):
+                    item = self._child_projector(
+                        field, item, child_fields, child_expands, self._just_resume
+                    ).project(item)
+                elif item is not None and hasattr(item, "convert_to_dict"):
+                    item = item.convert_to_dict(
+                        child_fields, child_expands, self._just_resume
+                    )
+                items.append(item)
+            result[field] = items
+
+        return result
@@ -1,6 +1,6 @@
 import abc
 
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 from nsj_rest_lib.descriptor.entity_field import EntityField
 
@@ -9,6 +9,71 @@ class EMPTY:
     pass
 
 
+class SqlFields:
+    """
+    Conjunto ordenado dos campos a gravar de uma entidade (entity._sql_fields).
+
+    Mantém a ordem de inclusão e a interface de lista usada pelo restante da lib
+    (append, iteração, "in"), mas com teste de pertinência em tempo constante, e
+    ignorando campos repetidos.
+    """
+
+    def __init__(self, fields: Iterable[str] = ()) -> None:
+        self._fields: Dict[str, None] = dict.fromkeys(fields)
+
+    def append(self, field: str) -> None:
+        self._fields[field] = None
+
+    add = append
+
+    def extend(self, fields: Iterable[str]) -> None:
+        for field in fields:
+            self._fields[field] = None
+
+    def remove(self, field: str) -> None:
+        try:
+            del self._fields[field]
+        except KeyError:
+            raise ValueError(f"{field} não está na lista de campos.")
+
+    def discard(self, field: str) -> None:
+        self._fields.pop(field, None)
+
+    def clear(self) -> None:
+        self._fields.clear()
+
+    def copy(self) -> "SqlFields":
+        return SqlFields(self._fields)
+
+    def index(self, field: str) -> int:
+        return list(self._fields).index(field)
+
+    def __contains__(self, field: Any) -> bool:
+        try:
+            return field in self._fields
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        return list(self._fields)[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SqlFields):
+            return list(self._fields) == list(other._fields)
+        if isinstance(other, (list, tuple)):
+            return list(self._fields) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SqlFields({list(self._fields)!r})"
+
+
 class EntityBase(abc.ABC):
     fields_map: Dict[str, EntityField] = {}
     table_name: str = ""
@@ -17,7 +82,7 @@ class EntityBase(abc.ABC):
 
     def __init__(self) -> None:
         super().__init__()
-        self._sql_fields: list[str] = []
+        self._sql_fields: SqlFields = SqlFields()
         if "fields_map" in self.__class__.__dict__:
             for field in self.__class__.fields_map:
                 if field not in self.__dict__:
@@ -1,5 +1,14 @@
 from sqlalchemy.engine.base import Connection
 
+from nsj_rest_lib.settings import (
+    REST_LIB_CACHE_INVALIDATION_BUS,
+    REST_LIB_IDENTITY_MAP,
+)
+from nsj_rest_lib.util.cache_invalidation_bus import (
+    ensure_cache_invalidation_listener,
+)
+from nsj_rest_lib.util.identity_map import close_identity_map, open_identity_map
+
 db_pool = None
 
 
@@ -16,10 +25,25 @@ class NsjInjectorFactoryBase:
 
         self._db_connection = pool.connect()
 
+        # Listener de invalidação dos caches (iniciado uma vez por processo)
+        if REST_LIB_CACHE_INVALIDATION_BUS:
+            ensure_cache_invalidation_listener()
+
+        # Mapa de identidade da requisição (deduplicando as leituras dos DAOs)
+        self.identity_map = None
+        self._identity_map_token = None
+        if REST_LIB_IDENTITY_MAP:
+            self.identity_map, self._identity_map_token = open_identity_map()
+
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._db_connection.close()
+        try:
+            if self._identity_map_token is not None:
+                close_identity_map(self._identity_map_token)
+                self._identity_map_token = None
+        finally:
+            self._db_connection.close()
 
     def db_adapter(self):
         from nsj_gcf_utils.db_adapter2 import DBAdapter2
@@ -4,6 +4,7 @@ from nsj_gcf_utils.json_util import json_loads
 
 from nsj_rest_lib.dao.dao_base import DAOBase
 from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
 from nsj_rest_lib.entity.function_type_base import FunctionTypeBase
 from nsj_rest_lib.entity.filter import Filter
 from nsj_rest_lib.exception import DTOListFieldConfigException
@@ -69,6 +70,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
         function_name: str | None = None,
         custom_json_response: bool = False,
     ) -> DTOBase:
+        failed = False
         try:
             if manage_transaction:
                 self._dao.begin()
@@ -134,6 +136,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
             self._dao.delete(entity_filters)
             return None
         except:
+            failed = True
             if manage_transaction:
                 self._dao.rollback()
             raise
@@ -141,6 +144,14 @@ class ServiceBaseDelete(ServiceBasePartialOf):
             if manage_transaction:
                 self._dao.commit()
 
+            # Invalidando os caches de leitura da entidade (na partição excluída)
+            self._invalidate_entity_caches(
+                additional_filters,
+                keys=[id],
+                manage_transaction=manage_transaction,
+                publish=not failed,
+            )
+
     def _delete_list(
         self,
         ids: List[str],
@@ -154,6 +165,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
         if not ids:
             return
 
+        failed = False
         try:
             if manage_transaction:
                 self._dao.begin()
@@ -221,6 +233,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
             # Excluindo a entity principal
             self._dao.delete(entity_filters)
         except:
+            failed = True
             if manage_transaction:
                 self._dao.rollback()
             raise
@@ -228,6 +241,14 @@ class ServiceBaseDelete(ServiceBasePartialOf):
             if manage_transaction:
                 self._dao.commit()
 
+            # Invalidando os caches de leitura da entidade (na partição excluída)
+            self._invalidate_entity_caches(
+                additional_filters,
+                keys=ids,
+                manage_transaction=manage_transaction,
+                publish=not failed,
+            )
+
     def _delete_by_function(
         self,
         id: Any,
@@ -323,7 +344,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
                         f"PK field not found in class: {self._dto_class}"
                     )
 
-                if list_field.dto_type.pk_field not in related_dto.__dict__:
+                if list_field.dto_type.pk_field not in dto_values_dict(related_dto):
                     raise DTOListFieldConfigException(
                         f"PK field not found in DTO: {self._dto_class}"
                     )
@@ -376,7 +397,7 @@ class ServiceBaseDelete(ServiceBasePartialOf):
                         f"PK field not found in class: {self._dto_class}"
                     )
 
-                if list_field.dto_type.pk_field not in related_dto.__dict__:
+                if list_field.dto_type.pk_field not in dto_values_dict(related_dto):
                     raise DTOListFieldConfigException(
                         f"PK field not found in DTO: {self._dto_class}"
                     )
@@ -2,11 +2,18 @@ import typing as ty
 
 from typing import Any, Dict
 
+from nsj_rest_lib.dao.dao_base_util import JSON_ROW_COLUMN
 from nsj_rest_lib.dto.dto_base import DTOBase
 from nsj_rest_lib.entity.function_type_base import FunctionTypeBase
 from nsj_rest_lib.exception import ConflictException
+from nsj_rest_lib.util.cache_util import (
+    MISS,
+    LRUTTLCache,
+    entity_cache_tags,
+    partition_cache_key,
+)
 from nsj_rest_lib.util.fields_util import FieldsTree
-from nsj_rest_lib.util.fields_util import extract_child_tree
+from nsj_rest_lib.util.fields_util import extract_child_tree, freeze_fields_tree
 
 
 from .service_base_retrieve import ServiceBaseRetrieve
@@ -24,7 +31,16 @@ class ServiceBaseGet(ServiceBaseRetrieve):
         function_object=None,
         function_name: str | None = None,
         custom_json_response: bool = False,
+        cache: ty.Optional[LRUTTLCache] = None,
     ) -> DTOBase:
+        """
+        Recupera um DTO pelo ID.
+
+        Se for recebido um cache (ver parâmetro cache_ttl do GetRoute), o DTO é
+        recuperado do mesmo quando possível, e guardado nele após a consulta (em
+        ambos os casos, como cópia). O cache não é usado quando os fields
+        solicitados leem outras tabelas (relacionamentos e joins).
+        """
 
         if expands is None:
             expands = {"root": set()}
@@ -47,6 +63,16 @@ class ServiceBaseGet(ServiceBaseRetrieve):
         # Resolving fields
         fields = self._resolving_fields(fields)
 
+        # Recuperando do cache de GETs (se houver). O cache é invalidado apenas
+        # pelas gravações na tabela da entidade, e por isso não é usado quando são
+        # recuperados campos de outras tabelas.
+        cache_key = None
+        if cache is not None and not self._reads_related_tables(fields):
+            cache_key = self._get_cache_key(id, partition_fields, fields, expands)
+            cached_dto = cache.get(cache_key)
+            if cached_dto is not MISS:
+                return cached_dto.snapshot()
+
         if self._has_partial_support():
             base_root_fields, partial_root_fields = self._split_partial_fields(
                 fields["root"]
@@ -91,6 +117,10 @@ class ServiceBaseGet(ServiceBaseRetrieve):
             self._dto_class.data_override_group is not None
             and self._dto_class.data_override_fields is not None
         )
+        # Recuperando o registro diretamente como dict, quando possível
+        as_rows = self._retrieve_as_rows("get", expands)
+        rows_kwargs = {"as_rows": True} if as_rows else {}
+
         entity = self._dao.get(
             entity_key_field,
             entity_id_value,
@@ -101,6 +131,7 @@ class ServiceBaseGet(ServiceBaseRetrieve):
             joins_aux=joins_aux,
             partial_exists_clause=partial_exists_clause,
             override_data=override_data,
+            **rows_kwargs,
         )
 
         # NOTE: This has to happens on the entity
@@ -128,7 +159,11 @@ class ServiceBaseGet(ServiceBaseRetrieve):
                 )
                 self._dto_class = orig_dto
                 pass
-            setattr(entity, k, v.expected_type(entity, escape_validator=True))
+            agg_value = v.expected_type(entity, escape_validator=True)
+            if as_rows:
+                entity[k] = agg_value
+            else:
+                setattr(entity, k, agg_value)
             pass
 
         # Convertendo para DTO
@@ -167,8 +202,115 @@ class ServiceBaseGet(ServiceBaseRetrieve):
                 partition_fields,
             )
 
+        if cache_key is not None:
+            cache.set(
+                cache_key,
+                dto.snapshot(),
+                entity_cache_tags(
+                    self._entity_class.table_name,
+                    partition_cache_key(
+                        self._dto_class.partition_fields, partition_fields
+                    ),
+                ),
+            )
+
         return dto
 
+    def _get_cache_key(
+        self,
+        id: str,
+        partition_fields: Dict[str, Any],
+        fields: FieldsTree,
+        expands: FieldsTree,
+    ) -> ty.Tuple:
+        """
+        Monta a chave do cache de GETs: classe do DTO, filtros de partição (e demais
+        parâmetros da rota), ID, fields e expands.
+        """
+        return (
+            self._dto_class,
+            tuple(
+                sorted(
+                    (field, str(value))
+                    for field, value in (partition_fields or {}).items()
+                )
+            ),
+            str(id),
+            freeze_fields_tree(fields),
+            freeze_fields_tree(expands),
+        )
+
+    def get_json(
+        self,
+        id: str,
+        partition_fields: Dict[str, Any],
+        fields: FieldsTree,
+        expands: ty.Optional[FieldsTree] = None,
+    ) -> ty.Optional[ty.Tuple[str, ty.Optional[DTOBase]]]:
+        """
+        Variante do get na qual o json do registro é montado pelo próprio banco (sem
+        instanciar a entity, ou o dict da resposta).
+
+        Retorna uma tupla com o json (como texto) e um DTO preenchido apenas com os
+        etag_fields (ou None, se o DTO não usa ETag); ou None quando o DTO (ou os
+        fields solicitados) exige o processamento em Python, devendo ser usado o get
+        padrão.
+        """
+
+        # Services que customizam a recuperação não podem ser contornados
+        if type(self).get is not ServiceBaseGet.get:
+            return None
+
+        # Resolving fields
+        fields = self._resolving_fields(fields)
+
+        json_fields = self._resolve_json_fields("get", fields, expands)
+        if json_fields is None:
+            return None
+
+        # Apenas os campos do ETag (e a PK) são recuperados fora do json
+        etag_fields = []
+        if self._dto_class.etag_fields:
+            etag_fields = self._convert_to_entity_fields(
+                self._dto_class.etag_fields | {self._dto_class.pk_field}
+            )
+
+        # Tratando dos filtros
+        all_filters = {}
+        if self._dto_class.fixed_filters is not None:
+            all_filters.update(self._dto_class.fixed_filters)
+        if partition_fields is not None:
+            all_filters.update(partition_fields)
+
+        entity_filters = self._create_entity_filters(all_filters)
+
+        # Resolve o campo de chave sendo utilizado
+        entity_key_field, entity_id_value = self._resolve_field_key(
+            id,
+            partition_fields,
+        )
+
+        # Resolvendo os joins (usados apenas nos filtros)
+        joins_aux = self._resolve_sql_join_fields(fields["root"], entity_filters)
+
+        row = self._dao.get(
+            entity_key_field,
+            entity_id_value,
+            etag_fields,
+            entity_filters,
+            conjunto_type=self._dto_class.conjunto_type,
+            conjunto_field=self._dto_class.conjunto_field,
+            joins_aux=joins_aux,
+            json_fields=json_fields,
+        )
+
+        json_data = row.pop(JSON_ROW_COLUMN)
+        etag_dto = (
+            self._dto_class(row, escape_validator=True) if etag_fields else None
+        )
+
+        return (json_data, etag_dto)
+
     def _get_by_function(
         self,
         id: str,
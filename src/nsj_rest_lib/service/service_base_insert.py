@@ -50,6 +50,21 @@ class ServiceBaseInsert(ServiceBaseSave):
             if manage_transaction:
                 self._dao.begin()
 
+            # Reservando, em bloco, os valores de auto incremento de todo o lote
+            auto_increment_values = None
+            if len(getattr(self._dto_class, "auto_increment_fields", [])) > 0:
+                auto_increment_values = self.reserve_auto_increment_values(dtos)
+
+            # Os relacionamentos do retorno são recuperados em lote, ao final
+            defer_related_retrieve = (
+                retrieve_after_insert
+                and self._can_retrieve_from_returning(
+                    True,
+                    retrieve_fields,
+                    custom_after_insert=custom_after_insert,
+                )
+            )
+
             for dto in dtos:
                 _return_object = self._save(
                     insert=True,
@@ -63,11 +78,18 @@ class ServiceBaseInsert(ServiceBaseSave):
                     function_name=function_name,
                     custom_json_response=custom_json_response,
                     retrieve_fields=retrieve_fields,
+                    defer_related_retrieve=defer_related_retrieve,
+                    auto_increment_values=auto_increment_values,
                 )
 
                 if _return_object is not None:
                     _lst_return.append(_return_object)
 
+            if defer_related_retrieve and not custom_json_response:
+                self._retrieve_after_save_related(
+                    _lst_return, retrieve_fields, aditional_filters
+                )
+
         except:
             if manage_transaction:
                 self._dao.rollback()
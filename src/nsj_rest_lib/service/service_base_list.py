@@ -9,7 +9,18 @@ from nsj_gcf_utils.log_time import log_time_context
 from nsj_rest_lib.descriptor.dto_aggregator import DTOAggregator
 from nsj_rest_lib.dto.dto_base import DTOBase
 from nsj_rest_lib.entity.function_type_base import FunctionTypeBase
-from nsj_rest_lib.util.fields_util import FieldsTree, extract_child_tree
+from nsj_rest_lib.util.cache_util import (
+    MISS,
+    LRUTTLCache,
+    entity_cache_tags,
+    freeze_cache_value,
+    partition_cache_key,
+)
+from nsj_rest_lib.util.fields_util import (
+    FieldsTree,
+    extract_child_tree,
+    freeze_fields_tree,
+)
 from nsj_rest_lib.util.order_spec import (
     OrderFieldSpec,
     OrderFieldSource,
@@ -43,7 +54,17 @@ class ServiceBaseList(ServiceBaseRetrieve):
         function_object=None,
         function_name: str | None = None,
         custom_json_response: bool = False,
+        cache: ty.Optional[LRUTTLCache] = None,
     ) -> List[DTOBase]:
+        """
+        Lista os DTOs de acordo com os filtros, a paginação e a ordenação recebidas.
+
+        Se for recebido um cache (ver parâmetro cache_ttl do ListRoute), o resultado
+        é recuperado do mesmo quando possível, e guardado nele após a consulta (em
+        ambos os casos, como snapshots dos DTOs). Consultas que recuperam campos de
+        outras tabelas (listas, objetos, joins etc.) não usam o cache, pois o mesmo
+        só é invalidado pelas gravações na tabela da entidade.
+        """
         fn_name = function_name
         # LIST por função só deve ocorrer quando o nome da função
         # for informado explicitamente.
@@ -56,9 +77,27 @@ class ServiceBaseList(ServiceBaseRetrieve):
                 function_name=fn_name,
                 custom_json_response=custom_json_response,
             )
+
         # Resolving fields
         fields = self._resolving_fields(fields)
 
+        # Recuperando do cache de listagens (se houver)
+        cache_key = None
+        if cache is not None and not self._reads_related_tables(fields):
+            cache_key = self._list_cache_key(
+                after,
+                limit,
+                fields,
+                order_fields,
+                filters,
+                search_query,
+                return_hidden_fields,
+                expands,
+            )
+            cached_list = cache.get(cache_key)
+            if cached_list is not MISS:
+                return [dto.snapshot() for dto in cached_list]
+
         has_partial = self._has_partial_support()
         partial_config = getattr(self._dto_class, "partial_dto_config", None)
 
@@ -168,6 +207,10 @@ class ServiceBaseList(ServiceBaseRetrieve):
 
         partial_exists_clause = self._build_partial_exists_clause(joins_aux)
 
+        # Recuperando os registros diretamente como dicts, quando possível
+        as_rows = self._retrieve_as_rows("list", expands)
+        rows_kwargs = {"as_rows": True} if as_rows else {}
+
         # Retrieving from DAO
         entity_list = self._dao.list(
             after,
@@ -183,6 +226,7 @@ class ServiceBaseList(ServiceBaseRetrieve):
             search_fields=search_fields,
             joins_aux=joins_aux,
             partial_exists_clause=partial_exists_clause,
+            **rows_kwargs,
         )
 
         agg_field_map: ty.Dict[str, DTOAggregator] = {
@@ -225,7 +269,11 @@ class ServiceBaseList(ServiceBaseRetrieve):
                 # NOTE: This has to be done first so the DTOAggregator can have
                 #           the same name as a field in the entity
                 for k, v in agg_field_map.items():
-                    setattr(entity, k, v.expected_type(entity, escape_validator=True))
+                    agg_value = v.expected_type(entity, escape_validator=True)
+                    if as_rows:
+                        entity[k] = agg_value
+                    else:
+                        setattr(entity, k, agg_value)
                     pass
 
                 with log_time_context("Convertendo um único DTO"):
@@ -239,7 +287,7 @@ class ServiceBaseList(ServiceBaseRetrieve):
                     result_hf: dict[str, any] = {}
                     if return_hidden_fields:
                         for hf in return_hidden_fields:
-                            value = getattr(entity, hf)
+                            value = entity[hf] if as_rows else getattr(entity, hf)
                             result_hf[hf] = value
                     setattr(dto, "return_hidden_fields", result_hf)
                 dto_list.append(dto)
@@ -268,9 +316,142 @@ class ServiceBaseList(ServiceBaseRetrieve):
                 filters,
             )
 
+        if cache_key is not None:
+            cache.set(
+                cache_key,
+                tuple(dto.snapshot() for dto in dto_list),
+                entity_cache_tags(
+                    self._entity_class.table_name,
+                    partition_cache_key(self._dto_class.partition_fields, filters),
+                ),
+            )
+
         # Returning
         return dto_list
 
+    def _list_cache_key(
+        self,
+        after: ty.Any,
+        limit: int,
+        fields: FieldsTree,
+        order_fields: ty.Optional[List[str]],
+        filters: ty.Optional[Dict[str, Any]],
+        search_query: ty.Optional[str],
+        return_hidden_fields: ty.Optional[Set[str]],
+        expands: ty.Optional[FieldsTree],
+    ) -> ty.Tuple:
+        """
+        Monta a chave do cache de listagens: classe do DTO e forma canônica dos
+        parâmetros da consulta (paginação, fields, ordenação, filtros, busca e
+        expands).
+        """
+        return (
+            self._dto_class,
+            str(after) if after is not None else None,
+            limit,
+            freeze_fields_tree(fields),
+            tuple(order_fields) if order_fields is not None else None,
+            freeze_cache_value(filters or {}),
+            search_query,
+            freeze_cache_value(return_hidden_fields),
+            freeze_fields_tree(expands or {"root": set()}),
+        )
+
+    def list_json(
+        self,
+        after: uuid.UUID,
+        limit: int,
+        fields: FieldsTree,
+        order_fields: List[str],
+        filters: Dict[str, Any],
+        search_query: str = None,
+        expands: ty.Optional[FieldsTree] = None,
+    ) -> ty.Optional[List[ty.Tuple[Any, str]]]:
+        """
+        Variante do list na qual o json de cada registro é montado pelo próprio banco
+        (sem instanciar entities, DTOs ou dicts).
+
+        Retorna uma lista de tuplas (valor da chave primária, json do registro), ou
+        None quando o DTO (ou os fields solicitados) exige o processamento em Python,
+        devendo ser usado o list padrão.
+        """
+
+        # Services que customizam a listagem não podem ser contornados
+        if type(self).list is not ServiceBaseList.list:
+            return None
+
+        # Resolving fields
+        fields = self._resolving_fields(fields)
+
+        json_fields = self._resolve_json_fields("list", fields, expands)
+        if json_fields is None:
+            return None
+
+        entity_fields = self._convert_to_entity_fields(fields["root"])
+
+        # Handling order fields
+        order_field_specs: List[OrderFieldSpec] | None = None
+        if order_fields is not None:
+            order_field_specs = []
+            for field in order_fields:
+                aux = re.sub(
+                    r"\basc\b|\bdesc\b", "", field, flags=re.IGNORECASE
+                ).strip()
+                is_desc = bool(re.search(r"\bdesc\b", field, flags=re.IGNORECASE))
+
+                order_field_specs.append(
+                    OrderFieldSpec(
+                        column=self._convert_to_entity_field(aux),
+                        is_desc=is_desc,
+                        source=OrderFieldSource.BASE,
+                        alias=None,
+                    )
+                )
+
+        # Tratando dos filtros
+        all_filters = {}
+        if self._dto_class.fixed_filters is not None:
+            all_filters.update(self._dto_class.fixed_filters)
+        if filters is not None:
+            all_filters.update(filters)
+
+        entity_filters = self._create_entity_filters(all_filters)
+
+        # Tratando dos campos a serem enviados ao DAO para uso do search (se necessário)
+        search_fields = None
+        if self._dto_class.search_fields is not None:
+            search_fields = self._convert_to_entity_fields(
+                self._dto_class.search_fields
+            )
+
+        # Resolve o campo de chave sendo utilizado
+        entity_key_field, entity_id_value = (None, None)
+        if after is not None:
+            entity_key_field, entity_id_value = self._resolve_field_key(
+                after,
+                filters,
+            )
+
+        # Resolvendo os joins (usados apenas nos filtros)
+        joins_aux = self._resolve_sql_join_fields(fields["root"], entity_filters)
+
+        # Retrieving from DAO
+        return self._dao.list(
+            after,
+            limit,
+            entity_fields,
+            order_field_specs,
+            entity_filters,
+            conjunto_type=self._dto_class.conjunto_type,
+            conjunto_field=self._dto_class.conjunto_field,
+            entity_key_field=entity_key_field,
+            entity_id_value=entity_id_value,
+            search_query=search_query,
+            search_fields=search_fields,
+            joins_aux=joins_aux,
+            json_fields=json_fields,
+        )
+
     def _list_by_function(
         self,
         fields: FieldsTree,
@@ -1,9 +1,14 @@
+import enum
 import typing as ty
+import uuid
 import warnings
 
 from typing import Any, Dict, List, Set
 
 from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.dao.dao_base_get import DAOBaseGet
+from nsj_rest_lib.dao.dao_base_list import DAOBaseList
+from nsj_rest_lib.descriptor.dto_field import DTOField
 from nsj_rest_lib.descriptor.dto_one_to_one_field import DTOOneToOneField
 from nsj_rest_lib.descriptor.dto_left_join_field import (
     DTOLeftJoinField,
@@ -12,6 +17,7 @@ from nsj_rest_lib.descriptor.dto_left_join_field import (
 )
 from nsj_rest_lib.descriptor.dto_object_field import DTOObjectField
 from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import CompactDTOField
 from nsj_rest_lib.entity.entity_base import EntityBase
 from nsj_rest_lib.entity.filter import Filter
 from nsj_rest_lib.exception import (
@@ -19,10 +25,12 @@ from nsj_rest_lib.exception import (
     NotFoundException,
 )
 from nsj_rest_lib.settings import get_logger
+from nsj_rest_lib.util.cache_util import MISS, entity_cache_tags, freeze_cache_value
 from nsj_rest_lib.util.fields_util import (
     FieldsTree,
     clone_fields_tree,
     extract_child_tree,
+    freeze_fields_tree,
     merge_fields_tree,
     normalize_fields_tree,
 )
@@ -31,6 +39,21 @@ from nsj_rest_lib.util.join_aux import JoinAux
 from .service_base_partial_of import ServiceBasePartialOf
 
 
+# Tipos cuja serialização pelo PostgreSQL (json_build_object) é idêntica à do fluxo
+# padrão. Ficam de fora, por exemplo: Decimal (string no fluxo padrão), datas e horas
+# (sem microssegundos e fuso no fluxo padrão), intervalos (duração ISO no fluxo
+# padrão) e float (NaN e Infinity).
+JSON_NATIVE_TYPES = (str, int, bool, uuid.UUID)
+
+
+def _entity_field_types(entity_class) -> Dict[str, ty.Any]:
+    types: Dict[str, ty.Any] = {}
+    for klass in reversed(entity_class.__mro__):
+        types.update(getattr(klass, "__annotations__", {}))
+
+    return types
+
+
 class ServiceBaseRetrieve(ServiceBasePartialOf):
     def _resolving_fields(self, fields: FieldsTree) -> FieldsTree:
         """
@@ -67,6 +90,128 @@ class ServiceBaseRetrieve(ServiceBasePartialOf):
 
         return result
 
+    def _reads_related_tables(self, fields: FieldsTree, dto_class=None) -> bool:
+        """
+        Indica se a recuperação (com os fields recebidos, já resolvidos) lê campos de
+        outras tabelas (relacionamentos, joins e extensões parciais), cujas gravações
+        não invalidam os caches da entidade.
+        """
+        if dto_class is None:
+            dto_class = self._dto_class
+
+        root_fields = fields.get("root", set())
+        for relation_map in (
+            dto_class.list_fields_map,
+            dto_class.object_fields_map,
+            dto_class.one_to_one_fields_map,
+            dto_class.left_join_fields_map,
+            dto_class.sql_join_fields_map,
+        ):
+            if any(field in root_fields for field in relation_map):
+                return True
+
+        for field, descriptor in dto_class.aggregator_fields_map.items():
+            if (
+                field in root_fields
+                and len(descriptor.expected_type.one_to_one_fields_map) > 0
+            ):
+                return True
+
+        # Os DTOs partial_of sempre leem a tabela de extensão (join ou filtro de
+        # existência)
+        return getattr(dto_class, "partial_dto_config", None) is not None
+
+    def _retrieve_as_rows(self, operation: str, expands: FieldsTree) -> bool:
+        """
+        Indica se os registros podem ser recuperados do DAO diretamente como dicts
+        (sem instanciar as entities), para montagem direta dos DTOs.
+
+        Não é possível quando o DAO customiza o método de recuperação, ou quando
+        há relacionamentos 1x1 a serem resolvidos (pois estes são tratados sobre
+        as entities).
+        """
+
+        base_method = DAOBaseGet.get if operation == "get" else DAOBaseList.list
+        if getattr(type(self._dao), operation, None) is not base_method:
+            return False
+
+        if len(self._dto_class.one_to_one_fields_map) > 0:
+            return False
+
+        return not any(
+            field in expands for field in self._dto_class.aggregator_fields_map
+        )
+
+    def _resolve_json_fields(
+        self, operation: str, fields: FieldsTree, expands: FieldsTree
+    ) -> ty.Optional[List[ty.Tuple[str, str]]]:
+        """
+        Resolve os campos a serem retornados quando o json dos registros é montado
+        pelo próprio banco (lista de tuplas: (campo no DTO, campo na entity)).
+
+        Retorna None quando o DTO, ou os fields solicitados, exigem o processamento
+        em Python: DAO customizado, partial_of, data_override, expands, campos que não
+        são DTOFields simples, DTOFields com conversões na leitura (conversão
+        customizada, validator, strip, enum ou valor default), ou cujo tipo não é
+        serializado pelo PostgreSQL da mesma forma que no fluxo padrão (ver
+        JSON_NATIVE_TYPES; o tipo do DTOField também deve ser igual ao declarado na
+        entity).
+        """
+
+        base_method = DAOBaseGet.get if operation == "get" else DAOBaseList.list
+        if getattr(type(self._dao), operation, None) is not base_method:
+            return None
+
+        if self._has_partial_support():
+            return None
+
+        if (
+            self._dto_class.data_override_group is not None
+            and self._dto_class.data_override_fields is not None
+        ):
+            return None
+
+        if expands is not None and (
+            len(expands.get("root", set())) > 0
+            or any(key != "root" for key in expands)
+        ):
+            return None
+
+        fields_map = self._dto_class.fields_map
+        if any(field not in fields_map for field in fields["root"]):
+            return None
+
+        entity_fields = set(self._entity_class().__dict__)
+        entity_types = _entity_field_types(self._entity_class)
+        json_fields: List[ty.Tuple[str, str]] = []
+        for field, dto_field in fields_map.items():
+            if field not in fields["root"]:
+                continue
+
+            if (
+                type(dto_field) not in (DTOField, CompactDTOField)
+                or dto_field.convert_from_entity is not None
+                or dto_field.validator is not None
+                or dto_field.strip
+                or (dto_field.default_value is not None and not dto_field.pk)
+                or isinstance(dto_field.expected_type, enum.EnumMeta)
+            ):
+                return None
+
+            entity_field = self._convert_to_entity_field(field)
+            if entity_field not in entity_fields:
+                return None
+
+            if (
+                dto_field.expected_type not in JSON_NATIVE_TYPES
+                or entity_types.get(entity_field) is not dto_field.expected_type
+            ):
+                return None
+
+            json_fields.append((field, entity_field))
+
+        return json_fields
+
     def _add_overide_data_filters(self, all_filters):
         if (
             self._dto_class.data_override_group is not None
@@ -621,32 +766,19 @@ class ServiceBaseRetrieve(ServiceBasePartialOf):
                 if not keys_to_fetch:
                     continue
 
-                # Montando filtro para buscar todos os objetos relacionados de uma vez
-                related_filters = {
-                    object_field.relation_field: ",".join(str(k) for k in keys_to_fetch)
-                }
-
-                # Recuperando todos os DTOs relacionados de uma vez
-                related_dto_list = service.list(
-                    None,
-                    None,
+                # Recuperando todos os DTOs relacionados de uma vez (mapa de chave -> DTO)
+                related_map = self._retrieve_related_map(
+                    object_field,
+                    service,
+                    object_field.relation_field,
+                    keys_to_fetch,
+                    lambda related_dto: related_dto.return_hidden_fields.get(
+                        object_field.relation_field, None
+                    ),
                     extract_child_tree(fields, key),
-                    None,
-                    related_filters,
                     return_hidden_fields=set([object_field.relation_field]),
                 )
 
-                # Criando mapa de chave -> DTO relacionado
-                related_map = {}
-                for related_dto in related_dto_list:
-                    relation_key = str(
-                        related_dto.return_hidden_fields.get(
-                            object_field.relation_field, None
-                        )
-                    )
-                    if relation_key is not None:
-                        related_map[relation_key] = related_dto
-
                 # Atribuindo os objetos relacionados nos DTOs originais
                 for dto in dto_list:
                     pk_value = str(getattr(dto, self._dto_class.pk_field))
@@ -682,36 +814,153 @@ class ServiceBaseRetrieve(ServiceBasePartialOf):
                 if not keys_to_fetch:
                     continue
 
-                # Montando filtro para buscar todos os objetos relacionados de uma vez
-                related_filters = {
-                    object_field.expected_type.pk_field: ",".join(
-                        str(k) for k in keys_to_fetch
-                    )
-                }
-
-                # Recuperando todos os DTOs relacionados de uma vez
-                related_dto_list = service.list(
-                    None,
-                    None,
+                # Recuperando todos os DTOs relacionados de uma vez (mapa de chave -> DTO)
+                related_map = self._retrieve_related_map(
+                    object_field,
+                    service,
+                    object_field.expected_type.pk_field,
+                    keys_to_fetch,
+                    lambda related_dto: getattr(
+                        related_dto, related_dto.__class__.pk_field
+                    ),
                     extract_child_tree(fields, key),
-                    None,
-                    related_filters,
                 )
 
-                # Criando mapa de chave -> DTO relacionado
-                related_map = {}
-                for related_dto in related_dto_list:
-                    pk_field = getattr(related_dto.__class__, "pk_field")
-                    pk_value = str(getattr(related_dto, pk_field))
-                    if pk_value is not None:
-                        related_map[pk_value] = related_dto
-
                 # Atribuindo os objetos relacionados nos DTOs originais
                 for dto in dto_list:
                     relation_value = str(getattr(dto, dto_field_name))
                     related_dto = related_map.get(relation_value)
                     setattr(dto, key, related_dto)
 
+    def _retrieve_related_map(
+        self,
+        relation_descriptor: ty.Union[DTOObjectField, DTOOneToOneField],
+        service: ty.Any,
+        relation_field: str,
+        keys_to_fetch: ty.Set[ty.Any],
+        key_of: ty.Callable[[DTOBase], ty.Any],
+        fields: FieldsTree,
+        expands: ty.Optional[FieldsTree] = None,
+        return_hidden_fields: ty.Optional[ty.Set[str]] = None,
+    ) -> ty.Dict[str, DTOBase]:
+        """
+        Recupera os DTOs relacionados às chaves recebidas (filtrando pelo
+        relation_field), retornando um mapa da chave (como string) para o DTO.
+
+        Se o descritor do relacionamento define um cache (parâmetro cache_ttl), os
+        DTOs são recuperados do mesmo, e apenas as chaves ausentes são consultadas.
+        Com o cache_preload, a tabela relacionada é carregada inteira no primeiro
+        uso (se o DTO relacionado não for particionado, e a tabela couber no cache).
+
+        O cache é invalidado apenas pelas gravações na tabela relacionada, e por isso
+        não é usado quando os fields do DTO relacionado leem outras tabelas.
+        """
+
+        def _fetch(
+            filters: ty.Dict[str, ty.Any], limit: ty.Optional[int] = None
+        ) -> ty.List[DTOBase]:
+            return service.list(
+                None,
+                limit,
+                fields,
+                None,
+                filters,
+                return_hidden_fields=return_hidden_fields,
+                expands=expands,
+            )
+
+        def _map(related_dto_list: ty.List[DTOBase]) -> ty.Dict[str, DTOBase]:
+            related_map = {}
+            for related_dto in related_dto_list:
+                related_map[str(key_of(related_dto))] = related_dto
+            return related_map
+
+        def _filter(keys: ty.Iterable[ty.Any]) -> ty.Dict[str, str]:
+            return {relation_field: ",".join(str(k) for k in keys)}
+
+        related_dto_class = relation_descriptor.expected_type
+        cache = relation_descriptor.reference_cache
+        if cache is not None:
+            related_fields = normalize_fields_tree(fields)
+            merge_fields_tree(
+                related_fields, related_dto_class.build_default_fields_tree()
+            )
+            if self._reads_related_tables(related_fields, related_dto_class):
+                cache = None
+
+        if cache is None:
+            return _map(_fetch(_filter(keys_to_fetch)))
+
+        # Os itens do cache dependem do formato da consulta (fields, expands, etc.)
+        shape = (
+            relation_field,
+            freeze_fields_tree(fields),
+            freeze_fields_tree(expands),
+            freeze_cache_value(return_hidden_fields),
+        )
+        tags = entity_cache_tags(relation_descriptor.entity_type.table_name, None)
+
+        # Os DTOs do cache são compartilhados entre requisições (e threads); assim,
+        # são guardados e devolvidos como snapshots
+        related_map: ty.Dict[str, DTOBase] = {}
+        missing_keys = []
+        for key in keys_to_fetch:
+            related_dto = cache.get((shape, str(key)))
+            if related_dto is MISS:
+                missing_keys.append(key)
+            else:
+                related_map[str(key)] = related_dto.snapshot()
+
+        if not missing_keys:
+            return related_map
+
+        # Marcador da carga da tabela: True (tabela carregada inteira) ou False (a
+        # tabela não cabe no cache, sendo consultadas apenas as chaves ausentes)
+        preload_marker = cache.get((shape, None))
+        preload = (
+            relation_descriptor.cache_preload
+            and not related_dto_class.partition_fields
+            and preload_marker is MISS
+        )
+        if preload:
+            # Carregando a tabela inteira (limitada ao tamanho do cache)
+            preload_list = _fetch({}, cache.maxsize)
+            preload_complete = len(preload_list) < cache.maxsize
+            fetched_map = _map(preload_list)
+
+            if not preload_complete:
+                remaining_keys = [
+                    key for key in missing_keys if str(key) not in fetched_map
+                ]
+                if remaining_keys:
+                    fetched_map.update(_map(_fetch(_filter(remaining_keys))))
+        else:
+            fetched_map = _map(_fetch(_filter(missing_keys)))
+
+        for key, related_dto in fetched_map.items():
+            cache.set((shape, key), related_dto.snapshot(), tags)
+
+        # O marcador é gravado após os registros (para não ser o primeiro descartado
+        # pelo LRU). Se a tabela não couber no cache, é regravado a cada consulta,
+        # evitando novas cargas da tabela.
+        if preload:
+            cache.set((shape, None), preload_complete, tags)
+            if not preload_complete:
+                get_logger().warning(
+                    f"[RestLib] A tabela {relation_descriptor.entity_type.table_name} "
+                    f"tem mais registros que o cache de referência ({cache.maxsize}); "
+                    "consultando apenas as chaves ausentes."
+                )
+        elif preload_marker is False:
+            cache.set((shape, None), False, tags)
+
+        for key in missing_keys:
+            related_dto = fetched_map.get(str(key))
+            if related_dto is not None:
+                related_map[str(key)] = related_dto
+
+        return related_map
+
     def _retrieve_one_to_one_fields(
         self,
         dto_list: ty.List[ty.Union[DTOBase, EntityBase]],
@@ -755,10 +1004,6 @@ class ServiceBaseRetrieve(ServiceBasePartialOf):
 
             relation_field: str = oto_field.relation_field
 
-            related_filters: ty.Dict[str, str] = {
-                relation_field: ",".join(str(k) for k in keys_to_fetch)
-            }
-
             local_expands: ty.Optional[FieldsTree] = None
             if key in expands:
                 local_expands = extract_child_tree(expands, key)
@@ -769,21 +1014,16 @@ class ServiceBaseRetrieve(ServiceBasePartialOf):
                 local_fields = extract_child_tree(fields, key)
                 pass
 
-            related_dto_list: ty.List[DTOBase] = service.list(
-                after=None,
-                limit=None,
-                fields=local_fields,
-                order_fields=None,
-                filters=related_filters,
-                search_query=None,
-                return_hidden_fields=set([relation_field]),
+            related_map: ty.Dict[str, DTOBase] = self._retrieve_related_map(
+                oto_field,
+                service,
+                relation_field,
+                keys_to_fetch,
+                lambda x: x.return_hidden_fields.get(relation_field),
+                local_fields,
                 expands=local_expands,
+                return_hidden_fields=set([relation_field]),
             )
-
-            related_map: ty.Dict[str, DTOBase] = {
-                str(x.return_hidden_fields.get(relation_field)): x
-                for x in related_dto_list
-            }
             # NOTE: I'm assuming relation_field of x will never be NULL, because
             #           to be NULL would mean to not have an identifier.
 
@@ -1,12 +1,14 @@
-import copy
-from typing import Any, Callable, Dict, List, Set
+from typing import Any, Callable, Dict, List, Set, Tuple
 
 from flask import g
 
+from nsj_gcf_utils.json_util import convert_to_dumps
+
 from nsj_rest_lib.dao.dao_base import DAOBase
 from nsj_rest_lib.dto.after_insert_update_data import AfterInsertUpdateData
 from nsj_rest_lib.dto.dto_base import DTOBase
-from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
+from nsj_rest_lib.entity.entity_base import EMPTY, EntityBase, SqlFields
 from nsj_rest_lib.entity.filter import Filter
 from nsj_rest_lib.descriptor.filter_operator import FilterOperator
 from nsj_rest_lib.exception import (
@@ -14,6 +16,7 @@ from nsj_rest_lib.exception import (
     DTOListFieldConfigException,
     NotFoundException,
 )
+from nsj_rest_lib.settings import USE_SQL_RETURNING_CLAUSE
 from nsj_rest_lib.service.service_base_partial_of import (
     ServiceBasePartialOf,
     PartialExtensionWriteData,
@@ -40,17 +43,39 @@ class ServiceBaseSave(ServiceBasePartialOf):
         function_name: str | None = None,
         custom_json_response: bool = False,
         retrieve_fields: FieldsTree | None = None,
+        auto_increment_values: Dict[Tuple[str, Tuple[str, ...]], List[int]] = None,
+        defer_related_retrieve: bool = False,
     ) -> DTOBase:
+        failed = False
         try:
             received_dto = dto
             custom_response = None
 
-            self.fill_auto_increment_fields(insert, dto)
+            # Verificando se o retorno pode ser montado a partir da cláusula returning
+            # (evitando um GET completo após a gravação)
+            retrieve_from_returning = (
+                retrieve_after_insert
+                and not custom_json_response
+                and self._can_retrieve_from_returning(
+                    insert,
+                    retrieve_fields,
+                    custom_after_insert,
+                    custom_after_update,
+                )
+            )
+            returning_kwargs = {}
+            if retrieve_from_returning:
+                returning_kwargs["extra_returning_fields"] = (
+                    self._get_retrieve_returning_fields()
+                )
+
+            self.fill_auto_increment_fields(insert, dto, auto_increment_values)
 
             if manage_transaction:
                 self._dao.begin()
 
             old_dto = None
+            skip_update = False
             should_audit_outbox = self.audit_service.should_record_audit_outbox()
             if not insert and not upsert:
                 old_dto = self._retrieve_old_dto(dto, id, aditional_filters)
@@ -60,12 +85,12 @@ class ServiceBaseSave(ServiceBasePartialOf):
                 old_dto = dto
 
             if custom_before_insert:
-                received_dto = copy.deepcopy(dto)
+                received_dto = dto.snapshot()
                 dto = custom_before_insert(self._dao._db, dto)
 
             if custom_before_update:
-                if received_dto == dto:
-                    received_dto = copy.deepcopy(dto)
+                if received_dto is dto:
+                    received_dto = dto.snapshot()
                 dto = custom_before_update(self._dao._db, old_dto, dto)
 
             partial_write_data: PartialExtensionWriteData | None = None
@@ -96,30 +121,7 @@ class ServiceBaseSave(ServiceBasePartialOf):
                         if entity_field not in entity._sql_fields:
                             entity._sql_fields.append(entity_field)
 
-            if (insert and hasattr(entity, self._created_by_property)) or (
-                hasattr(entity, self._updated_by_property)
-            ):
-                if g and hasattr(g, "profile") and g.profile is not None:
-                    auth_type_is_api_key = g.profile["authentication_type"] == "api_key"
-                    user = g.profile["email"]
-                    if insert and hasattr(entity, self._created_by_property):
-                        if not auth_type_is_api_key:
-                            setattr(entity, self._created_by_property, user)
-                        else:
-                            value = getattr(entity, self._created_by_property)
-                            if value is None or value == "":
-                                raise ValueError(
-                                    f"É necessário preencher o campo '{self._created_by_property}'."
-                                )
-                    if hasattr(entity, self._updated_by_property):
-                        if not auth_type_is_api_key:
-                            setattr(entity, self._updated_by_property, user)
-                        else:
-                            value = getattr(entity, self._updated_by_property)
-                            if value is None or value == "":
-                                raise ValueError(
-                                    f"É necessário preencher o campo '{self._updated_by_property}'"
-                                )
+            self._fill_user_fields(entity, insert)
 
             if aditional_filters is not None:
                 aditional_entity_filters = self._create_entity_filters(
@@ -156,7 +158,11 @@ class ServiceBaseSave(ServiceBasePartialOf):
                 # DAO.INSERT (ou DAO.INSERT_BY_FUNCTION)
                 ################################################
                 if self._insert_function_type_class is None:
-                    entity = self._dao.insert(entity, dto.sql_read_only_fields)
+                    entity = self._dao.insert(
+                        entity,
+                        dto.sql_read_only_fields,
+                        **returning_kwargs,
+                    )
                 else:
                     insert_function_object = self._build_insert_function_type_object(
                         dto
@@ -186,6 +192,18 @@ class ServiceBaseSave(ServiceBasePartialOf):
                         "update_by_function não suporta operações com upsert."
                     )
 
+                # Descartando os campos não alterados (se configurado no DTO)
+                if (
+                    self._dto_class.skip_unchanged_update
+                    and not upsert
+                    and old_dto is not None
+                    and self._update_function_type_class is None
+                    and partial_write_data is None
+                ):
+                    skip_update = not self._keep_only_changed_fields(
+                        entity, old_dto, partial_update
+                    )
+
                 audit_old_dto = old_dto
                 if should_audit_outbox and old_dto is None:
                     audit_id = id or getattr(dto, dto.pk_field, None)
@@ -198,15 +216,18 @@ class ServiceBaseSave(ServiceBasePartialOf):
                             audit_old_dto = None
 
                 resource_id = id or getattr(old_dto, dto.pk_field, None)
-                self.audit_service.record_audit_outbox(
-                    action="update",
-                    dto=dto,
-                    resource_id=resource_id,
-                    old_dto=audit_old_dto,
-                    route_resource_id=id,
-                )
+                if not skip_update:
+                    self.audit_service.record_audit_outbox(
+                        action="update",
+                        dto=dto,
+                        resource_id=resource_id,
+                        old_dto=audit_old_dto,
+                        route_resource_id=id,
+                    )
 
-                if self._update_function_type_class is None:
+                if skip_update:
+                    pass
+                elif self._update_function_type_class is None:
                     entity = self._dao.update(
                         entity.get_pk_field(),
                         getattr(old_dto, dto.pk_field),
@@ -216,6 +237,7 @@ class ServiceBaseSave(ServiceBasePartialOf):
                         dto.sql_read_only_fields,
                         dto.sql_no_update_fields,
                         upsert,
+                        **returning_kwargs,
                     )
                 else:
                     update_function_object = self._build_update_function_type_object(
@@ -278,7 +300,13 @@ class ServiceBaseSave(ServiceBasePartialOf):
                         self._dao._db, old_dto, new_dto, after_data
                     )
 
-            if retrieve_after_insert and not custom_json_response:
+            if retrieve_from_returning and not skip_update:
+                response_dto = self._dto_class(entity, escape_validator=True)
+                if not defer_related_retrieve:
+                    self._retrieve_after_save_related(
+                        [response_dto], retrieve_fields, aditional_filters
+                    )
+            elif retrieve_after_insert and not custom_json_response:
                 response_dto = self.get(id, aditional_filters, retrieve_fields)
 
             if custom_data is not None:
@@ -299,6 +327,7 @@ class ServiceBaseSave(ServiceBasePartialOf):
 
             return response_dto
         except:
+            failed = True
             if manage_transaction:
                 self._dao.rollback()
             raise
@@ -306,35 +335,151 @@ class ServiceBaseSave(ServiceBasePartialOf):
             if manage_transaction:
                 self._dao.commit()
 
-    def fill_auto_increment_fields(self, insert, dto):
+            # Invalidando os caches de leitura da entidade (na partição gravada)
+            self._invalidate_entity_caches(
+                aditional_filters,
+                dto_values_dict(dto) if isinstance(dto, DTOBase) else None,
+                keys=[id] if id is not None else None,
+                manage_transaction=manage_transaction,
+                publish=not failed,
+            )
+
+    def _fill_user_fields(self, entity: EntityBase, insert: bool):
+        """
+        Preenche os campos de usuário de criação/atualização da entity, de acordo
+        com o perfil autenticado na requisição.
+        """
+        if (insert and hasattr(entity, self._created_by_property)) or (
+            hasattr(entity, self._updated_by_property)
+        ):
+            if g and hasattr(g, "profile") and g.profile is not None:
+                auth_type_is_api_key = g.profile["authentication_type"] == "api_key"
+                user = g.profile["email"]
+                if insert and hasattr(entity, self._created_by_property):
+                    if not auth_type_is_api_key:
+                        setattr(entity, self._created_by_property, user)
+                    else:
+                        value = getattr(entity, self._created_by_property)
+                        if value is None or value == "":
+                            raise ValueError(
+                                f"É necessário preencher o campo '{self._created_by_property}'."
+                            )
+                if hasattr(entity, self._updated_by_property):
+                    if not auth_type_is_api_key:
+                        setattr(entity, self._updated_by_property, user)
+                    else:
+                        value = getattr(entity, self._updated_by_property)
+                        if value is None or value == "":
+                            raise ValueError(
+                                f"É necessário preencher o campo '{self._updated_by_property}'"
+                            )
+
+    def _can_retrieve_from_returning(
+        self,
+        insert: bool,
+        retrieve_fields: FieldsTree | None,
+        custom_after_insert: Callable = None,
+        custom_after_update: Callable = None,
+    ) -> bool:
+        """
+        Indica se o DTO de retorno de uma gravação (retrieve_after_insert/update) pode
+        ser montado a partir da cláusula returning, em vez de um GET completo.
+
+        Só é possível quando os campos solicitados são colunas da própria tabela, ou
+        relacionamentos recuperáveis em lote a partir do DTO (listas, objetos e left
+        joins), e quando não há hooks "after" (que poderiam alterar o registro).
+        """
+        if not USE_SQL_RETURNING_CLAUSE:
+            return False
+
+        if custom_after_insert is not None or custom_after_update is not None:
+            return False
+
+        if insert and self._insert_function_type_class is not None:
+            return False
+
+        if not insert and self._update_function_type_class is not None:
+            return False
+
+        if self._has_partial_support():
+            return False
+
+        if (
+            self._dto_class.conjunto_type is not None
+            or self._dto_class.fixed_filters
+            or self._dto_class.data_override_group is not None
+        ):
+            return False
+
+        fields = self._resolving_fields(retrieve_fields)
+        for fields_map in (
+            self._dto_class.sql_join_fields_map,
+            self._dto_class.one_to_one_fields_map,
+            self._dto_class.aggregator_fields_map,
+        ):
+            for field in fields_map:
+                if field in fields["root"]:
+                    return False
+
+        return True
+
+    def _get_retrieve_returning_fields(self) -> List[str]:
+        return self._convert_to_entity_fields(set(self._dto_class.fields_map))
+
+    def _retrieve_after_save_related(
+        self,
+        dto_list: List[DTOBase],
+        retrieve_fields: FieldsTree | None,
+        partition_fields: Dict[str, Any],
+    ):
+        """
+        Complementa os DTOs montados a partir da cláusula returning com os
+        relacionamentos solicitados (em lote, para toda a lista recebida).
+        """
+        if not dto_list:
+            return
+
+        fields = self._resolving_fields(retrieve_fields)
+
+        if len(self._dto_class.list_fields_map) > 0:
+            self._retrieve_related_lists(dto_list, fields, {"root": set()})
+
+        if len(self._dto_class.left_join_fields_map) > 0:
+            self._retrieve_left_join_fields(dto_list, fields, partition_fields)
+
+        if len(self._dto_class.object_fields_map) > 0:
+            self._retrieve_object_fields(dto_list, fields, partition_fields)
+
+    def fill_auto_increment_fields(
+        self,
+        insert,
+        dto,
+        reserved_values: Dict[Tuple[str, Tuple[str, ...]], List[int]] = None,
+    ):
         if insert:
             auto_increment_fields = getattr(self._dto_class, "auto_increment_fields")
 
             for field_key in auto_increment_fields:
                 field = self._dto_class.fields_map[field_key]
 
-                if dto.__dict__.get(field.name, None):
+                if dto_values_dict(dto).get(field.name, None):
                     continue
 
                 if field.auto_increment.db_managed:
                     continue
 
-                group_fields = set(field.auto_increment.group)
-                for partition_field in dto.partition_fields:
-                    if partition_field not in group_fields:
-                        group_fields.add(partition_field)
-                group_fields = list(group_fields)
-                group_fields.sort()
-
-                group_values = []
-                for group_field in group_fields:
-                    group_values.append(str(getattr(dto, group_field, "----")))
-
-                next_value = self._dao.next_val(
-                    sequence_base_name=field.auto_increment.sequence_name,
-                    group_fields=group_values,
-                    start_value=field.auto_increment.start_value,
-                )
+                group_values = self._resolve_auto_increment_group_values(field, dto)
+
+                # Usando os valores previamente reservados em bloco (se houver)
+                reserved_key = (field.auto_increment.sequence_name, tuple(group_values))
+                if reserved_values is not None and reserved_values.get(reserved_key):
+                    next_value = reserved_values[reserved_key].pop(0)
+                else:
+                    next_value = self._dao.next_val(
+                        sequence_base_name=field.auto_increment.sequence_name,
+                        group_fields=group_values,
+                        start_value=field.auto_increment.start_value,
+                    )
 
                 obj_values = {}
                 for f in dto.fields_map:
@@ -349,11 +494,69 @@ class ServiceBaseSave(ServiceBasePartialOf):
                 else:
                     setattr(dto, field.name, value)
 
+    def reserve_auto_increment_values(
+        self,
+        dtos: List[DTOBase],
+    ) -> Dict[Tuple[str, Tuple[str, ...]], List[int]]:
+        """
+        Reserva, de uma só vez, os valores de auto incremento (gerenciados pelo
+        código) necessários para inserir a lista de DTOs recebida.
+
+        É feita uma única reserva (em bloco) por sequência (nome + valores do
+        agrupamento), de modo que inserções em lote não disputem a linha da
+        tabela de controle a cada registro.
+
+        Retorna um dict indexado por (nome da sequência, valores do agrupamento),
+        contendo os valores reservados (a serem consumidos pelo método
+        fill_auto_increment_fields).
+        """
+        quantities: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        start_values: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+
+        for field_key in getattr(self._dto_class, "auto_increment_fields"):
+            field = self._dto_class.fields_map[field_key]
+
+            if field.auto_increment.db_managed:
+                continue
+
+            for dto in dtos:
+                if dto_values_dict(dto).get(field.name, None):
+                    continue
+
+                group_values = self._resolve_auto_increment_group_values(field, dto)
+                key = (field.auto_increment.sequence_name, tuple(group_values))
+                quantities[key] = quantities.get(key, 0) + 1
+                start_values[key] = field.auto_increment.start_value
+
+        reserved_values = {}
+        for key, quantity in quantities.items():
+            sequence_name, group_values = key
+            reserved_values[key] = self._dao.reserve_vals(
+                sequence_base_name=sequence_name,
+                group_fields=list(group_values),
+                quantity=quantity,
+                start_value=start_values[key],
+            )
+
+        return reserved_values
+
+    def _resolve_auto_increment_group_values(self, field, dto) -> List[str]:
+        group_fields = set(field.auto_increment.group)
+        for partition_field in dto.partition_fields:
+            if partition_field not in group_fields:
+                group_fields.add(partition_field)
+        group_fields = list(group_fields)
+        group_fields.sort()
+
+        group_values = []
+        for group_field in group_fields:
+            group_values.append(str(getattr(dto, group_field, "----")))
+
+        return group_values
+
     def _retrieve_old_dto(self, dto, id, aditional_filters):
         fields = self._make_fields_from_dto(dto)
-        get_filters = (
-            copy.deepcopy(aditional_filters) if aditional_filters is not None else {}
-        )
+        get_filters = dict(aditional_filters) if aditional_filters is not None else {}
 
         if (
             self._dto_class.conjunto_field is not None
@@ -391,8 +594,6 @@ class ServiceBaseSave(ServiceBasePartialOf):
         from .service_base import ServiceBase
 
         for master_dto_field, list_field in self._dto_class.list_fields_map.items():
-            response_list = []
-
             detail_list = getattr(dto, master_dto_field)
 
             if detail_list is None:
@@ -434,7 +635,7 @@ class ServiceBaseSave(ServiceBasePartialOf):
                 list_field.related_entity_field: relation_key_value,
             }
 
-            old_detail_ids = None
+            relation_filter = None
             if not insert:
                 relation_condiction = Filter(FilterOperator.EQUALS, relation_key_value)
 
@@ -448,58 +649,38 @@ class ServiceBaseSave(ServiceBasePartialOf):
                             Filter(FilterOperator.EQUALS, getattr(dto, field))
                         ]
 
-                old_detail_ids = detail_dao.list_ids(relation_filter)
-
-            detail_upsert_list = []
-
-            for detail_dto in detail_list:
-                detail_pk_field = detail_dto.__class__.pk_field
-                detail_pk = getattr(detail_dto, detail_pk_field)
-
-                is_detail_insert = True
-                if old_detail_ids is not None and detail_pk in old_detail_ids:
-                    is_detail_insert = False
-                    old_detail_ids.remove(detail_pk)
-
+            if len(detail_list) > 0:
                 if self._dto_class.pk_field is None:
                     raise DTOListFieldConfigException(
                         f"PK field not found in class: {self._dto_class}"
                     )
 
-                if self._dto_class.pk_field not in dto.__dict__:
+                if self._dto_class.pk_field not in dto_values_dict(dto):
                     raise DTOListFieldConfigException(
                         f"PK field not found in DTO: {self._dto_class}"
                     )
 
-                detail_upsert_list.append(
-                    {
-                        "is_detail_insert": is_detail_insert,
-                        "detail_dto": detail_dto,
-                        "detail_pk": detail_pk,
-                    }
+            # Detalhes simples são gravados em lote, comparando com os registros já
+            # existentes (e ignorando os que não sofreram alteração)
+            if detail_service._can_save_list_by_diff():
+                response_list = detail_service._save_list_by_diff(
+                    detail_list,
+                    relation_filter,
+                    relation_field_map,
+                    partial_update,
+                    aditional_filters,
                 )
-
-            if (
-                not partial_update
-                and old_detail_ids is not None
-                and len(old_detail_ids) > 0
-            ):
-                for old_id in old_detail_ids:
-                    detail_service.delete(old_id, aditional_filters)
-
-            for item in detail_upsert_list:
-                response_detail_dto = detail_service._save(
-                    item["is_detail_insert"],
-                    item["detail_dto"],
-                    False,
-                    partial_update if not item["is_detail_insert"] else False,
+            else:
+                response_list = self._save_related_list_items(
+                    detail_service,
+                    detail_dao,
+                    detail_list,
+                    relation_filter,
                     relation_field_map,
-                    item["detail_pk"],
-                    aditional_filters=aditional_filters,
+                    partial_update,
+                    aditional_filters,
                 )
 
-                response_list.append(response_detail_dto)
-
             if (
                 response_dto is not None
                 and master_dto_field in response_dto.list_fields_map
@@ -507,6 +688,300 @@ class ServiceBaseSave(ServiceBasePartialOf):
             ):
                 setattr(response_dto, master_dto_field, response_list)
 
+    def _save_related_list_items(
+        self,
+        detail_service,
+        detail_dao: DAOBase,
+        detail_list: List[DTOBase],
+        relation_filter: Dict[str, List[Filter]],
+        relation_field_map: Dict[str, Any],
+        partial_update: bool,
+        aditional_filters: Dict[str, Any] = None,
+    ) -> List[DTOBase]:
+        """
+        Grava os itens de uma lista de detalhes, um a um, por meio do serviço do detalhe
+        (suportando hooks, auditoria, listas aninhadas, etc).
+        """
+        response_list = []
+
+        old_detail_ids = None
+        if relation_filter is not None:
+            old_detail_ids = detail_dao.list_ids(relation_filter)
+
+        detail_upsert_list = []
+
+        for detail_dto in detail_list:
+            detail_pk_field = detail_dto.__class__.pk_field
+            detail_pk = getattr(detail_dto, detail_pk_field)
+
+            is_detail_insert = True
+            if old_detail_ids is not None and detail_pk in old_detail_ids:
+                is_detail_insert = False
+                old_detail_ids.remove(detail_pk)
+
+            detail_upsert_list.append(
+                {
+                    "is_detail_insert": is_detail_insert,
+                    "detail_dto": detail_dto,
+                    "detail_pk": detail_pk,
+                }
+            )
+
+        if not partial_update and old_detail_ids is not None and len(old_detail_ids) > 0:
+            for old_id in old_detail_ids:
+                detail_service.delete(old_id, aditional_filters)
+
+        for item in detail_upsert_list:
+            response_detail_dto = detail_service._save(
+                item["is_detail_insert"],
+                item["detail_dto"],
+                False,
+                partial_update if not item["is_detail_insert"] else False,
+                relation_field_map,
+                item["detail_pk"],
+                aditional_filters=aditional_filters,
+            )
+
+            response_list.append(response_detail_dto)
+
+        return response_list
+
+    def _can_save_list_by_diff(self) -> bool:
+        """
+        Indica se este serviço pode gravar uma lista de detalhes em lote (por meio do
+        método _save_list_by_diff), isto é, se a gravação de cada item não depende de
+        comportamentos executados registro a registro pelo método _save.
+        """
+        if type(self)._save is not ServiceBaseSave._save:
+            return False
+
+        if (
+            self._insert_function_type_class is not None
+            or self._update_function_type_class is not None
+        ):
+            return False
+
+        if self._has_partial_support():
+            return False
+
+        if (
+            self._dto_class.conjunto_type is not None
+            or len(self._dto_class.list_fields_map) > 0
+            or len(self._dto_class.uniques) > 0
+        ):
+            return False
+
+        if self.audit_service.should_record_audit_outbox():
+            return False
+
+        return True
+
+    def _save_list_by_diff(
+        self,
+        dto_list: List[DTOBase],
+        relation_filter: Dict[str, List[Filter]],
+        relation_field_map: Dict[str, Any],
+        partial_update: bool,
+        aditional_filters: Dict[str, Any] = None,
+    ) -> List[DTOBase]:
+        """
+        Grava uma lista de detalhes comparando-a com os registros já existentes
+        (recuperados por meio do relation_filter, numa única query):
+
+        - Itens sem alteração são ignorados;
+        - Itens novos são inseridos num único insert;
+        - Itens alterados são atualizados num único update;
+        - Registros não recebidos são excluídos num único delete (exceto em
+        atualizações parciais).
+        """
+        entity_pk_field = self._entity_class().get_pk_field()
+        dto_pk_field = self._dto_class.pk_field
+
+        if aditional_filters is not None:
+            aditional_entity_filters = self._create_entity_filters(aditional_filters)
+        else:
+            aditional_entity_filters = {}
+
+        # Recuperando os registros já gravados
+        stored_entities = {}
+        if relation_filter is not None:
+            for stored_entity in self._dao.list(
+                None,
+                None,
+                self._get_retrieve_returning_fields(),
+                None,
+                relation_filter,
+            ):
+                stored_entities[getattr(stored_entity, entity_pk_field)] = stored_entity
+
+        # Reservando os valores de auto incremento dos novos registros
+        insert_dtos = [
+            dto
+            for dto in dto_list
+            if getattr(dto, dto_pk_field) not in stored_entities
+        ]
+        auto_increment_values = None
+        if len(insert_dtos) > 0 and len(self._dto_class.auto_increment_fields) > 0:
+            auto_increment_values = self.reserve_auto_increment_values(insert_dtos)
+
+        insert_entities = []
+        update_entities = []
+        saved_entities = []
+        for dto in dto_list:
+            detail_pk = getattr(dto, dto_pk_field)
+            is_insert = detail_pk not in stored_entities
+
+            if is_insert:
+                self.fill_auto_increment_fields(True, dto, auto_increment_values)
+
+            entity = dto.convert_to_entity(
+                self._entity_class,
+                partial_update if not is_insert else False,
+                is_insert,
+            )
+
+            if getattr(entity, entity_pk_field) is None and is_insert:
+                setattr(entity, entity_pk_field, detail_pk)
+
+            for entity_field, value in relation_field_map.items():
+                if hasattr(entity, entity_field):
+                    setattr(entity, entity_field, value)
+                    if entity_field not in entity._sql_fields:
+                        entity._sql_fields.append(entity_field)
+
+            self._fill_user_fields(entity, is_insert)
+
+            if is_insert:
+                insert_entities.append(entity)
+            else:
+                stored_entity = stored_entities.pop(detail_pk)
+                if len(self._get_changed_entity_fields(entity, stored_entity)) > 0:
+                    update_entities.append(entity)
+
+            saved_entities.append(entity)
+
+        deleted_pks = []
+        if not partial_update and len(stored_entities) > 0:
+            deleted_pks = list(stored_entities.keys())
+            delete_filters = {**aditional_entity_filters}
+            delete_filters[entity_pk_field] = [Filter(FilterOperator.IN, deleted_pks)]
+            self._dao.delete(delete_filters)
+
+        if len(update_entities) > 0:
+            self._dao.update_list(
+                entity_pk_field,
+                update_entities,
+                aditional_entity_filters,
+                partial_update,
+                self._dto_class.sql_read_only_fields,
+                self._dto_class.sql_no_update_fields,
+            )
+
+        if len(insert_entities) > 0:
+            # Verificando conflitos (PKs a gerar pelo banco não entram na verificação)
+            insert_pks = [
+                getattr(entity, entity_pk_field)
+                for entity in insert_entities
+                if getattr(entity, entity_pk_field) is not None
+            ]
+            if len(insert_pks) > 0:
+                conflict_filters = {**aditional_entity_filters}
+                conflict_filters[entity_pk_field] = [
+                    Filter(FilterOperator.IN, insert_pks)
+                ]
+                conflict_ids = self._dao.list_ids(conflict_filters)
+                if conflict_ids:
+                    raise ConflictException(
+                        f"Já existe um registro no banco com o identificador '{conflict_ids[0]}'"
+                    )
+
+            self._dao.insert_list(insert_entities, self._dto_class.sql_read_only_fields)
+
+        # Invalidando os caches de leitura da tabela dos detalhes (a transação é
+        # controlada pela gravação do registro mestre)
+        if len(deleted_pks) > 0 or len(update_entities) > 0 or len(insert_entities) > 0:
+            self._invalidate_entity_caches(
+                aditional_filters,
+                keys=deleted_pks
+                + [
+                    getattr(entity, entity_pk_field)
+                    for entity in update_entities + insert_entities
+                ],
+                manage_transaction=False,
+            )
+
+        # Montando as respostas após as gravações (com os valores gerados pelo banco)
+        if self._dto_post_response_class is None:
+            return [None] * len(saved_entities)
+
+        return [
+            self._dto_post_response_class(entity, escape_validator=True)
+            for entity in saved_entities
+        ]
+
+    def _keep_only_changed_fields(
+        self,
+        entity: EntityBase,
+        old_dto: DTOBase,
+        partial_update: bool,
+    ) -> bool:
+        """
+        Compara a entity a ser gravada com o registro anterior (old_dto), mantendo,
+        na lista de campos a gravar (entity._sql_fields), apenas os campos alterados
+        (além do usuário de atualização).
+
+        Retorna False se nenhum campo foi alterado (isto é, se o update é desnecessário).
+        """
+        old_entity = old_dto.convert_to_entity(
+            self._entity_class,
+            partial_update,
+            False,
+        )
+
+        changed_fields = self._get_changed_entity_fields(entity, old_entity)
+        if len(changed_fields) <= 0:
+            return False
+
+        keep_fields = set(changed_fields)
+        keep_fields.add(self._updated_by_property)
+        entity._sql_fields = SqlFields(
+            field for field in entity._sql_fields if field in keep_fields
+        )
+
+        return True
+
+    def _get_changed_entity_fields(
+        self,
+        entity: EntityBase,
+        stored_entity: EntityBase,
+    ) -> List[str]:
+        """
+        Retorna os campos (da entity) cujos valores diferem dos valores gravados no
+        banco (representados pela stored_entity).
+
+        Os campos de controle (chave, campos constantes e usuário de criação/atualização)
+        não são considerados, bem como os campos não informados numa atualização parcial.
+        """
+        ignored_fields = set(entity.get_const_fields())
+        ignored_fields.add(entity.get_pk_field())
+        ignored_fields.add(self._created_by_property)
+        ignored_fields.add(self._updated_by_property)
+
+        changed_fields = []
+        for field in entity._sql_fields:
+            if field in ignored_fields:
+                continue
+
+            value = getattr(entity, field, None)
+            if value is EMPTY:
+                continue
+
+            stored_value = getattr(stored_entity, field, None)
+            if convert_to_dumps(value) != convert_to_dumps(stored_value):
+                changed_fields.append(field)
+
+        return changed_fields
+
     def _check_unique(
         self,
         dto: DTOBase,
@@ -8,6 +8,7 @@ from nsj_rest_lib.descriptor.dto_list_field import DTOListField
 from nsj_rest_lib.descriptor.dto_object_field import DTOObjectField
 from nsj_rest_lib.descriptor.dto_one_to_one_field import DTOOneToOneField
 from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
 from nsj_rest_lib.entity.function_type_base import (
     FunctionTypeBase,
     InsertFunctionTypeBase,
@@ -151,7 +152,11 @@ class ServiceBaseSaveByFunction:
                 )
 
             value = coerce_enum_value(field_value)
-            dto_values = getattr(field_owner, "__dict__", dto.__dict__)
+            dto_values = (
+                dto_values_dict(field_owner)
+                if hasattr(field_owner, "__dict__")
+                else dto_values_dict(dto)
+            )
 
             convert_to_function = getattr(
                 descriptor, "convert_to_function", None)
@@ -55,6 +55,16 @@ class ServiceBaseUpdate(ServiceBaseInsert):
             if manage_transaction:
                 self._dao.begin()
 
+            # Os relacionamentos do retorno são recuperados em lote, ao final
+            defer_related_retrieve = (
+                retrieve_after_update
+                and self._can_retrieve_from_returning(
+                    False,
+                    retrieve_fields,
+                    custom_after_update=custom_after_update,
+                )
+            )
+
             for dto in dtos:
                 _return_object = self._save(
                     insert=False,
@@ -70,11 +80,17 @@ class ServiceBaseUpdate(ServiceBaseInsert):
                     retrieve_after_insert=retrieve_after_update,
                     custom_json_response=custom_json_response,
                     retrieve_fields=retrieve_fields,
+                    defer_related_retrieve=defer_related_retrieve,
                 )
 
                 if _return_object is not None:
                     _lst_return.append(_return_object)
 
+            if defer_related_retrieve and not custom_json_response:
+                self._retrieve_after_save_related(
+                    _lst_return, retrieve_fields, aditional_filters
+                )
+
         except:
             if manage_transaction:
                 self._dao.rollback()
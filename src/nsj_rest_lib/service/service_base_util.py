@@ -8,9 +8,20 @@ from nsj_rest_lib.descriptor.dto_field import DTOFieldFilter
 from nsj_rest_lib.descriptor.dto_left_join_field import EntityRelationOwner
 from nsj_rest_lib.descriptor.filter_operator import FilterOperator
 from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
 from nsj_rest_lib.entity.entity_base import EntityBase
 from nsj_rest_lib.entity.filter import Filter
 from nsj_rest_lib.exception import NotFoundException
+from nsj_rest_lib.settings import REST_LIB_CACHE_INVALIDATION_BUS, get_logger
+from nsj_rest_lib.util.cache_invalidation_bus import (
+    defer_cache_invalidation_event,
+    publish_cache_invalidation,
+)
+from nsj_rest_lib.util.cache_util import (
+    defer_entity_cache_invalidation,
+    invalidate_entity_caches,
+    partition_cache_key,
+)
 from nsj_rest_lib.util.fields_util import FieldsTree
 from nsj_rest_lib.util.type_validator_util import TypeValidatorUtil
 from nsj_rest_lib.validator.validate_data import validate_uuid
@@ -33,6 +44,58 @@ class ServiceBaseUtil:
         )
         return f"lst_{safe_name}"
 
+    def _invalidate_entity_caches(
+        self,
+        *values_list: ty.Optional[ty.Mapping[str, Any]],
+        keys: ty.Optional[ty.Iterable[Any]] = None,
+        manage_transaction: bool = True,
+        publish: bool = True,
+    ) -> None:
+        """
+        Invalida os caches de leitura da entidade (ver util/cache_util.py), na partição
+        identificada pelos valores recebidos (ou em todas as partições, se a mesma
+        não puder ser identificada).
+
+        Se a gravação não controla a transação (manage_transaction=False), a
+        invalidação é repetida após o commit de quem a controla (ver
+        DAOBaseUtil.commit).
+
+        Se o barramento de invalidação estiver habilitado, e "publish" for True,
+        publica também o evento para os demais processos (ver
+        util/cache_invalidation_bus.py). Gravações que falharam não devem publicar
+        (publish=False), pois o NOTIFY feito após o rollback seria entregue. Se a
+        gravação não controla a transação, o evento só é publicado após o commit
+        de quem a controla (uma falha no NOTIFY abortaria a transação).
+        """
+        partition_values: Dict[str, Any] = {}
+        for values in values_list:
+            if values:
+                partition_values.update(
+                    {key: value for key, value in values.items() if value is not None}
+                )
+
+        table_name = self._entity_class.table_name
+        partition = partition_cache_key(
+            self._dto_class.partition_fields, partition_values
+        )
+        invalidate_entity_caches(table_name, partition)
+        if not manage_transaction:
+            defer_entity_cache_invalidation(table_name, partition)
+
+        if not publish or not REST_LIB_CACHE_INVALIDATION_BUS:
+            return
+
+        if not manage_transaction:
+            defer_cache_invalidation_event(table_name, partition, keys)
+        else:
+            try:
+                publish_cache_invalidation(self._dao._db, table_name, partition, keys)
+            except Exception as e:
+                # Os demais processos dependem do TTL dos caches
+                get_logger().warning(
+                    f"[RestLib] Falha ao publicar a invalidação de cache da tabela {table_name}: {e}"
+                )
+
     def _resolve_field_key(
         self,
         id_value: Any,
@@ -599,12 +662,13 @@ class ServiceBaseUtil:
     def _make_fields_from_dto(self, dto: DTOBase) -> FieldsTree:
         fields_tree: FieldsTree = {"root": set()}
 
+        dto_values = dto_values_dict(dto)
         for field in dto.fields_map:
-            if field in dto.__dict__:
+            if field in dto_values:
                 fields_tree["root"].add(field)
 
         for list_field in dto.list_fields_map:
-            if list_field not in dto.__dict__:
+            if list_field not in dto_values:
                 continue
 
             list_dto = getattr(dto, list_field)
@@ -32,6 +32,22 @@ ENV = os.getenv("ENV", "")
 REST_LIB_AUTO_INCREMENT_TABLE = os.getenv(
     "REST_LIB_AUTO_INCREMENT_TABLE", "seq_control"
 )
+REST_LIB_AUTO_INCREMENT_BLOCK_SIZE = int(
+    os.getenv("REST_LIB_AUTO_INCREMENT_BLOCK_SIZE", 1)
+)
+REST_LIB_JSON_BACKEND = os.getenv("REST_LIB_JSON_BACKEND", "std").lower()
+REST_LIB_ETAG_CACHE_TTL = float(os.getenv("REST_LIB_ETAG_CACHE_TTL", 0))
+REST_LIB_ETAG_CACHE_MAXSIZE = int(os.getenv("REST_LIB_ETAG_CACHE_MAXSIZE", 10000))
+REST_LIB_IDENTITY_MAP = os.getenv("REST_LIB_IDENTITY_MAP", "false").lower() == "true"
+REST_LIB_CACHE_INVALIDATION_BUS = (
+    os.getenv("REST_LIB_CACHE_INVALIDATION_BUS", "false").lower() == "true"
+)
+REST_LIB_CACHE_INVALIDATION_CHANNEL = os.getenv(
+    "REST_LIB_CACHE_INVALIDATION_CHANNEL", "nsj_rest_lib_cache"
+)
+REST_LIB_CACHE_INVALIDATION_POLL_INTERVAL = float(
+    os.getenv("REST_LIB_CACHE_INVALIDATION_POLL_INTERVAL", 1)
+)
 
 
 def get_logger():
@@ -56,3 +72,14 @@ provider = MeterProvider(metric_readers=[reader])
 metrics.set_meter_provider(provider)
 
 application = Flask("app")
+
+if REST_LIB_JSON_BACKEND != "std":
+    try:
+        from nsj_rest_lib.util.json_provider import JSONBackendProvider
+    except ImportError:
+        # Providers de JSON só existem a partir do Flask 2.2
+        get_logger().warning(
+            "Backend JSON configurado, mas o Flask instalado não suporta providers de JSON (exige o Flask 2.2). Os corpos das requisições serão interpretados pelo Flask."
+        )
+    else:
+        application.json = JSONBackendProvider(application)
@@ -0,0 +1,351 @@
+import contextvars
+import json
+import os
+import re
+import threading
+import typing as ty
+import uuid
+
+from nsj_rest_lib.settings import (
+    REST_LIB_CACHE_INVALIDATION_CHANNEL,
+    REST_LIB_CACHE_INVALIDATION_POLL_INTERVAL,
+    get_logger,
+)
+from nsj_rest_lib.util.cache_util import clear_entity_caches, invalidate_entity_caches
+
+# Tamanho máximo do payload de um NOTIFY no PostgreSQL (em bytes)
+NOTIFY_PAYLOAD_MAX_SIZE = 7999
+
+_CHANNEL_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Identificação do processo (para que o listener ignore os eventos do próprio
+# processo, já invalidados localmente). É refeita após um fork.
+_origin: ty.Optional[ty.Tuple[int, str]] = None
+
+
+def process_origin() -> str:
+    global _origin
+
+    pid = os.getpid()
+    if _origin is None or _origin[0] != pid:
+        _origin = (pid, f"{pid}:{uuid.uuid4().hex}")
+
+    return _origin[1]
+
+
+def encode_invalidation_event(
+    table_name: str,
+    partition: ty.Optional[ty.Tuple[ty.Tuple[str, str], ...]],
+    keys: ty.Optional[ty.Iterable[ty.Any]] = None,
+) -> str:
+    """
+    Monta o payload (json) de um evento de invalidação.
+
+    Se o payload exceder o limite do NOTIFY, as chaves (e, em último caso, a
+    partição) são descartadas, ampliando a invalidação (o que é sempre seguro).
+    """
+    event = {
+        "o": process_origin(),
+        "t": table_name,
+        "p": [list(item) for item in partition] if partition is not None else None,
+        "k": [str(key) for key in keys] if keys is not None else None,
+    }
+
+    payload = json.dumps(event, separators=(",", ":"))
+    for field in ("k", "p"):
+        if len(payload.encode("utf-8")) <= NOTIFY_PAYLOAD_MAX_SIZE:
+            break
+        event[field] = None
+        payload = json.dumps(event, separators=(",", ":"))
+
+    return payload
+
+
+def decode_invalidation_event(payload: str) -> ty.Dict[str, ty.Any]:
+    """
+    Interpreta o payload de um evento de invalidação, retornando um dict com a
+    origem ("origin"), a tabela ("table_name"), a partição ("partition", no formato
+    do cache_util.partition_cache_key) e as chaves ("keys").
+    """
+    event = json.loads(payload)
+
+    partition = event.get("p")
+    if partition is not None:
+        partition = tuple((str(field), str(value)) for field, value in partition)
+
+    return {
+        "origin": event.get("o"),
+        "table_name": event["t"],
+        "partition": partition,
+        "keys": event.get("k"),
+    }
+
+
+def publish_cache_invalidation(
+    db,
+    table_name: str,
+    partition: ty.Optional[ty.Tuple[ty.Tuple[str, str], ...]],
+    keys: ty.Optional[ty.Iterable[ty.Any]] = None,
+    channel: str = REST_LIB_CACHE_INVALIDATION_CHANNEL,
+) -> None:
+    """
+    Publica (por meio de um NOTIFY, na conexão do DBAdapter2 recebido) um evento
+    de invalidação dos caches da tabela (e partição), para os demais processos.
+
+    O NOTIFY é transacional: se houver uma transação aberta na conexão, o evento
+    só é entregue no commit (e é descartado no rollback). Além disso, uma falha no
+    NOTIFY aborta a transação aberta; por isso, as gravações feitas dentro de uma
+    transação controlada por outro código registram o evento (ver
+    defer_cache_invalidation_event), que é publicado após o commit.
+    """
+    db.execute(
+        "select pg_notify(:channel, :payload)",
+        channel=channel,
+        payload=encode_invalidation_event(table_name, partition, keys),
+    )
+
+
+# Eventos pendentes de publicação (da transação corrente): (tabela, partição) ->
+# chaves gravadas (ou None, se não conhecidas)
+_deferred_events: contextvars.ContextVar[
+    ty.Optional[ty.Dict[ty.Tuple[str, ty.Optional[ty.Tuple]], ty.Optional[ty.Set[str]]]]
+] = contextvars.ContextVar("nsj_rest_lib_deferred_cache_events", default=None)
+
+
+def defer_cache_invalidation_event(
+    table_name: str,
+    partition: ty.Optional[ty.Tuple[ty.Tuple[str, str], ...]],
+    keys: ty.Optional[ty.Iterable[ty.Any]] = None,
+) -> None:
+    """
+    Registra um evento de invalidação, a ser publicado após o commit da transação
+    corrente (ver flush_deferred_cache_invalidation_events).
+    """
+    pending = _deferred_events.get()
+    if pending is None:
+        pending = {}
+        _deferred_events.set(pending)
+
+    event_key = (table_name, partition)
+    if keys is None:
+        pending[event_key] = None
+    elif event_key not in pending:
+        pending[event_key] = {str(key) for key in keys}
+    elif pending[event_key] is not None:
+        pending[event_key].update(str(key) for key in keys)
+
+
+def flush_deferred_cache_invalidation_events(db) -> None:
+    """
+    Publica os eventos registrados (chamado após o commit da transação, de modo que
+    cada NOTIFY é executado fora da mesma). Falhas são apenas registradas no log.
+    """
+    pending = _deferred_events.get()
+    if not pending:
+        return
+
+    _deferred_events.set(None)
+    for (table_name, partition), keys in pending.items():
+        try:
+            publish_cache_invalidation(db, table_name, partition, keys)
+        except Exception as e:
+            # Os demais processos dependem do TTL dos caches
+            get_logger().warning(
+                f"[RestLib] Falha ao publicar a invalidação de cache da tabela {table_name}: {e}"
+            )
+
+
+def discard_deferred_cache_invalidation_events() -> None:
+    """
+    Descarta os eventos registrados (chamado após o rollback da transação).
+    """
+    _deferred_events.set(None)
+
+
+class CacheInvalidationListener:
+    """
+    Listener (em uma thread de background, com uma conexão dedicada) dos eventos
+    de invalidação publicados pelos demais processos, invalidando os caches locais
+    (registrados no cache_util) da tabela e partição de cada evento.
+
+    Como o driver (pg8000) não permite aguardar as notificações sem uma consulta,
+    a conexão é consultada a cada "poll_interval" segundos. Sempre que a conexão é
+    (re)estabelecida, ou quando podem ter sido perdidos eventos, todos os caches
+    locais são limpos.
+    """
+
+    def __init__(
+        self,
+        connect: ty.Callable[[], ty.Any],
+        channel: str = REST_LIB_CACHE_INVALIDATION_CHANNEL,
+        poll_interval: float = REST_LIB_CACHE_INVALIDATION_POLL_INTERVAL,
+        reconnect_delay: float = 5.0,
+    ):
+        if not _CHANNEL_PATTERN.match(channel):
+            raise ValueError(f"Nome de canal inválido para o LISTEN: {channel}")
+
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+
+        self._connect = connect
+        self._stop_event = threading.Event()
+        self._thread: ty.Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="nsj_rest_lib_cache_invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: ty.Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def listen(self, connection) -> None:
+        """
+        Registra o LISTEN do canal na conexão recebida.
+        """
+        driver_connection = _driver_connection(connection)
+        driver_connection.autocommit = True
+
+        cursor = driver_connection.cursor()
+        cursor.execute(f"LISTEN {self.channel}")
+
+    def process_notifications(self, connection) -> int:
+        """
+        Consulta a conexão (recebendo as notificações pendentes) e trata os eventos
+        recebidos, retornando a quantidade de eventos tratados.
+        """
+        driver_connection = _driver_connection(connection)
+
+        if hasattr(driver_connection, "poll"):
+            # psycopg2
+            driver_connection.poll()
+            notifies = driver_connection.notifies
+            payloads = [(notify.channel, notify.payload) for notify in notifies]
+            notifies.clear()
+            overflow = False
+        else:
+            # pg8000 (as notificações são recebidas junto com a resposta de uma
+            # consulta, e guardadas numa fila de tamanho limitado)
+            cursor = driver_connection.cursor()
+            cursor.execute("select 1")
+            cursor.fetchall()
+
+            notifications = driver_connection.notifications
+            overflow = (
+                notifications.maxlen is not None
+                and len(notifications) >= notifications.maxlen
+            )
+            payloads = []
+            while notifications:
+                _, channel, payload = notifications.popleft()
+                payloads.append((channel, payload))
+
+        if overflow:
+            get_logger().warning(
+                "[RestLib] Fila de notificações cheia; limpando todos os caches locais."
+            )
+            clear_entity_caches()
+
+        count = 0
+        for channel, payload in payloads:
+            if channel == self.channel:
+                self.handle_payload(payload)
+                count += 1
+
+        return count
+
+    def handle_payload(self, payload: str) -> None:
+        try:
+            event = decode_invalidation_event(payload)
+        except Exception:
+            get_logger().warning(
+                f"[RestLib] Evento de invalidação de cache inválido: {payload}"
+            )
+            # Na dúvida, descartando tudo (o que é sempre seguro)
+            clear_entity_caches()
+            return
+
+        if event["origin"] == process_origin():
+            return
+
+        invalidate_entity_caches(event["table_name"], event["partition"])
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self.listen(connection)
+
+                # Eventos podem ter sido perdidos enquanto não havia LISTEN
+                clear_entity_caches()
+
+                while not self._stop_event.is_set():
+                    self.process_notifications(connection)
+                    self._stop_event.wait(self.poll_interval)
+            except Exception as e:
+                get_logger().warning(
+                    f"[RestLib] Falha no listener de invalidação de cache: {e}"
+                )
+                self._stop_event.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def _driver_connection(connection):
+    # Conexões obtidas pelo SQLAlchemy (raw_connection) encapsulam a do driver
+    return getattr(connection, "dbapi_connection", None) or connection
+
+
+_listener: ty.Optional[CacheInvalidationListener] = None
+_listener_pid: ty.Optional[int] = None
+_listener_lock = threading.Lock()
+
+
+def _default_connect():
+    from nsj_rest_lib import injector_factory_base
+
+    pool = injector_factory_base.db_pool
+    if pool is None:
+        from nsj_rest_lib.db_pool_config import default_create_pool
+
+        pool = default_create_pool()
+
+    return pool.raw_connection()
+
+
+def ensure_cache_invalidation_listener(
+    connect: ty.Callable[[], ty.Any] = None,
+) -> CacheInvalidationListener:
+    """
+    Garante que o listener de invalidação esteja rodando no processo corrente
+    (iniciando-o, se necessário, inclusive após um fork).
+    """
+    global _listener, _listener_pid
+
+    pid = os.getpid()
+    with _listener_lock:
+        if _listener is None or _listener_pid != pid:
+            _listener = CacheInvalidationListener(connect or _default_connect)
+            _listener_pid = pid
+
+        if not _listener.is_alive():
+            _listener.start()
+
+        return _listener
@@ -0,0 +1,275 @@
+import contextvars
+import threading
+import time
+import typing as ty
+import weakref
+
+from collections import OrderedDict
+
+# Marcador de item não encontrado no cache (permitindo guardar None como valor)
+MISS = object()
+
+
+class LRUTTLCache:
+    """
+    Cache em memória (por processo), limitado em quantidade de itens (descartando os
+    menos usados recentemente) e, opcionalmente, em tempo de vida (TTL, em segundos).
+
+    Cada item pode ser associado a tags, permitindo invalidar de uma só vez todos os
+    itens de uma mesma tag (por exemplo: todos os registros de uma entidade, numa
+    partição). O cache é seguro para uso concorrente (entre threads).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: ty.Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser maior que zero.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        # chave -> (instante de expiração, valor, tags)
+        self._items: OrderedDict = OrderedDict()
+        # tag -> chaves dos itens associados
+        self._tags: ty.Dict[ty.Hashable, ty.Set[ty.Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: ty.Hashable, default: ty.Any = MISS) -> ty.Any:
+        """
+        Retorna o valor guardado para a chave (ou o default, se a chave não estiver no
+        cache, ou se o item tiver expirado).
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+
+            expires_at, value, _ = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return default
+
+            self._items.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: ty.Hashable,
+        value: ty.Any,
+        tags: ty.Iterable[ty.Hashable] = (),
+        ttl: ty.Optional[float] = None,
+    ) -> None:
+        """
+        Guarda o valor no cache, associado às tags recebidas. O TTL recebido
+        sobrepõe o TTL padrão do cache.
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        tags = tuple(tags)
+
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+            self._items[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._items) > self.maxsize:
+                self._remove(next(iter(self._items)))
+
+    def delete(self, key: ty.Hashable) -> None:
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def invalidate_tag(self, tag: ty.Hashable) -> int:
+        """
+        Remove todos os itens associados à tag, retornando a quantidade removida.
+        """
+        with self._lock:
+            keys = self._tags.pop(tag, None)
+            if not keys:
+                return 0
+
+            for key in keys:
+                if key in self._items:
+                    self._remove(key)
+
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _remove(self, key: ty.Hashable) -> None:
+        _, _, tags = self._items.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# Caches de leitura registrados por tabela (para a invalidação nas gravações)
+_entity_caches: ty.Dict[str, "weakref.WeakSet[LRUTTLCache]"] = {}
+_entity_caches_lock = threading.Lock()
+
+
+def register_entity_cache(table_name: str, cache: LRUTTLCache) -> None:
+    """
+    Registra um cache com dados da tabela recebida, para que seja invalidado pelas
+    gravações (insert, update e delete) feitas pelos services sobre a mesma tabela.
+    """
+    with _entity_caches_lock:
+        _entity_caches.setdefault(table_name, weakref.WeakSet()).add(cache)
+
+
+def freeze_cache_value(value: ty.Any) -> ty.Hashable:
+    """
+    Converte o valor (possivelmente composto por dicts, listas e sets) numa
+    representação imutável (hashable), para uso em chaves de cache. Valores
+    equivalentes (inclusive dicts com chaves em ordens diferentes) resultam em
+    representações iguais.
+    """
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple(
+                sorted(
+                    ((str(key), freeze_cache_value(item)) for key, item in value.items()),
+                    key=repr,
+                )
+            ),
+        )
+
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(freeze_cache_value(item) for item in value))
+
+    if isinstance(value, (set, frozenset)):
+        return (set, tuple(sorted((freeze_cache_value(item) for item in value), key=repr)))
+
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value).__name__, repr(value))
+
+    return value
+
+
+def partition_cache_key(
+    partition_fields: ty.Iterable[str],
+    values: ty.Optional[ty.Mapping[str, ty.Any]],
+) -> ty.Optional[ty.Tuple[ty.Tuple[str, str], ...]]:
+    """
+    Monta a identificação da partição (a partir dos valores dos campos de partição do
+    DTO), ou retorna None se algum dos valores não for conhecido.
+
+    Os valores são comparados como string (pois chegam como string nas rotas, e já
+    convertidos nos DTOs).
+    """
+    if values is None:
+        return None
+
+    key = []
+    for field in sorted(partition_fields):
+        value = values.get(field)
+        if value is None:
+            return None
+        key.append((field, str(value)))
+
+    return tuple(key)
+
+
+def entity_cache_tags(
+    table_name: str, partition: ty.Optional[ty.Tuple]
+) -> ty.Tuple[ty.Tuple, ...]:
+    """
+    Retorna as tags de um item de cache com dados da tabela (e partição) recebidas.
+    """
+    return ((table_name,), (table_name, partition))
+
+
+def invalidate_entity_caches(
+    table_name: str, partition: ty.Optional[ty.Tuple] = None
+) -> None:
+    """
+    Invalida, em todos os caches registrados para a tabela, os itens da partição
+    recebida (ou todos os itens da tabela, se a partição não for conhecida).
+    """
+    with _entity_caches_lock:
+        caches = list(_entity_caches.get(table_name, ()))
+
+    # Os itens de partição desconhecida são invalidados por qualquer gravação
+    if partition is None:
+        tags = [(table_name,)]
+    else:
+        tags = [(table_name, partition), (table_name, None)]
+
+    for cache in caches:
+        for tag in tags:
+            cache.invalidate_tag(tag)
+
+
+def clear_entity_caches() -> None:
+    """
+    Limpa todos os caches registrados (de todas as tabelas). Usado quando eventos de
+    invalidação podem ter sido perdidos.
+    """
+    with _entity_caches_lock:
+        caches = [
+            cache for table_caches in _entity_caches.values() for cache in table_caches
+        ]
+
+    for cache in caches:
+        cache.clear()
+
+
+# Invalidações a repetir no commit da transação corrente (feitas por gravações que
+# não controlam a transação)
+_deferred_invalidations: contextvars.ContextVar[
+    ty.Optional[ty.Set[ty.Tuple[str, ty.Optional[ty.Tuple]]]]
+] = contextvars.ContextVar("nsj_rest_lib_deferred_cache_invalidations", default=None)
+
+
+def defer_entity_cache_invalidation(
+    table_name: str, partition: ty.Optional[ty.Tuple] = None
+) -> None:
+    """
+    Registra uma invalidação a ser repetida no commit da transação corrente.
+
+    Uma gravação feita dentro de uma transação controlada por outro código só é
+    visível às demais conexões após o commit; assim, uma leitura concorrente pode
+    recolocar no cache o registro anterior, entre a invalidação e o commit.
+    """
+    pending = _deferred_invalidations.get()
+    if pending is None:
+        pending = set()
+        _deferred_invalidations.set(pending)
+
+    pending.add((table_name, partition))
+
+
+def flush_deferred_entity_cache_invalidations() -> None:
+    """
+    Repete as invalidações registradas (chamado após o commit da transação).
+    """
+    pending = _deferred_invalidations.get()
+    if not pending:
+        return
+
+    _deferred_invalidations.set(None)
+    for table_name, partition in pending:
+        invalidate_entity_caches(table_name, partition)
+
+
+def discard_deferred_entity_cache_invalidations() -> None:
+    """
+    Descarta as invalidações registradas (chamado após o rollback da transação, pois
+    os registros anteriores continuam válidos).
+    """
+    _deferred_invalidations.set(None)
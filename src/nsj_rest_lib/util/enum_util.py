@@ -1,4 +1,5 @@
 import enum
+import functools
 import typing as ty
 
 
@@ -19,3 +20,143 @@ def coerce_enum_value(value: ty.Any) -> ty.Any:
     if isinstance(value, enum.Enum):
         return enum_to_primitive_value(value)
     return value
+
+
+class EnumLookup:
+    """
+    Tabelas de busca pré-calculadas para um enumerado (montadas uma única vez por
+    classe, veja get_enum_lookup), usadas nas conversões de valores para itens do
+    enumerado, e de itens do enumerado para os valores gravados nas entidades.
+
+    As buscas são equivalentes às varreduras lineares originais (inclusive na
+    ordem de prioridade entre os itens, e nas variações de caixa alta e baixa).
+    """
+
+    def __init__(self, enum_class: ty.Type[enum.Enum]):
+        self.enum_class = enum_class
+
+        members = list(enum_class)
+        self.empty = len(members) <= 0
+        self.tuple_values = not self.empty and isinstance(members[0].value, tuple)
+
+        # Só se faz a busca case insensitive direta (por tabela), quando o enumerado
+        # não customiza o tratamento de valores não encontrados
+        self._case_lookup = (
+            getattr(enum_class._missing_, "__func__", None)
+            is enum.Enum._missing_.__func__
+        )
+
+        # Indica que algum valor não pode ser indexado (caindo na busca linear)
+        self._linear = False
+
+        # Valor (inclusive cada elemento das tuplas) -> (posição, item)
+        self._members_by_value: ty.Dict[ty.Any, ty.Tuple[int, enum.Enum]] = {}
+
+        # Item -> valor correspondente na entidade
+        self._entity_values: ty.Dict[enum.Enum, ty.Any] = {}
+
+        position = 0
+        for member in members:
+            try:
+                valores = list(member.value) if self.tuple_values else [member.value]
+                for valor in valores:
+                    self._members_by_value.setdefault(valor, (position, member))
+                    position += 1
+            except TypeError:
+                self._linear = True
+
+            try:
+                self._entity_values[member] = enum_to_primitive_value(member)
+            except Exception:
+                # Deixa o erro para o momento da conversão (como no fluxo original)
+                pass
+
+    def find_member(self, value: ty.Any) -> ty.Optional[enum.Enum]:
+        """
+        Retorna o item do enumerado correspondente ao valor recebido (testando também
+        as variações em caixa alta e baixa, para strings), ou None, se não encontrado.
+        """
+        if self._linear:
+            return self._find_member_linear(value)
+
+        try:
+            found = self._members_by_value.get(value)
+        except TypeError:
+            return self._find_member_linear(value)
+
+        if isinstance(value, str) and (self.tuple_values or found is None):
+            for candidate in (value.lower(), value.upper()):
+                other = self._members_by_value.get(candidate)
+                if other is None:
+                    continue
+
+                # Nas tuplas vale o primeiro elemento que casar (em qualquer das
+                # variações), já nos valores simples vale a ordem das variações
+                if found is None or (self.tuple_values and other[0] < found[0]):
+                    found = other
+
+                if not self.tuple_values:
+                    break
+
+        return found[1] if found is not None else None
+
+    def _find_member_linear(self, value: ty.Any) -> ty.Optional[enum.Enum]:
+        for item in self.enum_class:
+            lista_valores = list(item.value) if self.tuple_values else [item.value]
+            for valor in lista_valores:
+                # Testando se casa com o valor
+                if valor == value:
+                    return item
+
+                # Se o valor for string, testa inclusive em caixa alta e baixa
+                if isinstance(value, str):
+                    if valor == value.lower() or valor == value.upper():
+                        return item
+
+        return None
+
+    def convert_value(self, value: ty.Any) -> enum.Enum:
+        """
+        Converte o valor para o item do enumerado (para enumerados de valores simples),
+        com o mesmo comportamento da construção direta do enumerado (testando
+        também as variações em caixa alta e baixa, para strings).
+
+        Lança ValueError, se o valor não for válido.
+        """
+        if isinstance(value, self.enum_class):
+            return value
+
+        member = None
+        if self._case_lookup or not isinstance(value, str):
+            member = self.find_member(value)
+        if member is not None:
+            return member
+
+        # Tentando pelo valor do próprio enum (e testando os casos, se for str)
+        if isinstance(value, str):
+            try:
+                return self.enum_class(value)
+            except ValueError:
+                try:
+                    return self.enum_class(value.lower())
+                except ValueError:
+                    return self.enum_class(value.upper())
+        else:
+            return self.enum_class(value)
+
+    def entity_value(self, member: ty.Any) -> ty.Any:
+        """
+        Retorna o valor a ser gravado na entidade, para o item do enumerado recebido.
+        """
+        try:
+            return self._entity_values[member]
+        except (KeyError, TypeError):
+            return enum_to_primitive_value(member)
+
+
+@functools.lru_cache(maxsize=None)
+def get_enum_lookup(enum_class: ty.Type[enum.Enum]) -> EnumLookup:
+    """
+    Retorna as tabelas de busca do enumerado (montadas uma única vez por classe).
+    """
+    return EnumLookup(enum_class)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import copy
+import functools
 from typing import Any, Dict, Iterable, List, Optional, Set
 
 FieldsTree = Dict[str, Any]
@@ -116,14 +117,29 @@ def _add_path(tree: FieldsTree, parts: List[str]) -> None:
     _add_path(child, tail)
 
 
-def parse_fields_expression(expression: Optional[str]) -> FieldsTree:
+@functools.lru_cache(maxsize=512)
+def _parse_fields_expression_cached(expression: str) -> FieldsTree:
     """
-    Converte a expressão textual dos fields em uma estrutura de árvore.
+    Interpreta a expressão de fields, mantendo o resultado em cache (por valor da
+    expressão). A árvore retornada é compartilhada, e nunca deve ser alterada.
     """
     paths = split_fields_expression(expression)
     return build_fields_tree(paths)
 
 
+def parse_fields_expression(expression: Optional[str]) -> FieldsTree:
+    """
+    Converte a expressão textual dos fields em uma estrutura de árvore.
+
+    O parser só é executado uma vez por valor de expressão; as chamadas seguintes
+    recebem uma cópia (livre para alteração) da árvore já interpretada.
+    """
+    if expression is None:
+        return {"root": set()}
+
+    return clone_fields_tree(_parse_fields_expression_cached(expression))
+
+
 def merge_fields_tree(target: FieldsTree, source: FieldsTree) -> None:
     """
     Mescla a árvore de fields "source" dentro de "target".
@@ -190,7 +206,7 @@ def extract_child_tree(fields: FieldsTree, field_name: str) -> FieldsTree:
         return {"root": set()}
 
     if isinstance(value, dict):
-        return copy.deepcopy(value)
+        return clone_fields_tree(value)
 
     return {"root": _ensure_set(value)}
 
@@ -198,8 +214,42 @@ def extract_child_tree(fields: FieldsTree, field_name: str) -> FieldsTree:
 def clone_fields_tree(fields: FieldsTree) -> FieldsTree:
     """
     Retorna uma cópia profunda da árvore de fields.
+
+    Apenas os dicts e sets que compõem a árvore são copiados (os nomes dos campos,
+    sendo strings, são compartilhados), evitando o custo do deepcopy.
     """
-    return copy.deepcopy(fields)
+    result: FieldsTree = {}
+    for key, value in fields.items():
+        if isinstance(value, dict):
+            result[key] = clone_fields_tree(value)
+        elif isinstance(value, set):
+            result[key] = set(value)
+        else:
+            result[key] = copy.deepcopy(value)
+
+    return result
+
+
+def freeze_fields_tree(fields: Optional[Dict[str, Any]]) -> Any:
+    """
+    Retorna uma representação imutável (e hashable) da árvore de fields, para uso
+    como chave de cache. Árvores equivalentes resultam em chaves iguais.
+    """
+    if fields is None:
+        return None
+
+    if not isinstance(fields, dict):
+        return frozenset(_ensure_set(fields))
+
+    root = fields.get("root", set())
+    children = []
+    for key, value in fields.items():
+        if key == "root":
+            continue
+        children.append((key, freeze_fields_tree(value)))
+
+    children.sort(key=lambda item: item[0])
+    return (frozenset(root), tuple(children))
 
 
 def _ensure_set(value: Any) -> Set[str]:
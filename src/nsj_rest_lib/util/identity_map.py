@@ -0,0 +1,99 @@
+import contextvars
+import copy
+import typing as ty
+
+from nsj_rest_lib.util.cache_util import MISS, freeze_cache_value
+
+
+class IdentityMap:
+    """
+    Mapa de identidade do escopo de uma requisição: guarda os registros já carregados
+    pelos DAOs (por entidade, chave e conjunto de colunas), evitando que o mesmo
+    registro seja buscado várias vezes no banco durante a mesma requisição.
+
+    Os valores são guardados e devolvidos como cópias (rasas), de modo que alterações
+    feitas pelo código chamador não afetem as leituras seguintes.
+
+    Qualquer gravação feita pelos DAOs (no mesmo escopo) limpa o mapa inteiro, pois
+    uma gravação pode afetar outras tabelas (triggers, extensões parciais, conjuntos
+    etc.).
+    """
+
+    def __init__(self):
+        self._items: ty.Dict[ty.Hashable, ty.Any] = {}
+
+    def get(self, key: ty.Hashable, default: ty.Any = MISS) -> ty.Any:
+        value = self._items.get(key, MISS)
+        if value is MISS:
+            return default
+
+        return _copy_loaded(value)
+
+    def set(self, key: ty.Hashable, value: ty.Any) -> None:
+        self._items[key] = _copy_loaded(value)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_current_identity_map: contextvars.ContextVar[ty.Optional[IdentityMap]] = (
+    contextvars.ContextVar("nsj_rest_lib_identity_map", default=None)
+)
+
+
+def open_identity_map() -> ty.Tuple[IdentityMap, contextvars.Token]:
+    """
+    Abre um novo mapa de identidade para o contexto corrente (isto é, para a
+    requisição), retornando o mapa e o token para o seu fechamento.
+    """
+    identity_map = IdentityMap()
+    token = _current_identity_map.set(identity_map)
+    return identity_map, token
+
+
+def close_identity_map(token: contextvars.Token) -> None:
+    """
+    Fecha o mapa de identidade aberto pelo "open_identity_map" (restaurando o mapa
+    anterior do contexto, se houver).
+    """
+    _current_identity_map.reset(token)
+
+
+def current_identity_map() -> ty.Optional[IdentityMap]:
+    """
+    Retorna o mapa de identidade do contexto corrente (ou None, se não houver um
+    aberto).
+    """
+    return _current_identity_map.get()
+
+
+def freeze_filters(filters: ty.Optional[ty.Dict[str, ty.List[ty.Any]]]) -> ty.Hashable:
+    """
+    Converte os filtros de uma consulta (dict de campo -> lista de Filter) numa
+    representação imutável, para uso nas chaves do mapa de identidade.
+
+    Os objetos Filter são representados por todos os seus atributos (pois o repr
+    dos mesmos contém apenas o valor filtrado).
+    """
+    if not filters:
+        return None
+
+    return freeze_cache_value(
+        {
+            field: [
+                vars(filter) if hasattr(filter, "__dict__") else filter
+                for filter in field_filters
+            ]
+            for field, field_filters in filters.items()
+        }
+    )
+
+
+def _copy_loaded(value: ty.Any) -> ty.Any:
+    if isinstance(value, list):
+        return [_copy_loaded(item) for item in value]
+
+    return copy.copy(value)
@@ -0,0 +1,104 @@
+import decimal
+import json
+import typing as ty
+import uuid
+
+from nsj_gcf_utils.json_util import convert_to_dumps
+
+from nsj_rest_lib.settings import REST_LIB_JSON_BACKEND, get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend == "std":
+        return "std"
+
+    if orjson is None:
+        if backend == "orjson":
+            get_logger().warning(
+                "Backend JSON 'orjson' configurado, mas o pacote não está instalado. Usando o módulo json padrão."
+            )
+        return "std"
+
+    return "orjson"
+
+
+# Backend efetivamente em uso ("std" ou "orjson")
+JSON_BACKEND = _resolve_backend(REST_LIB_JSON_BACKEND)
+
+# Separadores usados na serialização (para quem precisa montar o json por partes)
+if JSON_BACKEND == "orjson":
+    JSON_ITEM_SEPARATOR = ","
+    JSON_KEY_SEPARATOR = ":"
+else:
+    JSON_ITEM_SEPARATOR = ", "
+    JSON_KEY_SEPARATOR = ": "
+
+_PRIMITIVE_TYPES = {str, int, float, bool}
+
+
+def to_json_primitive(data: ty.Any) -> ty.Any:
+    """
+    Converte o valor recebido para tipos primitivos do json, com o mesmo resultado
+    do "convert_to_dumps" (UUID e Decimal como string, datas no formato ISO,
+    relativedelta como duração ISO, enumerados pelo valor etc.).
+
+    Os tipos mais comuns (primitivos, dicts, listas, UUID e Decimal) são tratados
+    diretamente, sem as cópias feitas pelo "convert_to_dumps" (que continua sendo
+    usado para os demais tipos).
+    """
+    data_type = type(data)
+
+    if data is None or data_type in _PRIMITIVE_TYPES:
+        return data
+    if data_type is dict:
+        return {key: to_json_primitive(value) for key, value in data.items()}
+    if data_type is list:
+        return [to_json_primitive(value) for value in data]
+    if data_type is uuid.UUID or data_type is decimal.Decimal:
+        return str(data)
+
+    return convert_to_dumps(data)
+
+
+def json_dumps(data: ty.Any) -> str:
+    """
+    Retorna a representação em json (string) do objeto recebido, usando o backend
+    configurado (variável REST_LIB_JSON_BACKEND).
+
+    Com o backend padrão, a saída é idêntica à do "json_dumps" do nsj_gcf_utils.
+    Com o orjson, o conteúdo é o mesmo, mas sem espaços entre os separadores, e
+    sem escapar os caracteres não ASCII.
+    """
+    primitive = to_json_primitive(data)
+
+    if JSON_BACKEND == "orjson":
+        try:
+            return orjson.dumps(primitive, option=orjson.OPT_NON_STR_KEYS).decode(
+                "utf-8"
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            # Valores não suportados pelo orjson (ex.: inteiros maiores que 64 bits)
+            pass
+
+    return json.dumps(primitive, ensure_ascii=True)
+
+
+def json_loads(data: ty.Union[str, bytes]) -> ty.Any:
+    """
+    Interpreta o json recebido, usando o backend configurado.
+    """
+    if JSON_BACKEND == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Conteúdos aceitos apenas pelo módulo padrão (ex.: NaN), ou inválidos
+            # (caso em que o erro padrão é lançado)
+            pass
+
+    return json.loads(data)
+
@@ -0,0 +1,22 @@
+import typing as ty
+
+# Exige o Flask 2.2 ou superior (importado pelo settings apenas quando um backend
+# JSON diferente do padrão é configurado)
+from flask.json.provider import DefaultJSONProvider
+
+
+class JSONBackendProvider(DefaultJSONProvider):
+    """
+    Provider de JSON do Flask que usa o backend configurado para interpretar os
+    corpos das requisições (request.json), mantendo a serialização padrão do Flask.
+    """
+
+    def loads(self, s: ty.Union[str, bytes], **kwargs: ty.Any) -> ty.Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+
+        # Importado aqui, pois o json_backend depende do settings (que importa este
+        # módulo durante a sua inicialização)
+        from nsj_rest_lib.util.json_backend import json_loads
+
+        return json_loads(s)
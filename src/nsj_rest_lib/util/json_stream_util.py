@@ -0,0 +1,72 @@
+import typing as ty
+
+from nsj_rest_lib.util.json_backend import (
+    JSON_ITEM_SEPARATOR,
+    JSON_KEY_SEPARATOR,
+    json_dumps,
+)
+
+# Tamanho aproximado (em bytes) de cada bloco enviado na resposta em streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_json_page(
+    next_url: ty.Optional[str],
+    items: ty.Iterable[ty.Any],
+    convert: ty.Callable[[ty.Any], ty.Any],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> ty.Iterator[bytes]:
+    """
+    Gera, de modo incremental, o json de uma página de listagem (no mesmo formato
+    do "page_body", isto é: {"next": ..., "result": [...]}).
+
+    Cada item é convertido (por meio da função "convert") e codificado apenas no
+    momento em que é escrito, de modo que a página completa nunca é mantida em
+    memória como dicts, nem como string. O conteúdo gerado é idêntico ao do
+    "json_dumps" (do backend configurado) aplicado sobre a página inteira.
+    """
+
+    return stream_encoded_json_page(
+        next_url,
+        (json_dumps(convert(item)) for item in items),
+        chunk_size,
+    )
+
+
+def stream_encoded_json_page(
+    next_url: ty.Optional[str],
+    encoded_items: ty.Iterable[str],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> ty.Iterator[bytes]:
+    """
+    Gera, de modo incremental, o json de uma página de listagem, a partir dos itens
+    já codificados em json (por exemplo, montados pelo próprio banco de dados).
+    """
+
+    buffer: ty.List[str] = [
+        '{"next"',
+        JSON_KEY_SEPARATOR,
+        json_dumps(next_url),
+        JSON_ITEM_SEPARATOR,
+        '"result"',
+        JSON_KEY_SEPARATOR,
+        "[",
+    ]
+    buffer_size = 0
+    first = True
+
+    for encoded in encoded_items:
+        if not first:
+            buffer.append(JSON_ITEM_SEPARATOR)
+        first = False
+
+        buffer.append(encoded)
+        buffer_size += len(encoded)
+
+        if buffer_size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            buffer_size = 0
+
+    buffer.append("]}")
+    yield "".join(buffer).encode("utf-8")
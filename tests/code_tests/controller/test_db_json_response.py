@@ -0,0 +1,218 @@
+import datetime
+import decimal
+import sys
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.controller.get_route import GetRoute
+from nsj_rest_lib.controller.list_route import ListRoute
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.dao.dao_base_util import JSON_KEY_COLUMN, JSON_ROW_COLUMN
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.settings import application
+
+
+class FakeInjectorFactory:
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@Entity(table_name="teste.produto", pk_field="id", default_order_fields=["id"])
+class ProdutoJsonEntity(EntityBase):
+    id: uuid.UUID = None
+    codigo_produto: str = None
+    descricao: str = None
+
+
+@DTO()
+class ProdutoJsonDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    codigo: str = DTOField(entity_field="codigo_produto", resume=True)
+    descricao: str = DTOField()
+
+
+@DTO()
+class ProdutoStripDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    codigo: str = DTOField(entity_field="codigo_produto", resume=True, strip=True)
+
+
+ID_1 = uuid.UUID(int=1)
+ID_2 = uuid.UUID(int=2)
+
+
+class DBAdapterJson:
+    def __init__(self):
+        self.sqls = []
+        self.model_calls = 0
+
+    def execute_query(self, sql: str, **kwargs) -> list:
+        self.sqls.append(sql)
+        if JSON_ROW_COLUMN in sql:
+            rows = [
+                {
+                    "id": ID_1,
+                    "codigo_produto": "A1",
+                    JSON_KEY_COLUMN: ID_1,
+                    JSON_ROW_COLUMN: f'{{"id" : "{ID_1}", "codigo" : "A1"}}',
+                },
+                {
+                    JSON_KEY_COLUMN: ID_2,
+                    JSON_ROW_COLUMN: f'{{"id" : "{ID_2}", "codigo" : "B2"}}',
+                },
+            ]
+            return rows[0:1] if ":id" in sql else rows
+
+        return [
+            {"id": ID_1, "codigo_produto": "A1 "},
+            {"id": ID_2, "codigo_produto": "B2 "},
+        ]
+
+    def execute_query_to_model(self, sql: str, model_class, **kwargs) -> list:
+        self.model_calls += 1
+        return []
+
+
+def _build_route(route_class, dto_class, db, url):
+    class RouteUnderTest(route_class):
+        def _get_service(self, factory):
+            return ServiceBase(
+                injector_factory=None,
+                dao=DAOBase(db=db, entity_class=ProdutoJsonEntity),
+                dto_class=dto_class,
+                entity_class=ProdutoJsonEntity,
+                dto_post_response_class=dto_class,
+            )
+
+    return RouteUnderTest(
+        url=url,
+        http_method="GET",
+        dto_class=dto_class,
+        entity_class=ProdutoJsonEntity,
+        injector_factory=FakeInjectorFactory,
+        db_json_response=True,
+    )
+
+
+def test_list_builds_json_in_database():
+    db = DBAdapterJson()
+    route = _build_route(ListRoute, ProdutoJsonDTO, db, "/produtos")
+
+    with application.test_request_context("/produtos?limit=2", method="GET"):
+        body, status, _ = route.handle_request()
+        data = b"".join(body).decode("utf-8")
+
+    assert status == 200
+    assert "json_build_object('id', t0.id, 'codigo', t0.codigo_produto)" in db.sqls[0]
+    assert data == (
+        '{"next": "http://localhost/produtos?&after='
+        + str(ID_2)
+        + '&limit=2", "result": ['
+        + f'{{"id" : "{ID_1}", "codigo" : "A1"}}, '
+        + f'{{"id" : "{ID_2}", "codigo" : "B2"}}]}}'
+    )
+
+
+def test_list_falls_back_when_fields_need_python_conversion():
+    db = DBAdapterJson()
+    route = _build_route(ListRoute, ProdutoStripDTO, db, "/produtos")
+
+    with application.test_request_context("/produtos?limit=5", method="GET"):
+        body, status, _ = route.handle_request()
+
+    assert status == 200
+    assert JSON_ROW_COLUMN not in db.sqls[0]
+    assert '"codigo": "A1"' in body
+
+
+def test_list_falls_back_with_expanded_fields():
+    db = DBAdapterJson()
+    route = _build_route(ListRoute, ProdutoJsonDTO, db, "/produtos")
+
+    with application.test_request_context(
+        "/produtos?fields=descricao,inexistente", method="GET"
+    ):
+        route.handle_request()
+
+    assert all(JSON_ROW_COLUMN not in sql for sql in db.sqls)
+
+
+def test_get_returns_json_from_database():
+    db = DBAdapterJson()
+    route = _build_route(GetRoute, ProdutoJsonDTO, db, "/produtos/<id>")
+
+    with application.test_request_context("/produtos/x?fields=descricao"):
+        body, status, headers = route.handle_request(str(ID_1))
+
+    expected_dto = ProdutoJsonDTO(id=ID_1, codigo="A1")
+    expected_headers = {}
+    GetRoute.add_etag_header_if_needed(expected_headers, expected_dto)
+
+    assert status == 200
+    assert body == f'{{"id" : "{ID_1}", "codigo" : "A1"}}'
+    assert headers["ETag"] == expected_headers["ETag"]
+    assert "'descricao', t0.descricao" in db.sqls[0]
+    assert "t0.id = :id" in db.sqls[0]
+
+
+def test_wide_dtos_use_row_to_json():
+    dao = DAOBase(db=None, entity_class=ProdutoJsonEntity)
+    json_fields = [(f"campo_{i}", f"coluna_{i}") for i in range(60)]
+
+    sql = dao._sql_json_fields(json_fields, "id")
+
+    assert "json_build_object" not in sql
+    assert 't0.coluna_59 as "campo_59"' in sql
+
+
+@Entity(table_name="teste.preco", pk_field="id", default_order_fields=["id"])
+class PrecoJsonEntity(EntityBase):
+    id: uuid.UUID = None
+    valor: decimal.Decimal = None
+    atualizado_em: datetime.datetime = None
+    ativo: int = None
+
+
+@DTO()
+class PrecoJsonDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    valor: decimal.Decimal = DTOField()
+    atualizado_em: datetime.datetime = DTOField()
+    ativo: bool = DTOField()
+
+
+def _resolve_preco_json_fields(fields):
+    service = ServiceBase(
+        injector_factory=None,
+        dao=DAOBase(db=None, entity_class=PrecoJsonEntity),
+        dto_class=PrecoJsonDTO,
+        entity_class=PrecoJsonEntity,
+    )
+    return service._resolve_json_fields("list", {"root": fields}, None)
+
+
+def test_json_in_database_only_for_natively_serialized_types():
+    assert _resolve_preco_json_fields({"id"}) == [("id", "id")]
+
+    # Decimal (string no fluxo padrão), datas (sem microssegundos e fuso) e bool
+    # sobre coluna inteira (0/1 no PostgreSQL) exigem o fluxo padrão
+    assert _resolve_preco_json_fields({"id", "valor"}) is None
+    assert _resolve_preco_json_fields({"id", "atualizado_em"}) is None
+    assert _resolve_preco_json_fields({"id", "ativo"}) is None
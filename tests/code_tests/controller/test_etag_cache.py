@@ -0,0 +1,185 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.controller.get_route import GetRoute
+from nsj_rest_lib.controller.list_route import ListRoute
+from nsj_rest_lib.controller.route_base import RouteBase
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.entity_field import EntityField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.settings import application
+from nsj_rest_lib.util.cache_util import LRUTTLCache, invalidate_entity_caches
+
+
+class FakeInjectorFactory:
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@DTO(etag_fields={"versao"})
+class EtagCacheDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    tenant: int = DTOField(partition_data=True)
+    versao: str = DTOField()
+    nome: str = DTOField()
+
+
+@Entity(table_name="public.etag_cache", pk_field="id", default_order_fields=["id"])
+class EtagCacheEntity(EntityBase):
+    id: int = EntityField()
+    tenant: int = EntityField()
+    versao: str = EntityField()
+    nome: str = EntityField()
+
+
+class RecordingService:
+    def __init__(self, dtos):
+        self.dtos = dtos
+        self.calls = []
+
+    def get(self, id, partition_fields, fields, **kwargs):
+        self.calls.append(("get", fields))
+        return self.dtos[0]
+
+    def list(self, after, limit, fields, order_fields, filters, **kwargs):
+        self.calls.append(("list", fields))
+        return self.dtos
+
+
+def _build_dto(id=1, versao="v1"):
+    return EtagCacheDTO(id=id, tenant=10, versao=versao, nome="nome")
+
+
+def _build_route(route_class, service, url):
+    class RouteUnderTest(route_class):
+        def _get_service(self, factory):
+            return service
+
+    return RouteUnderTest(
+        url=url,
+        http_method="GET",
+        dto_class=EtagCacheDTO,
+        entity_class=EtagCacheEntity,
+        injector_factory=FakeInjectorFactory,
+    )
+
+
+def _get(service, etag=None, id="1"):
+    route = _build_route(GetRoute, service, "/etags/<id>")
+    headers = {"If-None-Match": etag} if etag is not None else {}
+    with application.test_request_context(
+        f"/etags/{id}?tenant=10&fields=versao", method="GET", headers=headers
+    ):
+        return route.handle_request(id=id)
+
+
+def _etag(dto):
+    return RouteBase.quote_and_escape_string(RouteBase.get_etag_value(dto))
+
+
+@pytest.fixture(autouse=True)
+def etag_cache(monkeypatch):
+    cache = LRUTTLCache(100, 60)
+    monkeypatch.setattr(RouteBase, "etag_cache", cache)
+    return cache
+
+
+def test_get_fills_cache_and_revalidation_skips_service():
+    dto = _build_dto()
+    service = RecordingService([dto])
+
+    _, status, _ = _get(service)
+    assert status == 200
+    assert len(service.calls) == 1
+
+    body, status, headers = _get(service, _etag(dto))
+
+    assert status == 304
+    assert body == ""
+    assert headers["ETag"] == "W/" + _etag(dto)
+    assert len(service.calls) == 1
+
+
+def test_cached_mismatch_skips_shallow_fetch():
+    dto = _build_dto()
+    service = RecordingService([dto])
+    _get(service)
+
+    _, status, headers = _get(service, '"outro"')
+
+    assert status == 200
+    assert headers["ETag"] == "W/" + _etag(dto)
+    # Apenas o GET inicial e o GET completo (sem a busca rasa)
+    assert len(service.calls) == 2
+
+
+def test_list_fills_cache():
+    dtos = [_build_dto(1), _build_dto(2, "v2")]
+    service = RecordingService(dtos)
+
+    route = _build_route(ListRoute, service, "/etags")
+    with application.test_request_context(
+        "/etags?tenant=10&fields=versao", method="GET"
+    ):
+        _, status, _ = route.handle_request()
+    assert status == 200
+
+    _, status, _ = _get(service, _etag(dtos[1]), id="2")
+
+    assert status == 304
+    assert [call[0] for call in service.calls] == ["list"]
+
+
+def test_list_without_etag_fields_does_not_fill_cache(etag_cache):
+    service = RecordingService([_build_dto()])
+
+    route = _build_route(ListRoute, service, "/etags")
+    with application.test_request_context(
+        "/etags?tenant=10&fields=nome", method="GET"
+    ):
+        route.handle_request()
+
+    assert len(etag_cache) == 0
+
+
+def test_writes_invalidate_cache():
+    dto = _build_dto()
+    service = RecordingService([dto])
+    _get(service)
+
+    invalidate_entity_caches("public.etag_cache", (("tenant", "10"),))
+    service.dtos = [_build_dto(versao="v2")]
+
+    _, status, _ = _get(service, _etag(dto))
+
+    assert status == 200
+    assert len(service.calls) == 2
+
+
+def test_cache_disabled_fetches_from_service(monkeypatch):
+    monkeypatch.setattr(RouteBase, "etag_cache", None)
+    dto = _build_dto()
+    service = RecordingService([dto])
+    _get(service)
+
+    _, status, _ = _get(service, _etag(dto))
+
+    assert status == 304
+    assert len(service.calls) == 2
@@ -78,7 +78,7 @@ class SampleEntity(EntityBase):
     name: str = EntityField()
 
 
-def build_route(service):
+def build_route(service, **kwargs):
     class GetRouteUnderTest(GetRoute):
         def _get_service(self, factory):
             return service
@@ -89,6 +89,7 @@ def build_route(service):
         dto_class=SampleDTO,
         entity_class=SampleEntity,
         injector_factory=FakeInjectorFactory,
+        **kwargs,
     )
 
 
@@ -143,11 +144,30 @@ def test_get_route_if_none_match_returns_304_and_skips_full_fetch():
     assert service.calls[0]["fields"]["root"] == {"version", "id"}
 
 
-def test_get_route_if_none_match_mismatch_fetches_full_data_and_sets_etag():
+def test_get_route_if_none_match_mismatch_fetches_full_data_once():
+    dto_full = build_dto("v2", name="full")
+    service = RecordingService([dto_full])
+    route = build_route(service)
+
+    with application.test_request_context(
+        "/samples/1",
+        method="GET",
+        headers={"If-None-Match": '"v0"'},
+    ):
+        body, status, headers = route.handle_request(id="1")
+
+    assert status == 200
+    assert headers.get("ETag") == build_etag_header(dto_full)
+    assert len(service.calls) == 1
+    assert "version" in service.calls[0]["fields"]["root"]
+    assert json.loads(body)["id"] == 1
+
+
+def test_get_route_etag_shallow_check_mismatch_fetches_full_data():
     dto_initial = build_dto("v1")
     dto_full = build_dto("v2", name="full")
     service = RecordingService([dto_initial, dto_full])
-    route = build_route(service)
+    route = build_route(service, etag_shallow_check=True)
 
     with application.test_request_context(
         "/samples/1",
@@ -183,3 +203,25 @@ def test_get_route_if_none_match_multiple_values_returns_304():
     assert body == ""
     assert headers.get("ETag") == build_etag_header(dto)
     assert len(service.calls) == 1
+
+
+def test_get_route_etag_shallow_check_match_skips_full_fetch():
+    dto = build_dto("v1")
+    service = RecordingService([dto])
+    route = build_route(service, etag_shallow_check=True)
+
+    with application.test_request_context(
+        "/samples/1",
+        method="GET",
+        headers={
+            "If-None-Match": RouteBase.quote_and_escape_string(
+                build_etag_value(dto)
+            )
+        },
+    ):
+        body, status, headers = route.handle_request(id="1")
+
+    assert status == 304
+    assert len(service.calls) == 1
+    assert service.calls[0]["fields"]["root"] == {"version", "id"}
+    assert service.calls[0]["expands"] == {"root": set()}
@@ -0,0 +1,142 @@
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.controller.list_route import ListRoute
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.entity_field import EntityField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.settings import application
+
+
+class FakeInjectorFactory:
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@DTO(etag_fields={"versao"})
+class ListEtagDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    versao: str = DTOField()
+    nome: str = DTOField()
+
+
+@Entity(table_name="public.list_etag", pk_field="id", default_order_fields=["id"])
+class ListEtagEntity(EntityBase):
+    id: int = EntityField()
+    versao: str = EntityField()
+    nome: str = EntityField()
+
+
+class ListService:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def list(self, after, limit, fields, order_fields, filters, **kwargs):
+        self.calls.append(fields)
+        return self.payload
+
+
+def _build_payload(versao="v1"):
+    return [
+        ListEtagDTO(id=i, versao=f"{versao}-{i}", nome=f"nome {i}")
+        for i in range(1, 4)
+    ]
+
+
+def _request(service, url="/etags", etag=None, stream_response=False, **kwargs):
+    class ListRouteUnderTest(ListRoute):
+        def _get_service(self, factory):
+            return service
+
+    route = ListRouteUnderTest(
+        url="/etags",
+        http_method="GET",
+        dto_class=ListEtagDTO,
+        entity_class=ListEtagEntity,
+        injector_factory=FakeInjectorFactory,
+        stream_response=stream_response,
+        **kwargs,
+    )
+
+    headers = {"If-None-Match": etag} if etag is not None else {}
+    with application.test_request_context(url, method="GET", headers=headers):
+        return route.handle_request()
+
+
+def _etag_value(header):
+    return header[len("W/"):]
+
+
+def test_etag_response_is_opt_in():
+    _, status, headers = _request(ListService(_build_payload()))
+
+    assert status == 200
+    assert "ETag" not in headers
+
+
+def test_page_etag_and_not_modified():
+    service = ListService(_build_payload())
+
+    body, status, headers = _request(service, etag_response=True)
+    assert status == 200
+    assert headers["ETag"].startswith('W/"')
+    # Os campos do ETag são recuperados, mas não entram na resposta
+    assert "versao" in service.calls[0]["root"]
+    assert "versao" not in json.loads(body)["result"][0]
+
+    body, status, not_modified_headers = _request(
+        service, etag=_etag_value(headers["ETag"]), etag_response=True
+    )
+
+    assert status == 304
+    assert body == ""
+    assert not_modified_headers["ETag"] == headers["ETag"]
+
+
+def test_page_etag_changes_with_items_and_query():
+    _, _, headers = _request(ListService(_build_payload()), etag_response=True)
+
+    _, status, changed_headers = _request(
+        ListService(_build_payload("v2")),
+        etag=_etag_value(headers["ETag"]),
+        etag_response=True,
+    )
+    assert status == 200
+    assert changed_headers["ETag"] != headers["ETag"]
+
+    _, status, query_headers = _request(
+        ListService(_build_payload()),
+        url="/etags?limit=2",
+        etag=_etag_value(headers["ETag"]),
+        etag_response=True,
+    )
+    assert status == 200
+    assert query_headers["ETag"] != headers["ETag"]
+
+
+def test_stream_response_returns_page_etag():
+    _, _, headers = _request(ListService(_build_payload()), etag_response=True)
+
+    _, status, stream_headers = _request(
+        ListService(_build_payload()), etag_response=True, stream_response=True
+    )
+
+    assert status == 200
+    assert stream_headers["ETag"] == headers["ETag"]
@@ -0,0 +1,116 @@
+import datetime
+import sys
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.controller.list_route import ListRoute
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.entity_field import EntityField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.settings import application
+from nsj_rest_lib.util.json_stream_util import stream_json_page
+
+
+class FakeInjectorFactory:
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@DTO()
+class StreamDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    nome: str = DTOField(resume=True)
+    criado_em: datetime.datetime = DTOField(resume=True)
+
+
+@Entity(table_name="public.stream", pk_field="id", default_order_fields=["id"])
+class StreamEntity(EntityBase):
+    id: uuid.UUID = EntityField()
+    nome: str = EntityField()
+    criado_em: datetime.datetime = EntityField()
+
+
+class ListService:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def list(self, after, limit, fields, order_fields, filters, **kwargs):
+        return self.payload
+
+
+def _build_route(payload, stream_response):
+    service = ListService(payload)
+
+    class ListRouteUnderTest(ListRoute):
+        def _get_service(self, factory):
+            return service
+
+    return ListRouteUnderTest(
+        url="/streams",
+        http_method="GET",
+        dto_class=StreamDTO,
+        entity_class=StreamEntity,
+        injector_factory=FakeInjectorFactory,
+        stream_response=stream_response,
+    )
+
+
+def _build_payload(quantidade):
+    return [
+        StreamDTO(
+            id=uuid.UUID(int=i + 1),
+            nome=f"Nome ção {i}",
+            criado_em=datetime.datetime(2024, 1, 1, 10, 0, i),
+        )
+        for i in range(quantidade)
+    ]
+
+
+def _request(route, url):
+    with application.test_request_context(url, method="GET"):
+        body, status, headers = route.handle_request()
+        response = application.make_response((body, status, headers))
+        return body, response.status_code, response.get_data()
+
+
+def test_stream_gera_o_mesmo_json_da_resposta_completa():
+    payload = _build_payload(3)
+
+    expected, _, _ = _request(_build_route(payload, False), "/streams?limit=2")
+    body, status, data = _request(_build_route(payload, True), "/streams?limit=2")
+
+    assert status == 200
+    assert not isinstance(body, str)
+    assert data == expected.encode("utf-8")
+
+
+def test_stream_pagina_vazia():
+    expected, _, _ = _request(_build_route([], False), "/streams")
+    _, status, data = _request(_build_route([], True), "/streams")
+
+    assert status == 200
+    assert data == expected.encode("utf-8")
+
+
+def test_stream_json_page_agrupa_em_blocos():
+    chunks = list(
+        stream_json_page(None, range(100), lambda item: {"v": item}, chunk_size=50)
+    )
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).startswith(b'{"next": null, "result": [{"v": 0}, ')
@@ -0,0 +1,119 @@
+from pathlib import Path
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.dao.dao_base import DAOBase  # type: ignore
+from nsj_rest_lib.decorator.entity import Entity  # type: ignore
+from nsj_rest_lib.descriptor.filter_operator import FilterOperator  # type: ignore
+from nsj_rest_lib.entity.entity_base import EntityBase  # type: ignore
+from nsj_rest_lib.entity.filter import Filter  # type: ignore
+from nsj_rest_lib.util.identity_map import (  # type: ignore
+    close_identity_map,
+    current_identity_map,
+    open_identity_map,
+)
+
+
+@Entity(table_name="teste.cliente", pk_field="id", default_order_fields=["id"])
+class ClienteEntity(EntityBase):  # pylint: disable=too-few-public-methods
+    id: uuid.UUID = None
+    nome: str = None
+    tenant: int = None
+
+
+class DBAdapterCounter:
+    def __init__(self, row):
+        self.row = row
+        self.queries = 0
+
+    def execute_query(self, sql: str, **kwargs) -> list:
+        self.queries += 1
+        return [dict(self.row)]
+
+    def execute_query_to_model(self, sql: str, model_class, **kwargs) -> list:
+        self.queries += 1
+        model = model_class()
+        for column, value in self.row.items():
+            setattr(model, column, value)
+        return [model]
+
+    def execute(self, sql: str, **kwargs):
+        return 1, []
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def identity_map():
+    identity_map, token = open_identity_map()
+    yield identity_map
+    close_identity_map(token)
+
+
+def _build_dao():
+    id = uuid.uuid4()
+    db = DBAdapterCounter({"id": id, "nome": "Cliente", "tenant": 1})
+    return DAOBase(db=db, entity_class=ClienteEntity), db, id
+
+
+def _filters(value):
+    return {"tenant": [Filter(FilterOperator.EQUALS, value)]}
+
+
+def test_without_identity_map_every_get_queries():
+    dao, db, id = _build_dao()
+
+    dao.get("id", id, ["id", "nome"])
+    dao.get("id", id, ["id", "nome"])
+
+    assert current_identity_map() is None
+    assert db.queries == 2
+
+
+def test_repeated_get_is_deduplicated(identity_map):
+    dao, db, id = _build_dao()
+
+    first = dao.get("id", id, ["id", "nome"], _filters(1))
+    second = dao.get("id", str(id), ["nome", "id"], _filters(1))
+
+    assert db.queries == 1
+    assert second.nome == "Cliente"
+    # As leituras recebem cópias (alterações não afetam o mapa)
+    assert second is not first
+    second.nome = "Alterado"
+    assert dao.get("id", id, ["id", "nome"], _filters(1)).nome == "Cliente"
+
+
+def test_key_considers_columns_filters_and_shape(identity_map):
+    dao, db, id = _build_dao()
+
+    dao.get("id", id, ["id", "nome"], _filters(1))
+    dao.get("id", id, ["id"], _filters(1))
+    dao.get("id", id, ["id", "nome"], _filters(2))
+    dao.get("id", id, ["id", "nome"], {"tenant": [Filter(FilterOperator.DIFFERENT, 1)]})
+    dao.get("id", id, ["id", "nome"], _filters(1), as_rows=True)
+
+    assert db.queries == 5
+
+
+def test_writes_and_rollback_invalidate_identity_map(identity_map):
+    dao, db, id = _build_dao()
+
+    dao.get("id", id, ["id", "nome"])
+    dao.delete({"id": [Filter(FilterOperator.EQUALS, id)]})
+    dao.get("id", id, ["id", "nome"])
+    assert db.queries == 2
+
+    dao.rollback()
+    dao.get("id", id, ["id", "nome"])
+    assert db.queries == 3
@@ -0,0 +1,136 @@
+from pathlib import Path
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.dao.dao_base import DAOBase  # type: ignore
+from nsj_rest_lib.decorator.dto import DTO  # type: ignore
+from nsj_rest_lib.decorator.entity import Entity  # type: ignore
+from nsj_rest_lib.descriptor.dto_field import DTOField  # type: ignore
+from nsj_rest_lib.dto.dto_base import DTOBase  # type: ignore
+from nsj_rest_lib.entity.entity_base import EntityBase  # type: ignore
+from nsj_rest_lib.service.service_base import ServiceBase  # type: ignore
+
+
+@Entity(table_name="teste.produto", pk_field="id", default_order_fields=["id"])
+class ProdutoEntity(EntityBase):  # pylint: disable=too-few-public-methods
+    id: uuid.UUID = None
+    codigo_produto: str = None
+    descricao: str = None
+    tenant: int = None
+
+
+@DTO()
+class ProdutoDTO(DTOBase):  # pylint: disable=too-few-public-methods
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    codigo: str = DTOField(entity_field="codigo_produto", resume=True)
+    descricao: str = DTOField()
+    tenant: int = DTOField(partition_data=True)
+
+
+class DBAdapterRows:  # pylint: disable=too-few-public-methods
+    def __init__(self, rows):
+        self.rows = rows
+        self.model_calls = 0
+
+    def execute_query(self, sql: str, **kwargs) -> list:
+        return [dict(row) for row in self.rows]
+
+    def execute_query_to_model(self, sql: str, model_class, **kwargs) -> list:
+        self.model_calls += 1
+        result = []
+        for row in self.rows:
+            model = model_class()
+            for column, value in row.items():
+                if hasattr(model, column):
+                    setattr(model, column, value)
+            result.append(model)
+        return result
+
+
+class CustomListDAO(DAOBase):
+    def list(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        assert "as_rows" not in kwargs
+        return super().list(*args, **kwargs)
+
+
+def _build_service(db, dao_class=DAOBase):
+    return ServiceBase(
+        injector_factory=None,
+        dao=dao_class(db=db, entity_class=ProdutoEntity),
+        dto_class=ProdutoDTO,
+        entity_class=ProdutoEntity,
+        dto_post_response_class=ProdutoDTO,
+    )
+
+
+def test_execute_query_to_rows_equivale_ao_model():
+    rows = [
+        {"id": uuid.uuid4(), "codigo_produto": "A1", "coluna_extra": 1},
+        {"id": uuid.uuid4(), "codigo_produto": "B2", "coluna_extra": 2},
+    ]
+    db = DBAdapterRows(rows)
+    dao = DAOBase(db=db, entity_class=ProdutoEntity)
+
+    # pylint: disable-next=protected-access
+    result = dao._execute_query_to_rows("select 1")
+    entities = db.execute_query_to_model("select 1", ProdutoEntity)
+
+    assert len(result) == 2
+    for row, entity in zip(result, entities):
+        expected = {k: v for k, v in entity.__dict__.items() if k != "_sql_fields"}
+        assert row == expected
+        assert "coluna_extra" not in row
+        assert row["descricao"] is None
+
+
+def test_list_monta_dtos_direto_dos_registros():
+    produto_id = uuid.uuid4()
+    db = DBAdapterRows(
+        [{"id": produto_id, "codigo_produto": "A1", "descricao": "X", "tenant": 7}]
+    )
+    service = _build_service(db)
+
+    dtos = service.list(
+        None,
+        None,
+        {"root": {"id", "codigo", "descricao"}},
+        None,
+        {},
+        return_hidden_fields={"tenant"},
+    )
+
+    assert db.model_calls == 0
+    assert len(dtos) == 1
+    assert dtos[0].id == produto_id
+    assert dtos[0].codigo == "A1"
+    assert dtos[0].descricao == "X"
+    assert dtos[0].return_hidden_fields == {"tenant": 7}
+
+
+def test_get_monta_dto_direto_do_registro():
+    produto_id = uuid.uuid4()
+    db = DBAdapterRows([{"id": produto_id, "codigo_produto": "A1"}])
+    service = _build_service(db)
+
+    dto = service.get(str(produto_id), {}, {"root": {"id", "codigo"}})
+
+    assert db.model_calls == 0
+    assert dto.id == produto_id
+    assert dto.codigo == "A1"
+
+
+def test_list_com_dao_customizado_usa_entities():
+    db = DBAdapterRows([{"id": uuid.uuid4(), "codigo_produto": "A1"}])
+    service = _build_service(db, CustomListDAO)
+
+    dtos = service.list(None, None, {"root": {"id", "codigo"}}, None, {})
+
+    assert db.model_calls == 1
+    assert dtos[0].codigo == "A1"
@@ -119,3 +119,65 @@ class TestAutoIncrement:
         dto_response = service.insert(dto)
         assert dto_response.num == 11
         assert dto_response.num2 is None
+
+
+class DAOReserveTest(DAOTest):
+    def __init__(self, da, entity_class):
+        super().__init__(da, entity_class)
+        self.reserve_calls = []
+
+    def reserve_vals(
+        self,
+        sequence_base_name: str,
+        group_fields: List[str],
+        quantity: int,
+        start_value: int = 1,
+    ):
+        self.reserve_calls.append((sequence_base_name, group_fields, quantity))
+        return list(range(100, 100 + quantity))
+
+
+class DBReserveTest:
+    def __init__(self, current_value):
+        self.current_value = current_value
+        self.calls = []
+
+    def in_transaction(self):
+        return False
+
+    def execute_query_first_result(self, sql, **kwargs):
+        self.calls.append((sql, kwargs))
+        return {"current_value": self.current_value}
+
+
+class TestAutoIncrementBlock:
+    def test_insert_list_reserves_block(self):
+        dao = DAOReserveTest(da=None, entity_class=EntityTeste)
+        service = ServiceBase(
+            injector_factory=None,
+            dao=dao,
+            dto_class=DTOTeste,
+            entity_class=EntityTeste,
+            dto_post_response_class=DTOTeste,
+        )
+        dtos = [DTOTeste(), DTOTeste(), DTOTeste(num=7)]
+
+        responses = service.insert_list(dtos)
+
+        assert [dto.num for dto in responses] == [100, 101, 7]
+        assert len(dao.reserve_calls) == 1
+        assert dao.reserve_calls[0][2] == 2
+        assert dao.count == 10
+
+    def test_reserve_vals_returns_range(self):
+        db = DBReserveTest(current_value=15)
+        dao = DAOBase(db=db, entity_class=EntityTeste)
+
+        values = dao.reserve_vals("SEQ", ["a", "b"], 5, start_value=1)
+
+        assert values == [11, 12, 13, 14, 15]
+        sql, kwargs = db.calls[0]
+        assert "current_value + :quantity" in sql
+        assert kwargs["sequence_name"] == "SEQ_a_b"
+        assert kwargs["quantity"] == 5
+        assert kwargs["initial_value"] == 5
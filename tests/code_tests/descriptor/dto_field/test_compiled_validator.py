@@ -0,0 +1,143 @@
+from pathlib import Path
+import datetime
+import enum
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+
+
+class SituacaoEnum(enum.Enum):
+    ATIVO = "ativo"
+    INATIVO = "inativo"
+
+
+@DTO()
+class CompiledValidatorDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True, not_null=True)
+    codigo: str = DTOField(not_null=True, strip=True, min=2, max=5)
+    quantidade: int = DTOField(min=1, max=10)
+    valor: Decimal = DTOField()
+    ativo: bool = DTOField()
+    criado_em: datetime.datetime = DTOField()
+    data: datetime.date = DTOField()
+    situacao: SituacaoEnum = DTOField()
+    livre = DTOField()
+
+
+def _generic_validate(field_name, value, generate_default_pk_value=True):
+    """
+    Executa a validação genérica (não compilada) do campo, para comparação.
+    """
+    dto = SimpleNamespace(generate_default_pk_value=generate_default_pk_value)
+    field = CompiledValidatorDTO.fields_map[field_name]
+    return field.validate(field, value, dto)
+
+
+def _compiled_validate(field_name, value, generate_default_pk_value=True):
+    dto = SimpleNamespace(generate_default_pk_value=generate_default_pk_value)
+    field = CompiledValidatorDTO.fields_map[field_name]
+    return field._compiled_validate(value, dto)
+
+
+def test_fields_are_compiled_on_decoration():
+    for field in CompiledValidatorDTO.fields_map.values():
+        assert field._compiled_validate is not None
+
+
+@pytest.mark.parametrize(
+    "field_name,value",
+    [
+        ("id", "6f1c7a4e-0a7b-4c6a-9d5c-1f3b1d2e3f4a"),
+        ("codigo", " abc "),
+        ("quantidade", "7"),
+        ("valor", 10.5),
+        ("ativo", 0),
+        ("ativo", "TRUE"),
+        ("criado_em", "2024-01-02T03:04:05"),
+        ("criado_em", "2024-01-02"),
+        ("criado_em", datetime.date(2024, 1, 2)),
+        ("data", datetime.datetime(2024, 1, 2, 3, 4, 5)),
+        ("situacao", "ATIVO"),
+        ("situacao", SituacaoEnum.INATIVO),
+        ("livre", {"qualquer": "coisa"}),
+        ("valor", None),
+    ],
+)
+def test_compiled_validator_matches_generic(field_name, value):
+    assert _compiled_validate(field_name, value) == _generic_validate(
+        field_name, value
+    )
+
+
+@pytest.mark.parametrize(
+    "field_name,value",
+    [
+        ("id", "nao-e-uuid"),
+        ("id", None),
+        ("codigo", "   "),
+        ("codigo", "a"),
+        ("codigo", "abcdef"),
+        ("quantidade", 0),
+        ("quantidade", 11),
+        ("quantidade", "abc"),
+        ("criado_em", "02/01/2024"),
+        ("situacao", "desconhecido"),
+    ],
+)
+def test_compiled_validator_raises_same_errors(field_name, value):
+    with pytest.raises(ValueError) as generic_error:
+        _generic_validate(field_name, value)
+
+    with pytest.raises(ValueError) as compiled_error:
+        _compiled_validate(field_name, value)
+
+    assert str(compiled_error.value) == str(generic_error.value)
+
+
+def test_compiled_validator_allows_empty_pk_without_default_generation():
+    assert _compiled_validate("id", None, generate_default_pk_value=False) is None
+
+
+def test_set_uses_compiled_validator_and_custom_validator():
+    calls = []
+
+    def custom_validator(dto_field, value):
+        calls.append(value)
+        return value * 2
+
+    @DTO()
+    class CustomValidatorDTO(DTOBase):
+        numero: int = DTOField(validator=custom_validator)
+
+    dto = CustomValidatorDTO(numero="3")
+
+    assert dto.numero == 6
+    assert calls == [3]
+
+
+def test_overridden_validate_keeps_generic_path():
+    class UpperDTOField(DTOField):
+        def validate(self, dto_field, value, instance):
+            return value.upper()
+
+    @DTO()
+    class UpperDTO(DTOBase):
+        nome: str = UpperDTOField()
+
+    assert UpperDTO.fields_map["nome"]._compiled_validate is None
+    assert UpperDTO(nome="abc").nome == "ABC"
@@ -44,6 +44,10 @@ class DBAdapterTeste:
 
         return [entity]
 
+    def execute_query(self, sql: str, **kwargs) -> list:
+        self.last_sql = sql
+        return [{"valor": "oi"}]
+
 
 class TestAutoIncrement:
 
@@ -0,0 +1,126 @@
+from pathlib import Path
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_list_field import DTOListField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import (
+    COMPACT_VALUES,
+    EMPTY_PROVIDED_FIELDS,
+    CompactDTOField,
+    dto_values_dict,
+)
+from nsj_rest_lib.entity.entity_base import EntityBase
+
+
+def _nome_to_entity(value, dto_values):
+    return {"nome": value, "nome_busca": f"{dto_values['codigo']}-{value}".lower()}
+
+
+@DTO(compact_storage=True)
+class ItemCompactDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    valor: int = DTOField(resume=True, min=0)
+
+
+@DTO(compact_storage=True)
+class PedidoCompactDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    codigo: str = DTOField(resume=True, strip=True)
+    nome: str = DTOField(resume=True, convert_to_entity=_nome_to_entity)
+    itens: list = DTOListField(
+        dto_type=ItemCompactDTO,
+        entity_type=EntityBase,
+        related_entity_field="pedido",
+    )
+
+
+@Entity(table_name="pedido", pk_field="id", default_order_fields=["id"])
+class PedidoCompactEntity(EntityBase):
+    id: uuid.UUID = None
+    codigo: str = None
+    nome: str = None
+    nome_busca: str = None
+
+
+PEDIDO_ID = uuid.UUID("7d0b1e9e-4f3c-4c1e-9b55-0c8a36a0d6a1")
+
+
+def test_simple_fields_are_stored_in_compact_list():
+    dto = PedidoCompactDTO(id=str(PEDIDO_ID), codigo=" P1 ", nome="Pedido")
+
+    assert isinstance(PedidoCompactDTO.fields_map["codigo"], CompactDTOField)
+    assert "codigo" not in dto.__dict__
+    assert dto.__dict__[COMPACT_VALUES] == [PEDIDO_ID, "P1", "Pedido"]
+    assert dto.id == PEDIDO_ID
+    assert dto.codigo == "P1"
+
+    dto.codigo = "P2"
+    assert dto.codigo == "P2"
+
+
+def test_compact_fields_keep_validation():
+    with pytest.raises(ValueError):
+        ItemCompactDTO(id=str(uuid.uuid4()), valor=-1)
+
+
+def test_read_path_shares_empty_provided_fields():
+    first = PedidoCompactDTO({"id": PEDIDO_ID, "codigo": "P1"}, escape_validator=True)
+    second = PedidoCompactDTO({"id": PEDIDO_ID, "codigo": "P2"}, escape_validator=True)
+
+    assert first._provided_fields is EMPTY_PROVIDED_FIELDS
+    assert second._provided_fields is EMPTY_PROVIDED_FIELDS
+    assert first.codigo == "P1"
+    assert second.codigo == "P2"
+    assert first.nome is None
+
+
+def test_convert_to_dict_matches_values():
+    dto = PedidoCompactDTO(
+        id=str(PEDIDO_ID),
+        codigo="P1",
+        nome="Pedido",
+        itens=[{"id": str(PEDIDO_ID), "valor": 3}],
+    )
+
+    assert dto.convert_to_dict({"root": {"itens"}, "itens": {"valor"}}) == {
+        "id": PEDIDO_ID,
+        "codigo": "P1",
+        "nome": "Pedido",
+        "itens": [{"id": PEDIDO_ID, "valor": 3}],
+    }
+
+
+def test_convert_to_entity_passes_field_values_to_custom_converters():
+    dto = PedidoCompactDTO(id=str(PEDIDO_ID), codigo="P1", nome="Pedido")
+
+    entity = dto.convert_to_entity(PedidoCompactEntity)
+
+    assert entity.codigo == "P1"
+    assert entity.nome_busca == "p1-pedido"
+
+
+def test_dto_values_dict_and_snapshot():
+    dto = PedidoCompactDTO(id=str(PEDIDO_ID), codigo="P1", nome="Pedido")
+
+    values = dto_values_dict(dto)
+    assert values["codigo"] == "P1"
+    assert COMPACT_VALUES not in values
+
+    snapshot = dto.snapshot()
+    dto.codigo = "P2"
+
+    assert snapshot.codigo == "P1"
+    assert dto.codigo == "P2"
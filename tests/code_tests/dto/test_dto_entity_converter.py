@@ -0,0 +1,149 @@
+from pathlib import Path
+import enum
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_aggregator import DTOAggregator
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EMPTY, EntityBase, SqlFields
+
+
+class SituacaoEnum(enum.Enum):
+    ATIVO = ("A", 1)
+    INATIVO = ("I", 0)
+
+
+def _split_documento(value, dto_values):
+    return {"doc_tipo": value[:2], "doc_numero": value[2:]}
+
+
+@DTO()
+class EnderecoConverterDTO(DTOBase):
+    cidade: str = DTOField()
+    razao: str = DTOField(entity_field="razao_social")
+
+
+@DTO()
+class ClienteConverterDTO(DTOBase):
+    id: int = DTOField(pk=True, auto_increment={"db_managed": True})
+    nome: str = DTOField(entity_field="razao_social")
+    situacao: SituacaoEnum = DTOField()
+    ativo: bool = DTOField()
+    documento: str = DTOField(convert_to_entity=_split_documento)
+    apenas_dto: str = DTOField()
+    endereco: EnderecoConverterDTO = DTOAggregator(EnderecoConverterDTO)
+
+
+@Entity(table_name="cliente", pk_field="id", default_order_fields=["id"])
+class ClienteConverterEntity(EntityBase):
+    id: int = None
+    razao_social: str = None
+    situacao: int = None
+    ativo: int = None
+    documento: str = None
+    doc_tipo: str = None
+    doc_numero: str = None
+    cidade: str = None
+
+
+def _build_dto(**kwargs):
+    values = {
+        "id": None,
+        "nome": "Empresa",
+        "situacao": "a",
+        "ativo": True,
+        "documento": "CNPJ123",
+        "apenas_dto": "x",
+        "endereco": {"cidade": "Rio", "razao": "ignorado"},
+    }
+    values.update(kwargs)
+    return ClienteConverterDTO(**values)
+
+
+def test_convert_to_entity_maps_and_converts_fields():
+    entity = _build_dto().convert_to_entity(ClienteConverterEntity)
+
+    assert entity.id is None
+    assert entity.razao_social == "Empresa"
+    assert entity.situacao == 1
+    assert entity.ativo == 1
+    assert entity.doc_tipo == "CN"
+    assert entity.doc_numero == "PJ123"
+    assert entity.documento is None
+    assert entity.cidade == "Rio"
+    assert not hasattr(entity, "apenas_dto")
+    assert list(entity._sql_fields) == [
+        "id",
+        "razao_social",
+        "situacao",
+        "ativo",
+        "documento",
+        "doc_tipo",
+        "doc_numero",
+        "cidade",
+    ]
+
+
+def test_convert_to_entity_skips_db_managed_auto_increment_on_insert():
+    entity = _build_dto().convert_to_entity(ClienteConverterEntity, is_insert=True)
+
+    assert "id" not in entity._sql_fields
+
+    entity = _build_dto(id=10).convert_to_entity(
+        ClienteConverterEntity, is_insert=True
+    )
+
+    assert entity.id == 10
+    assert "id" in entity._sql_fields
+
+
+def test_convert_to_entity_none_as_empty():
+    dto = _build_dto(nome=None, endereco=None, documento=None)
+    entity = dto.convert_to_entity(ClienteConverterEntity, none_as_empty=True)
+
+    assert entity.razao_social is EMPTY
+    assert entity.documento is EMPTY
+    assert "cidade" not in entity._sql_fields
+
+
+def test_convert_to_entity_plan_is_cached_per_entity_and_operation():
+    insert_converter = ClienteConverterDTO._get_entity_converter(
+        ClienteConverterEntity, True
+    )
+
+    assert insert_converter is ClienteConverterDTO._get_entity_converter(
+        ClienteConverterEntity, True
+    )
+    assert insert_converter is not ClienteConverterDTO._get_entity_converter(
+        ClienteConverterEntity, False
+    )
+
+
+def test_sql_fields_is_an_ordered_set():
+    sql_fields = SqlFields(["a", "b"])
+    sql_fields.append("a")
+    sql_fields.append("c")
+
+    assert list(sql_fields) == ["a", "b", "c"]
+    assert sql_fields == ["a", "b", "c"]
+    assert "b" in sql_fields
+    assert len(sql_fields) == 3
+
+    sql_fields.remove("b")
+    assert list(sql_fields) == ["a", "c"]
+
+    with pytest.raises(ValueError):
+        sql_fields.remove("b")
+
+    assert not SqlFields()
@@ -0,0 +1,145 @@
+from pathlib import Path
+import enum
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_list_field import DTOListField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+
+
+class SituacaoEnum(enum.Enum):
+    ATIVO = "A"
+    INATIVO = "I"
+
+
+@Entity(table_name="teste.item", pk_field="id", default_order_fields=["id"])
+class ItemEntity(EntityBase):
+    id: uuid.UUID = None
+    pedido_id: uuid.UUID = None
+    descricao: str = None
+
+
+@Entity(table_name="teste.pedido", pk_field="id", default_order_fields=["id"])
+class PedidoEntity(EntityBase):
+    id: uuid.UUID = None
+    numero_pedido: int = None
+    situacao: str = None
+    observacao: str = None
+    valor_centavos: int = None
+
+
+@DTO()
+class ItemDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    descricao: str = DTOField(strip=True)
+
+
+@DTO()
+class PedidoDTO(DTOBase):
+    id: uuid.UUID = DTOField(pk=True, resume=True)
+    numero: int = DTOField(entity_field="numero_pedido")
+    situacao: SituacaoEnum = DTOField()
+    observacao: str = DTOField(default_value="sem observação")
+    valor: float = DTOField(
+        entity_field="valor_centavos",
+        convert_from_entity=lambda value, _: {"valor": value / 100},
+    )
+    itens: list = DTOListField(
+        dto_type=ItemDTO, entity_type=ItemEntity, related_entity_field="pedido_id"
+    )
+
+
+def _slow_path(dto_class, entity, monkeypatch):
+    with monkeypatch.context() as m:
+        m.delattr(dto_class, "_dto_hydrator")
+        return dto_class(entity, escape_validator=True)
+
+
+def _dto_values(dto):
+    return {
+        key: value
+        for key, value in dto.__dict__.items()
+        if key != "_provided_fields"
+    }
+
+
+def test_hydrator_compilado_por_classe():
+    assert "_dto_hydrator" in PedidoDTO.__dict__
+    assert "_dto_hydrator" in ItemDTO.__dict__
+
+
+def test_hydrator_equivalente_ao_construtor_padrao(monkeypatch):
+    entity = PedidoEntity()
+    entity.id = str(uuid.uuid4())
+    entity.numero_pedido = 10
+    entity.situacao = "A"
+    entity.observacao = None
+    entity.valor_centavos = 1250
+
+    dto = PedidoDTO(entity, escape_validator=True)
+    slow = _slow_path(PedidoDTO, entity, monkeypatch)
+
+    assert _dto_values(dto) == _dto_values(slow)
+    assert dto.id == uuid.UUID(entity.id)
+    assert dto.numero == 10
+    assert dto.situacao == SituacaoEnum.ATIVO
+    assert dto.observacao == "sem observação"
+    assert dto.valor == 12.5
+    assert dto._provided_fields == set()
+    assert "itens" not in dto.__dict__
+
+
+def test_hydrator_aplica_validacoes_quando_valor_fora_do_tipo(monkeypatch):
+    entity = ItemEntity()
+    entity.id = uuid.uuid4()
+    entity.pedido_id = uuid.uuid4()
+    entity.descricao = "  caneta  "
+
+    dto = ItemDTO(entity, escape_validator=True)
+    slow = _slow_path(ItemDTO, entity, monkeypatch)
+
+    assert _dto_values(dto) == _dto_values(slow)
+    assert dto.descricao == "caneta"
+    # Campo de relacionamento, adicionado pelo DTOListField do DTO pai
+    assert dto.pedido_id == entity.pedido_id
+
+
+def test_hydrator_aceita_dict_de_colunas(monkeypatch):
+    row = {"id": uuid.uuid4(), "numero_pedido": 3, "situacao": "I"}
+    row["valor_centavos"] = 0
+
+    dto = PedidoDTO(row, escape_validator=True)
+    slow = _slow_path(PedidoDTO, row, monkeypatch)
+
+    assert _dto_values(dto) == _dto_values(slow)
+    assert dto.situacao == SituacaoEnum.INATIVO
+    assert "observacao" not in row
+
+
+def test_hydrator_nao_usado_com_validacao(monkeypatch):
+    entity = ItemEntity()
+    entity.id = uuid.uuid4()
+    entity.descricao = "x"
+
+    called = []
+    monkeypatch.setattr(
+        ItemDTO._dto_hydrator, "hydrate", lambda *args, **kwargs: called.append(1)
+    )
+
+    dto = ItemDTO(entity)
+
+    assert called == []
+    assert dto.descricao == "x"
@@ -0,0 +1,154 @@
+from pathlib import Path
+import sys
+import uuid
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.descriptor.dto_field import LAZY_ROW, DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.dto.dto_compact_storage import dto_values_dict
+
+CONVERSOES = []
+VALIDACOES = []
+
+
+def _nome_from_entity(value, entity_values):
+    CONVERSOES.append(value)
+    return {
+        "nome": value.title() if value is not None else None,
+        "nome_busca": f"{entity_values['codigo']}-{value}".lower(),
+    }
+
+
+def _conta_validacao(dto_field, value):
+    VALIDACOES.append(dto_field.name)
+    return value
+
+
+def _build_dto_class(**decorator_args):
+    @DTO(**decorator_args)
+    class ClienteLazyDTO(DTOBase):
+        id: uuid.UUID = DTOField(pk=True, resume=True)
+        nome_busca: str = DTOField()
+        nome: str = DTOField(entity_field="razao", convert_from_entity=_nome_from_entity)
+        codigo: str = DTOField(resume=True, strip=True, validator=_conta_validacao)
+        valor: int = DTOField(default_value=0, validator=_conta_validacao)
+
+    return ClienteLazyDTO
+
+
+ClienteEagerDTO = _build_dto_class()
+ClienteLazyDTO = _build_dto_class(lazy_fields=True)
+ClienteLazyCompactDTO = _build_dto_class(lazy_fields=True, compact_storage=True)
+
+CLIENTE_ID = uuid.UUID("0c1f5b3e-6a52-4a2f-8a3e-2b7d7a6f9e11")
+ROW = {
+    "id": str(CLIENTE_ID),
+    "codigo": "C1 ",
+    "valor": "7",
+    "razao": "empresa teste",
+    "nome_busca": "ignorado",
+}
+
+
+@pytest.fixture(autouse=True)
+def _limpa_contadores():
+    CONVERSOES.clear()
+    VALIDACOES.clear()
+
+
+@pytest.mark.parametrize("dto_class", [ClienteLazyDTO, ClienteLazyCompactDTO])
+def test_fields_are_converted_on_first_read(dto_class):
+    dto = dto_class(dict(ROW), escape_validator=True)
+
+    assert dto.__dict__[LAZY_ROW] is not None
+    assert VALIDACOES == []
+
+    assert dto.codigo == "C1"
+    assert dto.codigo == "C1"
+    assert VALIDACOES == ["codigo"]
+    assert CONVERSOES == []
+
+    assert dto.nome == "Empresa Teste"
+    assert dto.nome_busca == "c1 -empresa teste"
+    assert CONVERSOES == ["empresa teste"]
+
+
+def test_convert_to_dict_only_converts_selected_fields():
+    dto = ClienteLazyDTO(dict(ROW), escape_validator=True)
+
+    assert dto.convert_to_dict({"root": {"codigo"}}) == {
+        "id": CLIENTE_ID,
+        "codigo": "C1",
+    }
+    assert VALIDACOES == ["codigo"]
+    assert "valor" not in dto.__dict__
+
+
+@pytest.mark.parametrize("dto_class", [ClienteLazyDTO, ClienteLazyCompactDTO])
+def test_values_match_eager_mode(dto_class):
+    fields = {"root": {"id", "codigo", "valor", "nome", "nome_busca"}}
+
+    eager = ClienteEagerDTO(dict(ROW), escape_validator=True).convert_to_dict(fields)
+    lazy = dto_class(dict(ROW), escape_validator=True).convert_to_dict(fields)
+
+    assert lazy == eager
+    assert lazy["valor"] == 7
+    assert lazy["nome_busca"] == "c1 -empresa teste"
+
+
+def test_default_values_are_applied_on_creation():
+    row = dict(ROW)
+    del row["valor"]
+
+    dto = ClienteLazyDTO(row, escape_validator=True)
+    row["valor"] = 99
+
+    assert dto.valor == 0
+
+
+def test_assigned_fields_are_not_overwritten():
+    dto = ClienteLazyDTO(dict(ROW), escape_validator=True)
+    dto.codigo = "C2"
+    dto.nome_busca = "manual"
+
+    assert dto.codigo == "C2"
+    assert dto.nome == "Empresa Teste"
+    assert dto.nome_busca == "manual"
+
+
+@pytest.mark.parametrize("dto_class", [ClienteLazyDTO, ClienteLazyCompactDTO])
+def test_values_dict_and_snapshot_materialize_all_fields(dto_class):
+    dto = dto_class(dict(ROW), escape_validator=True)
+
+    values = dto_values_dict(dto)
+    assert values["codigo"] == "C1"
+    assert values["valor"] == 7
+    assert values["nome"] == "Empresa Teste"
+    assert dto.__dict__[LAZY_ROW] is None
+
+    snapshot = dto_class(dict(ROW), escape_validator=True).snapshot()
+    assert snapshot.__dict__[LAZY_ROW] is None
+    assert snapshot.nome_busca == "c1 -empresa teste"
+
+
+def test_write_path_is_not_lazy():
+    dto = ClienteLazyDTO(id=str(CLIENTE_ID), codigo=" C1 ")
+
+    assert LAZY_ROW not in dto.__dict__
+    assert dto.codigo == "C1"
+
+
+def test_unknown_attribute_still_raises():
+    dto = ClienteLazyDTO(dict(ROW), escape_validator=True)
+
+    with pytest.raises(AttributeError):
+        dto.inexistente
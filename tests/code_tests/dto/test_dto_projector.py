@@ -0,0 +1,136 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_list_field import DTOListField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.util.fields_util import freeze_fields_tree
+
+
+@Entity(table_name="teste.telefone", pk_field="id", default_order_fields=["id"])
+class TelefoneEntity(EntityBase):
+    id: int = None
+    contato_id: int = None
+    numero: str = None
+    ramal: str = None
+
+
+@DTO()
+class TelefoneDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    numero: str = DTOField(resume=True)
+    ramal: str = DTOField()
+
+
+@DTO()
+class ContatoDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    nome: str = DTOField(resume=True)
+    email: str = DTOField()
+    telefones: list = DTOListField(
+        dto_type=TelefoneDTO,
+        entity_type=TelefoneEntity,
+        related_entity_field="contato_id",
+        resume_fields=["numero"],
+    )
+
+
+def _build_contato():
+    return ContatoDTO(
+        id=1,
+        nome="Fulano",
+        email="fulano@teste.com",
+        telefones=[
+            {"id": 10, "numero": "1111", "ramal": "1"},
+            {"id": 11, "numero": "2222", "ramal": "2"},
+        ],
+    )
+
+
+def test_convert_to_dict_resumo():
+    result = _build_contato().convert_to_dict()
+
+    assert result == {
+        "id": 1,
+        "nome": "Fulano",
+        "telefones": [
+            {"id": 10, "numero": "1111"},
+            {"id": 11, "numero": "2222"},
+        ],
+    }
+
+
+def test_convert_to_dict_com_fields():
+    fields = {
+        "root": {"email", "telefones"},
+        "telefones": {"root": {"ramal"}},
+    }
+
+    result = _build_contato().convert_to_dict(fields)
+
+    assert result == {
+        "id": 1,
+        "nome": "Fulano",
+        "email": "fulano@teste.com",
+        "telefones": [
+            {"id": 10, "numero": "1111", "ramal": "1"},
+            {"id": 11, "numero": "2222", "ramal": "2"},
+        ],
+    }
+    # Os fields recebidos não devem ser alterados
+    assert fields == {
+        "root": {"email", "telefones"},
+        "telefones": {"root": {"ramal"}},
+    }
+
+
+def test_projecao_compilada_uma_vez_por_fields():
+    ContatoDTO._dict_projectors.clear()
+    TelefoneDTO._dict_projectors.clear()
+
+    for _ in range(3):
+        _build_contato().convert_to_dict({"root": {"email"}})
+
+    assert len(ContatoDTO._dict_projectors) == 1
+    assert len(TelefoneDTO._dict_projectors) == 1
+
+    _build_contato().convert_to_dict({"root": {"email", "id"}})
+    assert len(ContatoDTO._dict_projectors) == 2
+
+
+def test_freeze_fields_tree_independe_da_ordem():
+    tree_a = {"root": {"a", "b"}, "b": {"root": {"x"}}, "c": {"root": set()}}
+    tree_b = {"c": {"root": set()}, "b": {"root": {"x"}}, "root": {"b", "a"}}
+
+    assert freeze_fields_tree(tree_a) == freeze_fields_tree(tree_b)
+    assert hash(freeze_fields_tree(tree_a)) == hash(freeze_fields_tree(tree_b))
+    assert freeze_fields_tree(None) is None
+
+
+def test_projecao_da_pagina_nao_resolve_projecoes_por_item(monkeypatch):
+    from nsj_rest_lib.dto import dto_base
+
+    fields = {"root": {"email", "telefones"}, "telefones": {"root": {"ramal"}}}
+    projector = ContatoDTO.get_dict_projector(fields)
+    expected = _build_contato().convert_to_dict(fields)
+    assert projector.convert(_build_contato()) == expected
+
+    # Após o primeiro uso, as projeções (inclusive as dos itens das listas) são
+    # chamadas diretamente, sem montar as chaves do cache de projeções
+    def fail(*args, **kwargs):
+        raise AssertionError("projeção resolvida por item")
+
+    monkeypatch.setattr(dto_base, "freeze_fields_tree", fail)
+    page = [_build_contato() for _ in range(3)]
+
+    assert [projector.convert(dto) for dto in page] == [expected] * 3
@@ -0,0 +1,352 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.controller.get_route import GetRoute
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.dao.dao_base_util import DAOBaseUtil
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_object_field import DTOObjectField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.service import service_base_util
+from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.settings import application
+from nsj_rest_lib.util import cache_invalidation_bus
+from nsj_rest_lib.util.cache_util import LRUTTLCache, register_entity_cache
+
+
+@Entity(table_name="teste.cache_cliente", pk_field="id", default_order_fields=["id"])
+class CacheClienteEntity(EntityBase):
+    id: int = None
+    nome: str = None
+    email: str = None
+    tenant: int = None
+
+
+@DTO()
+class CacheClienteDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    nome: str = DTOField(resume=True)
+    email: str = DTOField()
+    tenant: int = DTOField(partition_data=True, resume=True)
+
+
+class CacheClienteDAO(DAOBase):
+    def __init__(self):
+        super().__init__(db=None, entity_class=CacheClienteEntity)
+        self.get_calls = 0
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get(self, key_field, id, fields=None, filters=None, **kwargs):
+        self.get_calls += 1
+        entity = CacheClienteEntity()
+        entity.id = id
+        entity.nome = f"Cliente {self.get_calls}"
+        entity.tenant = 1
+        return entity
+
+    def update(self, key_field, key_value, entity, *args, **kwargs):
+        return entity
+
+    def delete(self, filters):
+        pass
+
+
+def _build_service(dao):
+    return ServiceBase(
+        injector_factory=None,
+        dao=dao,
+        dto_class=CacheClienteDTO,
+        entity_class=CacheClienteEntity,
+    )
+
+
+def _build_cache():
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    register_entity_cache(CacheClienteEntity.table_name, cache)
+    return cache
+
+
+def _get(service, cache, tenant="1", fields=None):
+    return service.get(
+        1, {"tenant": tenant}, fields or {"root": {"nome"}}, cache=cache
+    )
+
+
+def test_get_reuses_cached_dto():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    first = _get(service, cache)
+    second = _get(service, cache)
+
+    assert dao.get_calls == 1
+    assert second.nome == first.nome
+    # Os DTOs devolvidos são cópias (alterações não afetam o cache)
+    assert second is not first
+    second.nome = "Alterado"
+    assert _get(service, cache).nome == first.nome
+
+
+def test_get_with_related_fields_is_not_cached():
+    @DTO()
+    class CacheClienteComObjetoDTO(DTOBase):
+        id: int = DTOField(pk=True, resume=True)
+        nome: str = DTOField(resume=True)
+        tenant: int = DTOField(partition_data=True, resume=True)
+        indicado_por: CacheClienteDTO = DTOObjectField(
+            entity_type=CacheClienteEntity, relation_field="id"
+        )
+
+    dao = CacheClienteDAO()
+    service = ServiceBase(
+        injector_factory=None,
+        dao=dao,
+        dto_class=CacheClienteComObjetoDTO,
+        entity_class=CacheClienteEntity,
+    )
+    # Ignorando a recuperação do objeto relacionado (que exige o banco)
+    service._retrieve_object_fields = lambda *args, **kwargs: None
+    cache = _build_cache()
+
+    _get(service, cache, fields={"root": {"nome", "indicado_por"}})
+    _get(service, cache, fields={"root": {"nome", "indicado_por"}})
+
+    assert dao.get_calls == 2
+    assert len(cache) == 0
+
+
+def test_cache_key_considers_partition_and_fields():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _get(service, cache)
+    _get(service, cache, tenant="2")
+    _get(service, cache, fields={"root": {"email"}})
+
+    assert dao.get_calls == 3
+
+
+def test_get_without_cache_always_queries():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+
+    service.get(1, {"tenant": "1"}, {"root": {"nome"}})
+    service.get(1, {"tenant": "1"}, {"root": {"nome"}})
+
+    assert dao.get_calls == 2
+
+
+def test_update_invalidates_cached_partition():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _get(service, cache)
+    _get(service, cache, tenant="2")
+
+    service.update(CacheClienteDTO(id=1, nome="Novo", tenant=1), 1)
+
+    assert _get(service, cache).nome == "Cliente 4"
+    _get(service, cache, tenant="2")
+    assert dao.get_calls == 4
+
+
+def test_delete_invalidates_cached_partition():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _get(service, cache)
+    service.delete(1, {"tenant": 1})
+    _get(service, cache)
+
+    assert dao.get_calls == 2
+
+
+class TransactionDB:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_write_without_transaction_control_repeats_invalidation_on_commit():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    service.update(
+        CacheClienteDTO(id=1, nome="Novo", tenant=1), 1, manage_transaction=False
+    )
+
+    # Leitura concorrente (antes do commit) recolocando o registro anterior no cache
+    _get(service, cache)
+    get_calls = dao.get_calls
+
+    dao._db = TransactionDB()
+    DAOBaseUtil.commit(dao)
+
+    _get(service, cache)
+    assert dao.get_calls == get_calls + 1
+
+
+def test_rollback_discards_deferred_invalidation():
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    service.update(
+        CacheClienteDTO(id=1, nome="Novo", tenant=1), 1, manage_transaction=False
+    )
+    _get(service, cache)
+    get_calls = dao.get_calls
+
+    dao._db = TransactionDB()
+    DAOBaseUtil.rollback(dao)
+    DAOBaseUtil.commit(dao)
+
+    _get(service, cache)
+    assert dao.get_calls == get_calls
+
+
+def test_bus_publishes_only_successful_writes(monkeypatch):
+    published = []
+    monkeypatch.setattr(service_base_util, "REST_LIB_CACHE_INVALIDATION_BUS", True)
+    monkeypatch.setattr(
+        service_base_util,
+        "publish_cache_invalidation",
+        lambda db, table_name, partition, keys: published.append(keys),
+    )
+
+    class FailingDAO(CacheClienteDAO):
+        def delete(self, filters):
+            raise RuntimeError("falha na exclusão")
+
+    dao = FailingDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _get(service, cache)
+    with pytest.raises(RuntimeError):
+        service.delete(1, {"tenant": 1})
+
+    # A invalidação local ocorre, mas a falha não é publicada aos demais processos
+    assert published == []
+    _get(service, cache)
+    assert dao.get_calls == 2
+
+    service.update(CacheClienteDTO(id=1, nome="Novo", tenant=1), 1)
+    assert published == [[1]]
+
+
+def test_bus_publishes_writes_of_outer_transaction_after_commit(monkeypatch):
+    published = []
+    monkeypatch.setattr(service_base_util, "REST_LIB_CACHE_INVALIDATION_BUS", True)
+
+    def fail_inside_transaction(*args, **kwargs):
+        raise AssertionError("NOTIFY executado dentro da transação")
+
+    monkeypatch.setattr(
+        service_base_util, "publish_cache_invalidation", fail_inside_transaction
+    )
+    monkeypatch.setattr(
+        cache_invalidation_bus,
+        "publish_cache_invalidation",
+        lambda db, table_name, partition, keys: published.append(keys),
+    )
+
+    dao = CacheClienteDAO()
+    service = _build_service(dao)
+    dao._db = TransactionDB()
+
+    # O rollback descarta os eventos pendentes
+    service.update(
+        CacheClienteDTO(id=1, nome="Novo", tenant=1), 1, manage_transaction=False
+    )
+    DAOBaseUtil.rollback(dao)
+    DAOBaseUtil.commit(dao)
+    assert published == []
+
+    # O commit publica os eventos pendentes (uma vez por tabela e partição)
+    service.update(
+        CacheClienteDTO(id=1, nome="Novo", tenant=1), 1, manage_transaction=False
+    )
+    service.update(
+        CacheClienteDTO(id=2, nome="Outro", tenant=1), 2, manage_transaction=False
+    )
+    assert published == []
+    DAOBaseUtil.commit(dao)
+    assert published == [{"1", "2"}]
+
+
+class FakeInjectorFactory:
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class LegacyService:
+    """
+    Service customizado, cujo get não aceita o argumento "cache".
+    """
+
+    def get(
+        self,
+        id,
+        partition_fields,
+        fields,
+        expands=None,
+        function_params=None,
+        function_object=None,
+        function_name=None,
+        custom_json_response=False,
+    ):
+        return CacheClienteDTO(id=id, nome="Cliente", tenant=1)
+
+
+def test_route_cache_is_not_passed_to_service_without_cache_argument():
+    class GetRouteUnderTest(GetRoute):
+        def _get_service(self, factory):
+            return LegacyService()
+
+    route = GetRouteUnderTest(
+        url="/clientes/<id>",
+        http_method="GET",
+        dto_class=CacheClienteDTO,
+        entity_class=CacheClienteEntity,
+        injector_factory=FakeInjectorFactory,
+        cache_ttl=60,
+    )
+
+    with application.test_request_context("/clientes/1?tenant=1", method="GET"):
+        _, status, _ = route.handle_request(id="1")
+
+    assert status == 200
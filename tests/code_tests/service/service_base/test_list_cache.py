@@ -0,0 +1,189 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_object_field import DTOObjectField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.util.cache_util import (
+    LRUTTLCache,
+    freeze_cache_value,
+    register_entity_cache,
+)
+
+
+@Entity(table_name="teste.cache_tipo", pk_field="id", default_order_fields=["id"])
+class CacheTipoEntity(EntityBase):
+    id: int = None
+    descricao: str = None
+    tenant: int = None
+
+
+@DTO()
+class CacheTipoDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    descricao: str = DTOField(resume=True)
+    tenant: int = DTOField(partition_data=True, resume=True)
+
+
+class CacheTipoDAO(DAOBase):
+    def __init__(self):
+        super().__init__(db=None, entity_class=CacheTipoEntity)
+        self.list_calls = 0
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def list(self, after, limit, fields, order_fields, filters, **kwargs):
+        self.list_calls += 1
+        rows = [
+            {"id": i, "descricao": f"Tipo {i} ({self.list_calls})", "tenant": 1}
+            for i in range(1, 3)
+        ]
+        if kwargs.get("as_rows"):
+            return rows
+
+        entities = []
+        for row in rows:
+            entity = CacheTipoEntity()
+            for field, value in row.items():
+                setattr(entity, field, value)
+            entities.append(entity)
+        return entities
+
+    def get(self, key_field, id, fields=None, filters=None, **kwargs):
+        entity = CacheTipoEntity()
+        entity.id = id
+        entity.descricao = "Tipo"
+        entity.tenant = 1
+        return entity
+
+    def update(self, key_field, key_value, entity, *args, **kwargs):
+        return entity
+
+
+def _build_service(dao):
+    return ServiceBase(
+        injector_factory=None,
+        dao=dao,
+        dto_class=CacheTipoDTO,
+        entity_class=CacheTipoEntity,
+    )
+
+
+def _build_cache():
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    register_entity_cache(CacheTipoEntity.table_name, cache)
+    return cache
+
+
+def _list(service, cache, filters=None, limit=20):
+    return service.list(
+        None,
+        limit,
+        {"root": {"descricao"}},
+        None,
+        filters if filters is not None else {"tenant": "1"},
+        cache=cache,
+    )
+
+
+def test_list_reuses_cached_result():
+    dao = CacheTipoDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    first = _list(service, cache)
+    second = _list(service, cache)
+
+    assert dao.list_calls == 1
+    assert [dto.descricao for dto in second] == [dto.descricao for dto in first]
+    # A lista e os DTOs retornados são cópias (alterações não afetam o cache)
+    assert second[0] is not first[0]
+    first[0].descricao = "Alterado"
+    second.pop()
+    third = _list(service, cache)
+    assert len(third) == 2
+    assert third[0].descricao == second[0].descricao
+    assert dao.list_calls == 1
+
+
+def test_cache_key_considers_query_shape_and_values():
+    dao = CacheTipoDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _list(service, cache)
+    _list(service, cache, filters={"tenant": "2"})
+    _list(service, cache, filters={"tenant": "1", "descricao": "a"})
+    _list(service, cache, limit=10)
+    _list(service, cache, filters={"descricao": "a", "tenant": "1"})
+
+    assert dao.list_calls == 4
+
+
+def test_update_invalidates_cached_partition():
+    dao = CacheTipoDAO()
+    service = _build_service(dao)
+    cache = _build_cache()
+
+    _list(service, cache)
+    _list(service, cache, filters={"tenant": "2"})
+
+    service.update(CacheTipoDTO(id=1, descricao="Novo", tenant=1), 1)
+
+    _list(service, cache)
+    _list(service, cache, filters={"tenant": "2"})
+    assert dao.list_calls == 3
+
+
+def test_freeze_cache_value_is_order_independent():
+    assert freeze_cache_value({"a": [1, {"b": 2}], "c": {3}}) == freeze_cache_value(
+        {"c": {3}, "a": [1, {"b": 2}]}
+    )
+    assert freeze_cache_value({"a": None}) != freeze_cache_value({"a": "None"})
+
+
+def test_list_with_related_fields_is_not_cached():
+    @DTO()
+    class CacheTipoComObjetoDTO(DTOBase):
+        id: int = DTOField(pk=True, resume=True)
+        descricao: str = DTOField(resume=True)
+        tenant: int = DTOField(partition_data=True, resume=True)
+        tipo_pai: CacheTipoDTO = DTOObjectField(
+            entity_type=CacheTipoEntity, relation_field="id"
+        )
+
+    dao = CacheTipoDAO()
+    service = ServiceBase(
+        injector_factory=None,
+        dao=dao,
+        dto_class=CacheTipoComObjetoDTO,
+        entity_class=CacheTipoEntity,
+    )
+    cache = _build_cache()
+
+    assert service._reads_related_tables({"root": {"descricao", "tipo_pai"}})
+    assert not service._reads_related_tables({"root": {"descricao"}})
+
+    _list(service, cache)
+    _list(service, cache)
+
+    assert dao.list_calls == 1
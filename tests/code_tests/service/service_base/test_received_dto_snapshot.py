@@ -0,0 +1,111 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_list_field import DTOListField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.exception import NotFoundException
+from nsj_rest_lib.service.service_base import ServiceBase
+
+
+@Entity(table_name="teste.item", pk_field="id", default_order_fields=["id"])
+class ItemEntity(EntityBase):
+    id: int = None
+    nota_id: int = None
+    descricao: str = None
+
+
+@Entity(table_name="teste.nota", pk_field="id", default_order_fields=["id"])
+class NotaEntity(EntityBase):
+    id: int = None
+    numero: str = None
+
+
+@DTO()
+class ItemDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    descricao: str = DTOField()
+
+
+@DTO()
+class NotaDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    numero: str = DTOField()
+    itens: list = DTOListField(
+        dto_type=ItemDTO,
+        entity_type=ItemEntity,
+        related_entity_field="nota_id",
+        relation_key_field="id",
+    )
+
+
+class NotaDAO(DAOBase):
+    def __init__(self):
+        super().__init__(db=None, entity_class=NotaEntity)
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get(self, *args, **kwargs):
+        raise NotFoundException("")
+
+    def insert(self, entity, sql_read_only_fields=[]):
+        return entity
+
+
+def test_snapshot_is_not_affected_by_changes_in_original():
+    dto = NotaDTO(id=1, numero="1", itens=[{"id": 10, "descricao": "A"}])
+
+    snapshot = dto.snapshot()
+    dto.numero = "2"
+    dto.itens[0].descricao = "B"
+    dto.itens.append(ItemDTO(id=11, descricao="C"))
+
+    assert snapshot.numero == "1"
+    assert len(snapshot.itens) == 1
+    assert snapshot.itens[0].descricao == "A"
+
+
+def test_before_insert_hook_receives_snapshot_in_after_data():
+    received = {}
+
+    def before_insert(db, dto):
+        dto.numero = "alterado"
+        return dto
+
+    def after_insert(db, dto, after_data):
+        received["numero"] = after_data.received_dto.numero
+
+    dto = NotaDTO(id=1, numero="original", itens=[])
+    dto.itens = None
+    service = ServiceBase(
+        injector_factory=None,
+        dao=NotaDAO(),
+        dto_class=NotaDTO,
+        entity_class=NotaEntity,
+    )
+
+    service.insert(
+        dto,
+        custom_before_insert=before_insert,
+        custom_after_insert=after_insert,
+    )
+
+    assert received["numero"] == "original"
@@ -0,0 +1,190 @@
+from pathlib import Path
+import sys
+from unittest.mock import Mock
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_object_field import DTOObjectField
+from nsj_rest_lib.descriptor.dto_one_to_one_field import (
+    DTOOneToOneField,
+    OTORelationType,
+)
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.util.cache_util import invalidate_entity_caches
+
+
+@Entity(table_name="teste.ref_unidade", pk_field="id", default_order_fields=["id"])
+class UnidadeEntity(EntityBase):
+    id: int = None
+    sigla: str = None
+
+
+@DTO()
+class UnidadeDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    sigla: str = DTOField(resume=True)
+
+
+@Entity(table_name="teste.ref_produto", pk_field="id", default_order_fields=["id"])
+class ProdutoEntity(EntityBase):
+    id: int = None
+    unidade: int = None
+
+
+@DTO()
+class UnidadeComBaseDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    sigla: str = DTOField(resume=True)
+    unidade_base: UnidadeDTO = DTOObjectField(
+        entity_type=UnidadeEntity, relation_field="id", resume=True
+    )
+
+
+def _build_produto_dto(unidade_dto_class=UnidadeDTO, **field_kwargs):
+    @DTO()
+    class ProdutoDTO(DTOBase):
+        id: int = DTOField(pk=True, resume=True)
+        unidade: unidade_dto_class = DTOOneToOneField(
+            entity_type=UnidadeEntity,
+            relation_type=OTORelationType.AGGREGATION,
+            **field_kwargs,
+        )
+
+    return ProdutoDTO
+
+
+UNIDADES = {1: "UN", 2: "KG", 3: "CX"}
+
+
+@pytest.fixture
+def list_calls(monkeypatch):
+    calls = []
+
+    def fake_list(self, after, limit, fields, order_fields, filters, **kwargs):
+        calls.append(dict(filters))
+        keys = None
+        if "id" in filters:
+            keys = {int(key) for key in filters["id"].split(",")}
+
+        result = []
+        for id, sigla in UNIDADES.items():
+            if keys is not None and id not in keys:
+                continue
+            dto = UnidadeDTO(id=id, sigla=sigla)
+            dto.return_hidden_fields = {"id": id}
+            result.append(dto)
+        return result[:limit] if limit is not None else result
+
+    monkeypatch.setattr(ServiceBase, "list", fake_list)
+    return calls
+
+
+def _expand(dto_class, *unidades):
+    entities = []
+    for id, unidade in enumerate(unidades):
+        entity = ProdutoEntity()
+        entity.id = id
+        entity.unidade = unidade
+        entities.append(entity)
+
+    service = ServiceBase(Mock(), Mock(), dto_class, ProdutoEntity)
+    service._retrieve_one_to_one_fields(
+        entities,
+        {"root": {"id", "unidade"}},
+        {"root": {"unidade"}},
+        {},
+    )
+    return [entity.unidade for entity in entities]
+
+
+def test_without_cache_lists_on_every_expand(list_calls):
+    dto_class = _build_produto_dto()
+
+    _expand(dto_class, 1)
+    _expand(dto_class, 1)
+
+    assert list_calls == [{"id": "1"}, {"id": "1"}]
+
+
+def test_cache_preloads_table_and_serves_expands(list_calls):
+    dto_class = _build_produto_dto(cache_ttl=60, cache_preload=True)
+
+    first = _expand(dto_class, 1, 2)
+    second = _expand(dto_class, 2, 3)
+
+    assert [dto.sigla for dto in first] == ["UN", "KG"]
+    assert [dto.sigla for dto in second] == ["KG", "CX"]
+    assert list_calls == [{}]
+
+
+def test_cache_without_preload_fetches_missing_keys(list_calls):
+    # O cache_preload é opcional (desabilitado por padrão)
+    dto_class = _build_produto_dto(cache_ttl=60)
+
+    _expand(dto_class, 1, 2)
+    _expand(dto_class, 2, 3)
+
+    assert len(list_calls) == 2
+    assert list_calls[1] == {"id": "3"}
+
+
+def test_writes_invalidate_reference_cache(list_calls):
+    dto_class = _build_produto_dto(cache_ttl=60, cache_preload=True)
+
+    _expand(dto_class, 1)
+    invalidate_entity_caches(UnidadeEntity.table_name, (("tenant", "1"),))
+    _expand(dto_class, 1)
+
+    assert list_calls == [{}, {}]
+
+
+def test_preload_of_table_larger_than_cache_falls_back_to_missing_keys(list_calls):
+    dto_class = _build_produto_dto(cache_ttl=60, cache_maxsize=2, cache_preload=True)
+
+    assert [dto.sigla for dto in _expand(dto_class, 3)] == ["CX"]
+    _expand(dto_class, 1, 2, 3)
+    _expand(dto_class, 3)
+
+    # Apenas a primeira carga é da tabela (limitada ao tamanho do cache); a chave
+    # fora da carga é consultada em seguida
+    assert list_calls[0:2] == [{}, {"id": "3"}]
+    assert all(calls != {} for calls in list_calls[2:])
+    # O descritor (compartilhado) não é alterado
+    assert dto_class.one_to_one_fields_map["unidade"].cache_preload
+
+
+def test_cached_dtos_are_not_shared_with_callers(list_calls):
+    dto_class = _build_produto_dto(cache_ttl=60, cache_preload=True)
+
+    first = _expand(dto_class, 1)[0]
+    first.sigla = "Alterada"
+    second = _expand(dto_class, 1)[0]
+    third = _expand(dto_class, 1)[0]
+
+    assert second.sigla == "UN"
+    assert second is not third
+    assert list_calls == [{}]
+
+
+def test_cache_is_skipped_when_related_dto_reads_other_tables(list_calls):
+    dto_class = _build_produto_dto(
+        UnidadeComBaseDTO, cache_ttl=60, cache_preload=True
+    )
+
+    _expand(dto_class, 1)
+    _expand(dto_class, 1)
+
+    assert list_calls == [{"id": "1"}, {"id": "1"}]
+    assert len(dto_class.one_to_one_fields_map["unidade"].reference_cache) == 0
@@ -114,6 +114,13 @@ class TestRetrieveObjectFields(unittest.TestCase):
 
         return [ self.related_list[id] for id in self.related_list if id == kwargs['id'] ]
 
+    def mock_execute_query(self, sql, **kwargs):
+        # Leitura direta em dicts (sem instanciar as entities)
+        return [
+            {k: v for k, v in entity.__dict__.items() if k != "_sql_fields"}
+            for entity in self.mock_execute_query_to_model(sql, None, **kwargs)
+        ]
+
 
     def setUp(self):
         """Configuração inicial para cada teste"""
@@ -121,6 +128,7 @@ class TestRetrieveObjectFields(unittest.TestCase):
         self.mock_injector_factory = Mock()
         self.mock_db_adapter = Mock()
         self.mock_db_adapter.execute_query_to_model.side_effect = self.mock_execute_query_to_model
+        self.mock_db_adapter.execute_query.side_effect = self.mock_execute_query
         self.mock_injector_factory.db_adapter.return_value = self.mock_db_adapter
 
         # Mock do DAO
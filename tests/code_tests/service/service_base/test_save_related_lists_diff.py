@@ -0,0 +1,236 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.descriptor.dto_list_field import DTOListField
+from nsj_rest_lib.descriptor.filter_operator import FilterOperator
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.entity.filter import Filter
+from nsj_rest_lib.service.service_base import ServiceBase
+from nsj_rest_lib.util.cache_util import (
+    LRUTTLCache,
+    entity_cache_tags,
+    register_entity_cache,
+)
+
+
+@Entity(table_name="teste.item", pk_field="id", default_order_fields=["id"])
+class ItemEntity(EntityBase):
+    id: int = None
+    pedido_id: int = None
+    produto: str = None
+    quantidade: int = None
+
+
+@Entity(table_name="teste.pedido", pk_field="id", default_order_fields=["id"])
+class PedidoEntity(EntityBase):
+    id: int = None
+    numero: str = None
+
+
+@DTO()
+class ItemDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    produto: str = DTOField()
+    quantidade: int = DTOField()
+
+
+@DTO()
+class PedidoDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    numero: str = DTOField()
+    itens: list = DTOListField(
+        dto_type=ItemDTO,
+        entity_type=ItemEntity,
+        related_entity_field="pedido_id",
+        relation_key_field="id",
+    )
+
+
+class FakeDB:
+    def __init__(self, stored_rows):
+        self.stored_rows = stored_rows
+        self.statements = []
+
+    def in_transaction(self):
+        return True
+
+    def execute_query_to_model(self, sql, model_class, **kwargs):
+        self.statements.append(("select", sql, kwargs))
+        result = []
+        for row in self.stored_rows:
+            model = model_class()
+            for key, value in row.items():
+                setattr(model, key, value)
+            result.append(model)
+        return result
+
+    def execute_query(self, sql, **kwargs):
+        self.statements.append(("select", sql, kwargs))
+        return []
+
+    def execute(self, sql, **kwargs):
+        command = sql.strip().split()[0].lower()
+        self.statements.append((command, sql, kwargs))
+        return (len(self.stored_rows) + 10, None)
+
+
+class FakeInjectorFactory:
+    def __init__(self, db):
+        self.db = db
+
+    def db_adapter(self):
+        return self.db
+
+
+def _save_itens(db, itens):
+    service = ServiceBase(
+        injector_factory=FakeInjectorFactory(db),
+        dao=DAOBase(db, PedidoEntity),
+        dto_class=PedidoDTO,
+        entity_class=PedidoEntity,
+        dto_post_response_class=PedidoDTO,
+    )
+    dto = PedidoDTO(id=1, numero="P1", itens=itens)
+    entity = dto.convert_to_entity(PedidoEntity, False, False)
+
+    service._save_related_lists(False, dto, entity, False, None)
+
+    return [command for command, _, _ in db.statements]
+
+
+def test_unchanged_items_are_skipped():
+    db = FakeDB(
+        [
+            {"id": 1, "pedido_id": 1, "produto": "A", "quantidade": 1},
+            {"id": 2, "pedido_id": 1, "produto": "B", "quantidade": 2},
+        ]
+    )
+
+    commands = _save_itens(
+        db,
+        [
+            {"id": 1, "produto": "A", "quantidade": 1},
+            {"id": 2, "produto": "B", "quantidade": 2},
+        ],
+    )
+
+    assert commands == ["select"]
+
+
+def test_changes_are_batched_per_statement_type():
+    db = FakeDB(
+        [
+            {"id": 1, "pedido_id": 1, "produto": "A", "quantidade": 1},
+            {"id": 2, "pedido_id": 1, "produto": "B", "quantidade": 2},
+            {"id": 3, "pedido_id": 1, "produto": "C", "quantidade": 3},
+            {"id": 4, "pedido_id": 1, "produto": "D", "quantidade": 4},
+        ]
+    )
+
+    commands = _save_itens(
+        db,
+        [
+            {"id": 1, "produto": "A", "quantidade": 1},
+            {"id": 2, "produto": "B", "quantidade": 20},
+            {"id": 3, "produto": "C", "quantidade": 30},
+            {"id": 5, "produto": "E", "quantidade": 5},
+            {"id": 6, "produto": "F", "quantidade": 6},
+        ],
+    )
+
+    # select dos existentes, delete, update, verificação de conflito e insert
+    assert commands == ["select", "delete", "update", "select", "insert"]
+
+    _, update_sql, update_kwargs = db.statements[2]
+    assert "case t0.id" in update_sql
+    assert update_kwargs["candidate_key_value_0"] == 2
+    assert update_kwargs["candidate_key_value_1"] == 3
+
+    _, insert_sql, insert_kwargs = db.statements[4]
+    assert insert_kwargs["id_0"] == 5
+    assert insert_kwargs["id_1"] == 6
+    assert insert_kwargs["pedido_id_1"] == 1
+
+
+class ReturningDB(FakeDB):
+    def execute(self, sql, **kwargs):
+        command, _ = super().execute(sql, **kwargs)
+        if "returning" in sql:
+            return (1, [{"id": 99}])
+        return (command, None)
+
+
+def _build_item_service(db):
+    return ServiceBase(
+        injector_factory=FakeInjectorFactory(db),
+        dao=DAOBase(db, ItemEntity),
+        dto_class=ItemDTO,
+        entity_class=ItemEntity,
+        dto_post_response_class=ItemDTO,
+    )
+
+
+def test_response_carries_values_generated_by_the_database():
+    db = ReturningDB([])
+    service = _build_item_service(db)
+
+    responses = service._save_list_by_diff(
+        [ItemDTO(produto="A", quantidade=1), ItemDTO(id=7, produto="B", quantidade=2)],
+        None,
+        {"pedido_id": 1},
+        False,
+    )
+
+    assert [response.id for response in responses] == [99, 7]
+
+    # A PK a gerar pelo banco não entra na verificação de conflito
+    conflict_kwargs = [
+        kwargs for command, _, kwargs in db.statements if command == "select"
+    ]
+    assert [list(kwargs.values()) for kwargs in conflict_kwargs] == [[(7,)]]
+
+
+def test_large_lists_are_split_by_parameter_limit():
+    db = FakeDB(
+        [
+            {"id": i, "pedido_id": 1, "produto": "A", "quantidade": i}
+            for i in range(1, 4)
+        ]
+    )
+    service = _build_item_service(db)
+    service._dao._batch_max_parameters = 10
+
+    service._save_list_by_diff(
+        [ItemDTO(id=i, produto="A", quantidade=i * 10) for i in range(1, 7)],
+        {"pedido_id": [Filter(FilterOperator.EQUALS, 1)]},
+        {"pedido_id": 1},
+        True,
+    )
+
+    commands = [command for command, _, _ in db.statements]
+    # Updates com 3 campos (7 parâmetros por item) e inserts com 4 campos por item
+    assert commands.count("update") == 3
+    assert commands.count("insert") == 2
+
+
+def test_diff_write_invalidates_detail_caches():
+    cache = LRUTTLCache(10, 60)
+    register_entity_cache(ItemEntity.table_name, cache)
+    cache.set("item", 1, entity_cache_tags(ItemEntity.table_name, None))
+
+    db = FakeDB([{"id": 1, "pedido_id": 1, "produto": "A", "quantidade": 1}])
+    _save_itens(db, [{"id": 1, "produto": "A", "quantidade": 10}])
+
+    assert len(cache) == 0
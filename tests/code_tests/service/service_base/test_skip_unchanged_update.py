@@ -0,0 +1,105 @@
+from pathlib import Path
+import sys
+
+from typing import List
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from nsj_rest_lib.dao.dao_base import DAOBase
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.decorator.entity import Entity
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.entity.entity_base import EntityBase
+from nsj_rest_lib.service.service_base import ServiceBase
+
+
+@Entity(table_name="teste.cliente", pk_field="id", default_order_fields=["id"])
+class ClienteEntity(EntityBase):
+    id: int = None
+    nome: str = None
+    email: str = None
+
+
+@DTO(skip_unchanged_update=True)
+class ClienteDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    nome: str = DTOField()
+    email: str = DTOField()
+
+
+@DTO()
+class ClienteSempreAtualizaDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    nome: str = DTOField()
+    email: str = DTOField()
+
+
+class ClienteDAO(DAOBase):
+    def __init__(self):
+        super().__init__(db=None, entity_class=ClienteEntity)
+        self.updated_fields: List[List[str]] = []
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get(self, key_field, id, fields=None, filters=None, **kwargs):
+        entity = ClienteEntity()
+        entity.id = 1
+        entity.nome = "Fulano"
+        entity.email = "fulano@teste.com"
+        return entity
+
+    def update(self, key_field, key_value, entity, *args, **kwargs):
+        self.updated_fields.append(list(entity._sql_fields))
+        return entity
+
+
+def _build_service(dao, dto_class=ClienteDTO):
+    return ServiceBase(
+        injector_factory=None,
+        dao=dao,
+        dto_class=dto_class,
+        entity_class=ClienteEntity,
+    )
+
+
+def test_update_without_changes_is_skipped():
+    dao = ClienteDAO()
+    service = _build_service(dao)
+
+    service.update(ClienteDTO(id=1, nome="Fulano", email="fulano@teste.com"), 1)
+
+    assert dao.updated_fields == []
+
+
+def test_update_sends_only_changed_fields():
+    dao = ClienteDAO()
+    service = _build_service(dao)
+
+    service.update(ClienteDTO(id=1, nome="Ciclano", email="fulano@teste.com"), 1)
+
+    assert dao.updated_fields == [["nome"]]
+
+
+def test_update_without_option_writes_all_fields():
+    dao = ClienteDAO()
+    service = _build_service(dao, ClienteSempreAtualizaDTO)
+
+    service.update(
+        ClienteSempreAtualizaDTO(id=1, nome="Fulano", email="fulano@teste.com"), 1
+    )
+
+    assert len(dao.updated_fields) == 1
+    assert set(dao.updated_fields[0]) >= {"nome", "email"}
@@ -0,0 +1,189 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.util.cache_invalidation_bus import (
+    NOTIFY_PAYLOAD_MAX_SIZE,
+    CacheInvalidationListener,
+    decode_invalidation_event,
+    encode_invalidation_event,
+    publish_cache_invalidation,
+)
+from nsj_rest_lib.util.cache_util import (
+    LRUTTLCache,
+    entity_cache_tags,
+    register_entity_cache,
+)
+
+TABLE = "teste.bus_produto"
+PARTITION = (("tenant", "1"),)
+
+
+class FakeCursor:
+    def execute(self, sql):
+        self.sql = sql
+
+    def fetchall(self):
+        return [[1]]
+
+
+class FakeDriverConnection:
+    """
+    Conexão fake, no formato do pg8000 (notificações numa deque limitada).
+    """
+
+    def __init__(self, maxlen=100):
+        self.notifications = deque(maxlen=maxlen)
+        self.autocommit = False
+
+    def cursor(self):
+        return FakeCursor()
+
+    def notify(self, channel, payload):
+        self.notifications.append((0, channel, payload))
+
+
+def _build_cache():
+    cache = LRUTTLCache(10, 60)
+    register_entity_cache(TABLE, cache)
+    cache.set("tenant_1", 1, entity_cache_tags(TABLE, PARTITION))
+    cache.set("tenant_2", 2, entity_cache_tags(TABLE, (("tenant", "2"),)))
+    return cache
+
+
+def _foreign_payload(partition=PARTITION, keys=None):
+    payload = json.loads(encode_invalidation_event(TABLE, partition, keys))
+    payload["o"] = "outro-processo"
+    return json.dumps(payload)
+
+
+def test_event_roundtrip():
+    event = decode_invalidation_event(encode_invalidation_event(TABLE, PARTITION, [7]))
+
+    assert event["table_name"] == TABLE
+    assert event["partition"] == PARTITION
+    assert event["keys"] == ["7"]
+
+
+def test_oversized_event_drops_keys():
+    keys = [f"{i:036d}" for i in range(400)]
+    payload = encode_invalidation_event(TABLE, PARTITION, keys)
+
+    assert len(payload.encode("utf-8")) <= NOTIFY_PAYLOAD_MAX_SIZE
+    event = decode_invalidation_event(payload)
+    assert event["keys"] is None
+    assert event["partition"] == PARTITION
+
+
+def test_publish_uses_pg_notify():
+    class RecordingDB:
+        def execute(self, sql, **kwargs):
+            self.call = (sql, kwargs)
+            return 1, []
+
+    db = RecordingDB()
+    publish_cache_invalidation(db, TABLE, PARTITION, [1], channel="canal")
+
+    sql, kwargs = db.call
+    assert "pg_notify" in sql
+    assert kwargs["channel"] == "canal"
+    assert decode_invalidation_event(kwargs["payload"])["partition"] == PARTITION
+
+
+def test_listener_evicts_partition_of_foreign_events():
+    cache = _build_cache()
+    connection = FakeDriverConnection()
+    listener = CacheInvalidationListener(lambda: connection, channel="canal")
+
+    connection.notify("canal", _foreign_payload())
+    connection.notify("outro_canal", _foreign_payload(partition=None))
+
+    assert listener.process_notifications(connection) == 1
+    assert cache.get("tenant_1", None) is None
+    assert cache.get("tenant_2") == 2
+
+
+def test_listener_ignores_own_events():
+    cache = _build_cache()
+    connection = FakeDriverConnection()
+    listener = CacheInvalidationListener(lambda: connection, channel="canal")
+
+    connection.notify("canal", encode_invalidation_event(TABLE, None))
+    listener.process_notifications(connection)
+
+    assert len(cache) == 2
+
+
+def test_listener_clears_caches_on_possible_loss():
+    cache = _build_cache()
+    connection = FakeDriverConnection(maxlen=1)
+    listener = CacheInvalidationListener(lambda: connection, channel="canal")
+
+    connection.notify("canal", _foreign_payload(partition=(("tenant", "3"),)))
+    listener.process_notifications(connection)
+
+    assert len(cache) == 0
+
+
+def test_invalid_channel_name():
+    with pytest.raises(ValueError):
+        CacheInvalidationListener(lambda: None, channel="canal; drop table x")
+
+
+def _connect_local_postgres():
+    pg8000 = pytest.importorskip("pg8000")
+    try:
+        return pg8000.connect(
+            user=os.getenv("DATABASE_USER") or "projeto",
+            password=os.getenv("DATABASE_PASS") or "mysecretpassword",
+            host=os.getenv("DATABASE_HOST") or "localhost",
+            port=int(os.getenv("DATABASE_PORT") or 5440),
+            database=os.getenv("DATABASE_NAME") or "projeto",
+            timeout=2,
+        )
+    except Exception as e:
+        pytest.skip(f"PostgreSQL local indisponível: {e}")
+
+
+def test_listener_against_local_postgres():
+    publisher_connection = _connect_local_postgres()
+    publisher_connection.autocommit = True
+    cache = _build_cache()
+
+    listener = CacheInvalidationListener(
+        _connect_local_postgres, channel="nsj_rest_lib_cache_test", poll_interval=0.05
+    )
+    listener.start()
+    try:
+        # Aguardando o LISTEN (que limpa os caches locais ao conectar)
+        deadline = time.monotonic() + 5
+        while len(cache) > 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        cache.set("tenant_1", 1, entity_cache_tags(TABLE, PARTITION))
+        cache.set("tenant_2", 2, entity_cache_tags(TABLE, (("tenant", "2"),)))
+
+        cursor = publisher_connection.cursor()
+        cursor.execute(
+            "select pg_notify(%s, %s)", ("nsj_rest_lib_cache_test", _foreign_payload())
+        )
+
+        deadline = time.monotonic() + 5
+        while cache.get("tenant_1", None) is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert cache.get("tenant_1", None) is None
+        assert cache.get("tenant_2") == 2
+    finally:
+        listener.stop(timeout=5)
+        publisher_connection.close()
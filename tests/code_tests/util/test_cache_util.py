@@ -0,0 +1,95 @@
+from pathlib import Path
+import sys
+
+# Garantindo import da lib local sem depender de instalação no ambiente
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = REPO_ROOT / "src"
+for path in (SRC_ROOT, REPO_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pytest
+
+from nsj_rest_lib.util import cache_util
+from nsj_rest_lib.util.cache_util import (
+    MISS,
+    LRUTTLCache,
+    entity_cache_tags,
+    invalidate_entity_caches,
+    partition_cache_key,
+    register_entity_cache,
+)
+
+
+def test_lru_discards_least_recently_used():
+    cache = LRUTTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expires_items(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_util.time, "monotonic", lambda: now[0])
+
+    cache = LRUTTLCache(maxsize=10, ttl=5)
+    cache.set("a", None)
+    assert cache.get("a") is None
+
+    now[0] = 105.0
+    assert cache.get("a") is MISS
+    assert len(cache) == 0
+
+
+def test_invalidate_tag():
+    cache = LRUTTLCache()
+    cache.set("a", 1, tags=["x", "y"])
+    cache.set("b", 2, tags=["y"])
+    cache.set("c", 3, tags=["z"])
+
+    assert cache.invalidate_tag("y") == 2
+    assert cache.get("a") is MISS
+    assert cache.get("b") is MISS
+    assert cache.get("c") == 3
+    assert cache.invalidate_tag("x") == 0
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        LRUTTLCache(maxsize=0)
+
+
+def test_partition_cache_key():
+    assert partition_cache_key({"tenant", "grupo"}, {"tenant": 1, "grupo": "a"}) == (
+        ("grupo", "a"),
+        ("tenant", "1"),
+    )
+    assert partition_cache_key({"tenant"}, {"tenant": None}) is None
+    assert partition_cache_key({"tenant"}, None) is None
+    assert partition_cache_key(set(), {}) == ()
+
+
+def test_invalidate_entity_caches_by_partition():
+    cache = LRUTTLCache()
+    register_entity_cache("teste.tabela_cache", cache)
+
+    cache.set("p1", 1, entity_cache_tags("teste.tabela_cache", (("tenant", "1"),)))
+    cache.set("p2", 2, entity_cache_tags("teste.tabela_cache", (("tenant", "2"),)))
+    cache.set("desconhecida", 3, entity_cache_tags("teste.tabela_cache", None))
+
+    invalidate_entity_caches("teste.tabela_cache", (("tenant", "1"),))
+
+    assert cache.get("p1") is MISS
+    assert cache.get("desconhecida") is MISS
+    assert cache.get("p2") == 2
+
+    invalidate_entity_caches("teste.tabela_cache")
+
+    assert cache.get("p2") is MISS
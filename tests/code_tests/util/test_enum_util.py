@@ -1,6 +1,12 @@
 import enum
 
-from nsj_rest_lib.util.enum_util import coerce_enum_value, enum_to_primitive_value
+import pytest
+
+from nsj_rest_lib.util.enum_util import (
+    coerce_enum_value,
+    enum_to_primitive_value,
+    get_enum_lookup,
+)
 
 
 class TupleEnum(enum.Enum):
@@ -32,3 +38,69 @@ def test_enum_to_primitive_value_plain_enum():
 
 def test_coerce_enum_value_passthrough():
     assert coerce_enum_value("valor") == "valor"
+
+
+class StatusEnum(enum.Enum):
+    ATIVO = ("ativo", 1)
+    INATIVO = ("INATIVO", 0)
+    BLOQUEADO = ("Bloqueado", "ativo", 2)
+
+
+class LetraEnum(enum.Enum):
+    A = "a"
+    B = "B"
+
+
+class ListaEnum(enum.Enum):
+    A = (["lista"], 1)
+
+
+def test_enum_lookup_is_built_once_per_enum():
+    assert get_enum_lookup(StatusEnum) is get_enum_lookup(StatusEnum)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("ativo", StatusEnum.ATIVO),
+        ("ATIVO", StatusEnum.ATIVO),
+        ("inativo", StatusEnum.INATIVO),
+        (0, StatusEnum.INATIVO),
+        (2, StatusEnum.BLOQUEADO),
+        ("bloqueado", None),
+        ("outro", None),
+    ],
+)
+def test_enum_lookup_find_member_tuple_values(value, expected):
+    assert get_enum_lookup(StatusEnum).find_member(value) is expected
+
+
+def test_enum_lookup_find_member_unhashable_values():
+    lookup = get_enum_lookup(ListaEnum)
+
+    assert lookup.find_member(["lista"]) is ListaEnum.A
+    assert lookup.find_member(1) is ListaEnum.A
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("a", LetraEnum.A),
+        ("A", LetraEnum.A),
+        ("b", LetraEnum.B),
+        (LetraEnum.B, LetraEnum.B),
+    ],
+)
+def test_enum_lookup_convert_value(value, expected):
+    assert get_enum_lookup(LetraEnum).convert_value(value) is expected
+
+
+def test_enum_lookup_convert_value_invalid():
+    with pytest.raises(ValueError):
+        get_enum_lookup(LetraEnum).convert_value("c")
+
+
+def test_enum_lookup_entity_value():
+    lookup = get_enum_lookup(TupleEnum)
+
+    assert lookup.entity_value(TupleEnum.A) == 99
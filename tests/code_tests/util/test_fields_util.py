@@ -0,0 +1,53 @@
+from nsj_rest_lib.decorator.dto import DTO
+from nsj_rest_lib.descriptor.dto_field import DTOField
+from nsj_rest_lib.dto.dto_base import DTOBase
+from nsj_rest_lib.util.fields_util import (
+    clone_fields_tree,
+    extract_child_tree,
+    parse_fields_expression,
+)
+
+
+@DTO()
+class ResumoDTO(DTOBase):
+    id: int = DTOField(pk=True, resume=True)
+    nome: str = DTOField(resume=True)
+    email: str = DTOField()
+
+
+def test_parse_fields_expression_retorna_arvores_independentes():
+    expression = "nome,contatos(nome,telefones(numero))"
+
+    first = parse_fields_expression(expression)
+    first["root"].add("alterado")
+    first["contatos"]["root"].add("alterado")
+
+    second = parse_fields_expression(expression)
+
+    assert second == {
+        "root": {"nome", "contatos"},
+        "contatos": {
+            "root": {"nome", "telefones"},
+            "telefones": {"root": {"numero"}},
+        },
+    }
+    assert parse_fields_expression(None) == {"root": set()}
+
+
+def test_clone_e_extract_nao_compartilham_estrutura():
+    tree = {"root": {"a"}, "a": {"root": {"b"}, "b": {"root": {"c"}}}}
+
+    clone = clone_fields_tree(tree)
+    child = extract_child_tree(tree, "a")
+    clone["a"]["b"]["root"].add("x")
+    child["root"].add("y")
+
+    assert tree == {"root": {"a"}, "a": {"root": {"b"}, "b": {"root": {"c"}}}}
+    assert extract_child_tree(tree, "inexistente") == {"root": set()}
+
+
+def test_build_default_fields_tree_retorna_copias():
+    first = ResumoDTO.build_default_fields_tree()
+    first["root"].add("email")
+
+    assert ResumoDTO.build_default_fields_tree() == {"root": {"id", "nome"}}
@@ -0,0 +1,101 @@
+import datetime
+import decimal
+import enum
+import json
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from dateutil.relativedelta import relativedelta
+from nsj_gcf_utils.json_util import convert_to_dumps
+from nsj_gcf_utils.json_util import json_dumps as gcf_json_dumps
+
+from nsj_rest_lib.util import json_backend
+
+
+class SituacaoEnum(enum.Enum):
+    ATIVO = ("A", 1)
+    INATIVO = ("I", 0)
+
+
+class TipoEnum(enum.Enum):
+    PF = 1
+
+
+class ComToDict:
+    def to_dict(self):
+        return {"id": uuid.UUID(int=5), "valor": decimal.Decimal("1.50")}
+
+
+def _payload():
+    return {
+        "id": uuid.UUID(int=1),
+        "valor": decimal.Decimal("10.25"),
+        "criado_em": datetime.datetime(2024, 5, 1, 8, 30, 15, 123),
+        "data": datetime.date(2024, 5, 1),
+        "hora": datetime.time(8, 30),
+        "prazo": relativedelta(months=2, days=3),
+        "situacao": SituacaoEnum.ATIVO,
+        "tipo": TipoEnum.PF,
+        "nome": "Ação",
+        "ativo": True,
+        "nulo": None,
+        "itens": [
+            {"id": uuid.UUID(int=2), "qtd": 1.5},
+            ComToDict(),
+        ],
+    }
+
+
+def test_to_json_primitive_equivale_ao_convert_to_dumps():
+    assert json_backend.to_json_primitive(_payload()) == convert_to_dumps(_payload())
+
+
+def test_json_dumps_padrao_identico_ao_gcf_utils(monkeypatch):
+    monkeypatch.setattr(json_backend, "JSON_BACKEND", "std")
+
+    assert json_backend.json_dumps(_payload()) == gcf_json_dumps(_payload())
+
+
+def test_json_dumps_orjson_mesmo_conteudo(monkeypatch):
+    if json_backend.orjson is None:
+        return
+
+    monkeypatch.setattr(json_backend, "JSON_BACKEND", "orjson")
+
+    result = json_backend.json_dumps(_payload())
+
+    assert json.loads(result) == json.loads(gcf_json_dumps(_payload()))
+    # Inteiros maiores que 64 bits caem no módulo padrão
+    assert json_backend.json_dumps({"n": 2**70}) == '{"n": 1180591620717411303424}'
+
+
+def test_json_loads_orjson_com_fallback(monkeypatch):
+    if json_backend.orjson is None:
+        return
+
+    monkeypatch.setattr(json_backend, "JSON_BACKEND", "orjson")
+
+    assert json_backend.json_loads(b'{"a": [1, 2.5, "x"]}') == {"a": [1, 2.5, "x"]}
+    assert str(json_backend.json_loads('{"a": NaN}')["a"]) == "nan"
+
+
+def test_modules_import_with_alternative_backend():
+    # O settings importa o provider de JSON durante a sua inicialização, o que não
+    # pode gerar import circular com os módulos que dependem do json_backend
+    src_root = Path(__file__).resolve().parents[3] / "src"
+    env = {**os.environ, "REST_LIB_JSON_BACKEND": "orjson"}
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(src_root)] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+
+    for module in ("json_backend", "json_stream_util"):
+        result = subprocess.run(
+            [sys.executable, "-c", f"import nsj_rest_lib.util.{module}"],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr